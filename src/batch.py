@@ -0,0 +1,193 @@
+import argparse                       # <--- 명령줄 인자(입력 경로, 출력 폴더, 필터 등)를 해석하기 위한 모듈입니다.
+import glob                           # <--- '*.jpg' 같은 패턴으로 파일 목록을 찾을 때 사용합니다.
+import multiprocessing                # <--- 여러 CPU 코어에서 동시에 이미지를 처리하기 위한 프로세스 풀을 제공합니다.
+import os
+import sys
+import time
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈(image_handler.py, gui_app.py)과 동일한 방식으로 프로젝트 루트를 검색 경로에 추가합니다.
+# 이렇게 하면 'python -m src.batch'와 'python src/batch.py' 두 가지 방식 모두로 실행할 수 있습니다.
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src.image_handler import ImageHandler, available_cpu_count
+from src.pipeline import Pipeline
+from src.result_cache import DEFAULT_DISK_CACHE_BYTES
+
+# 입력 폴더를 지정했을 때 처리 대상으로 삼을 이미지 확장자 목록입니다.
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff')
+
+# 진행 상황 줄을 출력하는 최소 간격(초)입니다. (이미지마다 출력하면 작은 이미지가 많을 때 출력이 병목이 됩니다)
+PROGRESS_INTERVAL = 1.0
+
+# 각 작업자(worker) 프로세스가 한 번만 만들어서 계속 재사용하는 ImageHandler입니다.
+# 파일마다 ImageHandler를 새로 만들면 c_filters.so를 매번 다시 불러오게 되므로, 프로세스당 하나만 둡니다.
+_worker_handler = None
+
+
+def collect_input_files(input_spec):
+    # 입력이 폴더라면 그 안의 이미지 파일을, 아니라면 glob 패턴에 맞는 파일을 모두 찾습니다.
+    if os.path.isdir(input_spec):
+        paths = [os.path.join(input_spec, name) for name in os.listdir(input_spec)
+                 if name.lower().endswith(IMAGE_EXTENSIONS)]
+    else:
+        paths = glob.glob(input_spec, recursive=True)
+    return sorted(path for path in paths if os.path.isfile(path))
+
+
+def input_root(input_spec):
+    # 입력 폴더 또는 glob 패턴에서 와일드카드(*, ?, [)가 처음 나오기 전까지의 폴더입니다. (예: 'scans/**/*.png' → 'scans')
+    # 출력 파일은 이 폴더를 기준으로 한 입력의 상대 경로에 저장합니다.
+    if os.path.isdir(input_spec):
+        return input_spec
+    root = os.path.dirname(input_spec)
+    while glob.escape(root) != root:
+        root = os.path.dirname(root)
+    return root or os.curdir
+
+
+def output_path_for(input_path, output_dir, root=None):
+    # 출력 파일은 입력 파일의 root 기준 상대 경로 그대로 출력 폴더 아래에 저장합니다.
+    # ('**'로 여러 폴더를 찾을 때 'a/x.png'와 'b/x.png'가 같은 출력 파일에 덮어써지지 않도록 폴더 구조를 유지합니다)
+    # root가 없으면 원본과 같은 이름으로 출력 폴더에 바로 저장합니다.
+    if root is None:
+        return os.path.join(output_dir, os.path.basename(input_path))
+    return os.path.join(output_dir, os.path.relpath(input_path, root))
+
+
+def _init_worker(cache_dir=None, cache_disk_bytes=DEFAULT_DISK_CACHE_BYTES):
+    # 프로세스 풀의 각 작업자가 시작될 때 딱 한 번 호출됩니다. 여기서 C 라이브러리를 불러옵니다.
+    # 이미 코어마다 작업자 프로세스가 하나씩 있으므로, 작업자 안에서는 스레드를 추가로 나누지 않습니다.
+    # cache_dir이 있으면 디스크 결과 캐시를 사용합니다. (파일마다 원본이 다르므로 메모리 캐시는 쓰지 않습니다)
+    global _worker_handler
+    _worker_handler = ImageHandler(num_threads=1, cache_dir=cache_dir, cache_disk_bytes=cache_disk_bytes)
+
+
+def _process_one(job):
+    # 작업자 프로세스 안에서 이미지 한 장을 '불러오기 → C 필터 → 저장' 순서로 처리합니다.
+    # 결과는 (입력 경로, 성공 여부, 메시지) 형태로 부모 프로세스에 돌려줍니다.
+    # thumbnail_size가 있으면 그 크기 안에 들어가도록 줄여서 불러옵니다. (JPEG은 원본 해상도로 풀지 않습니다)
+    # 파일 하나에서 생긴 예외는 그 파일의 실패로만 보고합니다. (예외가 부모 프로세스로 넘어가면 배치 전체가 멈춥니다)
+    # 결과는 같은 폴더의 임시 파일에 다 저장한 뒤 이름을 바꿉니다. 저장 도중 작업자가 죽어도 잘린 출력 파일이 남지 않으므로,
+    # 이어서 하기(resume)가 '출력 파일이 있으면 완성된 것'으로 믿을 수 있습니다.
+    input_path, output_path, pipeline, thumbnail_size = job
+    output_dir, output_name = os.path.split(output_path)
+    # 확장자로 저장 형식을 정하므로 임시 파일도 같은 확장자로 끝나야 합니다. (숨김 파일이라 다음 실행의 입력으로 잡히지 않습니다)
+    temp_path = os.path.join(output_dir, f".{output_name}.{os.getpid()}.tmp{os.path.splitext(output_name)[1]}")
+    try:
+        image = _worker_handler.load_image(input_path, target_size=thumbnail_size)
+        if image is None:
+            return input_path, False, "불러오기 실패"
+        # 필터가 여러 개여도 Pipeline으로 합쳐서 C에서 한 번의 순회로 적용합니다.
+        image = _worker_handler.apply_pipeline(image, pipeline)
+        if image is None:
+            return input_path, False, "필터 적용 실패"
+        if not _worker_handler.save_image(image, temp_path):
+            return input_path, False, "저장 실패"
+        os.replace(temp_path, output_path)
+    except Exception as e:
+        return input_path, False, f"{type(e).__name__}: {e}"
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+    return input_path, True, output_path
+
+
+def run_batch(input_spec, output_dir, pipeline, workers=None, overwrite=False, chunksize=4, cache_dir=None,
+              thumbnail_size=None, cache_disk_bytes=DEFAULT_DISK_CACHE_BYTES):
+    # 배치 작업 전체를 실행하고 (처리 성공 수, 건너뛴 수, 실패 수)를 반환합니다.
+    # thumbnail_size=(너비, 높이)를 주면 원본 대신 그 크기 안에 들어가는 썸네일을 만듭니다.
+    input_paths = collect_input_files(input_spec)
+    root = input_root(input_spec)
+    os.makedirs(output_dir, exist_ok=True)
+
+    jobs = []
+    skipped = 0
+    for input_path in input_paths:
+        output_path = output_path_for(input_path, output_dir, root)
+        # 이어서 하기(resume): 이미 출력 파일이 있으면 다시 처리하지 않습니다.
+        if not overwrite and os.path.exists(output_path):
+            skipped += 1
+            continue
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        jobs.append((input_path, output_path, pipeline, thumbnail_size))
+
+    print(f"Batch: 입력 {len(input_paths)}개 중 {len(jobs)}개 처리, {skipped}개는 이미 출력이 있어 건너뜁니다.")
+    if not jobs:
+        return 0, skipped, 0
+
+    workers = workers or available_cpu_count()
+    done = 0
+    failed = 0
+    start_time = last_progress = time.perf_counter()
+    with multiprocessing.Pool(processes=workers, initializer=_init_worker, initargs=(cache_dir, cache_disk_bytes)) as pool:
+        for input_path, ok, message in pool.imap_unordered(_process_one, jobs, chunksize=chunksize):
+            if ok:
+                done += 1
+            else:
+                failed += 1
+                print(f"오류: Batch: '{input_path}' 처리 실패 - {message}")
+            finished = done + failed
+            now = time.perf_counter()
+            if now - last_progress >= PROGRESS_INTERVAL or finished == len(jobs):
+                last_progress = now
+                elapsed = now - start_time
+                rate = finished / elapsed if elapsed > 0 else 0.0
+                print(f"Batch: [{finished}/{len(jobs)}] {rate:.1f} images/sec")
+
+    elapsed = time.perf_counter() - start_time
+    print(f"Batch: 완료 - 성공 {done}개, 실패 {failed}개, 건너뜀 {skipped}개 "
+          f"({elapsed:.2f}초, {len(jobs) / elapsed:.1f} images/sec, 작업자 {workers}개)")
+    return done, skipped, failed
+
+
+def _parse_size(text):
+    # '256x256' 같은 문자열을 (너비, 높이)로 바꿉니다.
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"크기를 해석할 수 없습니다: '{text}' (예: 256x256)")
+    if width < 1 or height < 1:
+        raise argparse.ArgumentTypeError("크기는 1 이상이어야 합니다.")
+    return width, height
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m src.batch',
+        description="여러 이미지 파일에 C 필터를 일괄 적용합니다. (GUI 없이 실행)")
+    parser.add_argument('input', help="입력 폴더 또는 glob 패턴 (예: 'scans/*.jpg')")
+    parser.add_argument('output_dir', help="결과 이미지를 저장할 폴더")
+    parser.add_argument('-f', '--filter', required=True, dest='filter_spec',
+                        help="적용할 필터 목록 (예: 'grayscale', 'brightness=40', 'grayscale,brightness=-20')")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="작업자 프로세스 수 (기본값: 이 프로세스가 사용할 수 있는 CPU 코어 수)")
+    parser.add_argument('--overwrite', action='store_true',
+                        help="이미 존재하는 출력 파일도 다시 처리합니다. (기본값: 건너뜀)")
+    parser.add_argument('--cache-dir', default=None,
+                        help="필터 결과를 저장해 두고 다시 실행할 때 재사용할 디스크 캐시 폴더 (기본값: 사용 안 함)")
+    parser.add_argument('--cache-max-mb', type=float, default=DEFAULT_DISK_CACHE_BYTES / (1024 * 1024),
+                        help="디스크 캐시 폴더의 최대 크기(MB). 넘으면 오래 사용하지 않은 결과부터 지웁니다. (기본값: %(default)s)")
+    parser.add_argument('--thumbnail', type=_parse_size, default=None, metavar='WxH',
+                        help="원본 대신 이 크기 안에 들어가는 썸네일을 만듭니다. (예: 256x256)")
+    args = parser.parse_args(argv)
+
+    try:
+        pipeline = Pipeline.from_spec(args.filter_spec)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.workers is not None and args.workers < 1:
+        parser.error("작업자 수는 1 이상이어야 합니다.")
+    if args.cache_max_mb < 0:
+        parser.error("디스크 캐시 크기는 0 이상이어야 합니다.")
+
+    _, _, failed = run_batch(args.input, args.output_dir, pipeline,
+                             workers=args.workers, overwrite=args.overwrite, cache_dir=args.cache_dir,
+                             thumbnail_size=args.thumbnail, cache_disk_bytes=int(args.cache_max_mb * 1024 * 1024))
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
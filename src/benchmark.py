@@ -0,0 +1,276 @@
+import argparse
+import ctypes
+import io
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+import numpy as np
+import PIL
+from PIL import Image
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈과 같은 방식으로 프로젝트 루트를 검색 경로에 추가합니다. ('python -m src.benchmark'로 실행)
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src import c_interface
+from src import lut
+from src.image_handler import ImageHandler, available_cpu_count
+from src.pipeline import Pipeline
+
+# 성능 측정(벤치마크) 모듈입니다.
+# - run: 여러 크기의 합성 이미지로 C 필터 함수, NumPy로 만든 같은 필터, ImageHandler 전체 과정
+#        (decode → marshal → kernel → rebuild → encode)을 단계별로 측정해서 JSON 파일로 저장합니다.
+# - compare: 저장해 둔 기준(baseline) 결과와 새 결과를 비교해서, 정해진 비율 이상 느려진 항목을 알려줍니다.
+#
+# 사용 예:
+#     python -m src.benchmark run --sizes 0.1,1,10 --output bench.json
+#     python -m src.benchmark compare baseline.json bench.json --threshold 10
+
+DEFAULT_SIZES_MP = (0.1, 1.0, 10.0, 100.0)
+DEFAULT_REPEAT = 5
+BRIGHTNESS_FACTOR = 40
+
+
+def synthetic_pixels(megapixels, seed=0):
+    # 가로:세로 = 4:3 비율의 무작위 RGB 픽셀 배열을 만듭니다. (같은 seed면 항상 같은 이미지)
+    height = max(1, int(round((megapixels * 1e6 * 3 / 4) ** 0.5)))
+    width = max(1, int(round(megapixels * 1e6 / height)))
+    return np.random.default_rng(seed).integers(0, 256, size=(height, width, 3), dtype=np.uint8)
+
+
+def measure(func, repeat, setup=None):
+    # func를 repeat번 실행하고 각 실행 시간(초) 목록을 돌려줍니다.
+    # setup이 있으면 매번 실행 직전에 호출하고(시간 측정에서 제외), 그 반환값을 func에 넘깁니다.
+    func(setup() if setup else None)   # 첫 실행(워밍업)은 기록하지 않습니다.
+    times = []
+    for _ in range(repeat):
+        arg = setup() if setup else None
+        start = time.perf_counter()
+        func(arg)
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def summarize(times, megapixels):
+    # 실행 시간 목록을 중앙값/평균/표준편차와 초당 처리 픽셀 수(MPix/s)로 정리합니다.
+    median = statistics.median(times)
+    stdev = statistics.stdev(times) if len(times) > 1 else 0.0
+    return {
+        'megapixels': megapixels,
+        'runs': len(times),
+        'median_s': median,
+        'mean_s': statistics.mean(times),
+        'stdev_s': stdev,
+        'min_s': min(times),
+        'mpix_per_s': megapixels / median if median > 0 else float('inf'),
+        'rel_stdev_pct': 100.0 * stdev / median if median > 0 else 0.0,
+    }
+
+
+def _numpy_grayscale(pixels):
+    # apply_grayscale_c와 같은 계산(정수 평균)을 NumPy로 구현한 비교 대상입니다.
+    gray = (pixels.sum(axis=2, dtype=np.uint16) // 3).astype(np.uint8)
+    pixels[...] = gray[..., None]
+
+
+def _numpy_brightness(pixels, brightness_factor):
+    # apply_brightness_c와 같은 계산(더한 뒤 클리핑)을 NumPy로 구현한 비교 대상입니다.
+    np.clip(pixels.astype(np.int16) + brightness_factor, 0, 255, out=pixels, casting='unsafe')
+
+
+def bench_kernels(handler, source, megapixels, repeat):
+    # C 필터 함수와 NumPy 구현을 같은 입력으로 측정합니다. 입력 복사는 시간 측정에서 제외합니다.
+    height, width = source.shape[:2]
+    c_lib = handler.c_lib
+    brightness_luts = lut.to_c_luts(lut.brightness_lut(BRIGHTNESS_FACTOR))
+    pipeline = Pipeline().grayscale().brightness(BRIGHTNESS_FACTOR)
+    blur_pipeline = Pipeline().gaussian_blur(20)
+
+    def fresh_pointer():
+        pixels = source.copy()
+        return pixels, (ctypes.c_ubyte * pixels.nbytes).from_buffer(pixels)
+
+    cases = {
+        'grayscale_c': lambda a: c_lib.apply_grayscale_c(a[1], width, height),
+        'brightness_c': lambda a: c_lib.apply_brightness_c(a[1], width, height, BRIGHTNESS_FACTOR),
+        'brightness_lut_c': lambda a: c_lib.apply_lut_c(a[1], width, height, brightness_luts),
+        'grayscale_threaded': lambda a: handler.apply_grayscale_inplace(a[0], width, height),
+        'pipeline_grayscale_brightness': lambda a: handler.apply_pipeline_inplace(a[0], width, height, pipeline),
+        'gaussian_blur_r20': lambda a: handler.apply_pipeline_inplace(a[0], width, height, blur_pipeline),
+        'grayscale_numpy': lambda a: _numpy_grayscale(a[0]),
+        'brightness_numpy': lambda a: _numpy_brightness(a[0], BRIGHTNESS_FACTOR),
+    }
+    results = {}
+    for name, func in cases.items():
+        results[f"kernel/{name}"] = summarize(measure(func, repeat, setup=fresh_pointer), megapixels)
+    return results
+
+
+def thread_counts():
+    # 스레드 수별 측정에 사용할 스레드 수 목록입니다. 1, 2, 4와 기본값(사용할 수 있는 코어 수), 그 두 배를 측정합니다.
+    # (코어보다 많은 스레드가 느려지는지도 함께 보기 위해 기본값의 두 배까지 측정합니다)
+    default = available_cpu_count()
+    return sorted({1, 2, 4, default, 2 * default})
+
+
+def bench_threads(source, megapixels, repeat):
+    # 같은 필터를 스레드 수만 바꿔서 측정합니다. ImageHandler의 기본 스레드 수(사용할 수 있는 코어 수)가
+    # 맞는 선택인지 확인하기 위한 항목입니다. 결과 이름: threads/<필터>/t<스레드 수>
+    height, width = source.shape[:2]
+    cases = {
+        'grayscale': lambda handler, pixels: handler.apply_grayscale_inplace(pixels, width, height),
+        'pipeline_grayscale_brightness': lambda handler, pixels: handler.apply_pipeline_inplace(
+            pixels, width, height, Pipeline().grayscale().brightness(BRIGHTNESS_FACTOR)),
+        'gaussian_blur_r20': lambda handler, pixels: handler.apply_pipeline_inplace(
+            pixels, width, height, Pipeline().gaussian_blur(20)),
+    }
+    results = {}
+    for num_threads in thread_counts():
+        handler = ImageHandler(num_threads=num_threads)
+        for name, func in cases.items():
+            times = measure(lambda pixels: func(handler, pixels), repeat, setup=source.copy)
+            results[f"threads/{name}/t{num_threads}"] = summarize(times, megapixels)
+    return results
+
+
+def bench_round_trip(handler, source, megapixels, repeat, image_format):
+    # ImageHandler로 한 장을 처리하는 전체 과정을 단계별로 나누어 측정합니다.
+    # decode: 압축 파일 → Image, marshal: Image → C 버퍼, kernel: C 필터, rebuild: C 버퍼 → Image, encode: Image → 압축 파일
+    encoded = io.BytesIO()
+    Image.fromarray(source).save(encoded, format=image_format)
+    encoded_bytes = encoded.getvalue()
+    image = Image.open(io.BytesIO(encoded_bytes)).convert('RGB')
+    width, height = image.size
+    pipeline = Pipeline().grayscale().brightness(BRIGHTNESS_FACTOR)
+    blur_pipeline = Pipeline().gaussian_blur(20)
+
+    def decode(_):
+        Image.open(io.BytesIO(encoded_bytes)).convert('RGB')
+
+    def encode(_):
+        image.save(io.BytesIO(), format=image_format)
+
+    results = {
+        'decode': measure(decode, repeat),
+        'marshal': measure(lambda _: handler._prepare_pixels_for_c(image), repeat),
+        'kernel': measure(lambda ptr: handler._run_pipeline_kernel(ptr, width, height, pipeline), repeat,
+                          setup=lambda: handler._prepare_pixels_for_c(image)[0]),
+        'rebuild': measure(lambda ptr: handler._create_image_from_c_pixels(ptr, width, height), repeat,
+                           setup=lambda: handler._prepare_pixels_for_c(image)[0]),
+        'encode': measure(encode, repeat),
+        'total': measure(lambda _: handler.apply_pipeline(Image.open(io.BytesIO(encoded_bytes)).convert('RGB'),
+                                                          pipeline).save(io.BytesIO(), format=image_format),
+                         repeat),
+    }
+    return {f"round_trip/{image_format.lower()}/{stage}": summarize(times, megapixels)
+            for stage, times in results.items()}
+
+
+def run_benchmarks(sizes_mp, repeat, image_format, include_round_trip=True):
+    handler = ImageHandler()
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'numpy': np.__version__,
+            'pillow': PIL.__version__,
+            'repeat': repeat,
+            'threads': handler.num_threads,
+            'available_cpus': available_cpu_count(),
+            'kernel_backend': c_interface.kernel_backend(),
+        },
+        'results': {},
+    }
+    for megapixels in sizes_mp:
+        source = synthetic_pixels(megapixels)
+        actual_mp = source.shape[0] * source.shape[1] / 1e6
+        label = f"{megapixels:g}MP"
+        print(f"Benchmark: {label} ({source.shape[1]}x{source.shape[0]}) 측정 중...")
+        measured = bench_kernels(handler, source, actual_mp, repeat)
+        measured.update(bench_threads(source, actual_mp, repeat))
+        if include_round_trip:
+            measured.update(bench_round_trip(handler, source, actual_mp, repeat, image_format))
+        for name, summary in measured.items():
+            report['results'][f"{name}/{label}"] = summary
+            print(f"  {name:<45} {summary['mpix_per_s']:10.1f} MPix/s  "
+                  f"(중앙값 {summary['median_s'] * 1000:9.2f} ms, ±{summary['rel_stdev_pct']:.1f}%)")
+    return report
+
+
+def compare_reports(baseline, current, threshold_pct):
+    # 두 결과에서 같은 이름의 항목을 비교합니다. 처리 속도(MPix/s)가 threshold_pct% 넘게 떨어지면 '느려짐'으로 봅니다.
+    # 반환값: (항목별 비교 목록, 느려진 항목 수)
+    rows = []
+    regressions = 0
+    for name in sorted(set(baseline['results']) & set(current['results'])):
+        before = baseline['results'][name]['mpix_per_s']
+        after = current['results'][name]['mpix_per_s']
+        change_pct = 100.0 * (after - before) / before if before else 0.0
+        regressed = change_pct < -threshold_pct
+        regressions += regressed
+        rows.append((name, before, after, change_pct, regressed))
+    return rows, regressions
+
+
+def _parse_sizes(text):
+    try:
+        sizes = [float(v) for v in text.split(',') if v.strip()]
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"이미지 크기 목록을 해석할 수 없습니다: '{text}' (예: 0.1,1,10)")
+    if not sizes or min(sizes) <= 0:
+        raise argparse.ArgumentTypeError("이미지 크기는 0보다 커야 합니다.")
+    return sizes
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m src.benchmark',
+                                     description="C 필터와 ImageHandler 처리 과정의 성능을 측정하고 비교합니다.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="벤치마크를 실행하고 결과를 JSON으로 저장합니다.")
+    run_parser.add_argument('--sizes', type=_parse_sizes, default=list(DEFAULT_SIZES_MP),
+                            help="측정할 이미지 크기(MP) 목록 (기본값: 0.1,1,10,100)")
+    run_parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="항목마다 반복 측정할 횟수")
+    run_parser.add_argument('--format', default='JPEG', choices=('JPEG', 'PNG', 'BMP', 'TIFF'),
+                            help="decode/encode 단계에서 사용할 파일 형식")
+    run_parser.add_argument('--kernels-only', action='store_true', help="필터 함수만 측정합니다. (decode/encode 제외)")
+    run_parser.add_argument('-o', '--output', default='bench_results.json', help="결과 JSON 파일 경로")
+
+    compare_parser = commands.add_parser('compare', help="기준 결과와 새 결과를 비교합니다.")
+    compare_parser.add_argument('baseline', help="기준(baseline) 결과 JSON 파일")
+    compare_parser.add_argument('current', help="새로 측정한 결과 JSON 파일")
+    compare_parser.add_argument('--threshold', type=float, default=10.0,
+                                help="이 비율(%%) 넘게 느려지면 실패로 처리합니다. (기본값: 10)")
+    args = parser.parse_args(argv)
+
+    if args.command == 'run':
+        if args.repeat < 2:
+            parser.error("분산을 계산하려면 --repeat은 2 이상이어야 합니다.")
+        report = run_benchmarks(args.sizes, args.repeat, args.format, include_round_trip=not args.kernels_only)
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Benchmark: 결과를 '{args.output}'에 저장했습니다.")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    rows, regressions = compare_reports(baseline, current, args.threshold)
+    for name, before, after, change_pct, regressed in rows:
+        mark = "느려짐" if regressed else ""
+        print(f"{name:<55} {before:10.1f} → {after:10.1f} MPix/s ({change_pct:+6.1f}%) {mark}")
+    print(f"Benchmark: 비교 항목 {len(rows)}개 중 {regressions}개가 {args.threshold:g}% 넘게 느려졌습니다.")
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,8 +1,13 @@
 #include <stdio.h>
+#include <stddef.h>
+// size_t 타입을 사용하기 위해 포함합니다. 큰 이미지(수천만 픽셀 이상)에서 int로 바이트 위치를 계산하면
+// 범위를 넘어설 수 있으므로, 메모리 위치 계산에는 size_t를 사용합니다.
 // C 언어의 표준 입출력 라이브러리를 포함하는 지시어입니다.
 // 이 코드를 포함한다고 해서 꼭 출력 기능(printf)을 사용해야 하는 것은 아니지만,
 // C 파일을 만들 때 관례적으로 포함시키는 경우가 많습니다.
 // 여기서는 이미지 필터 로직 자체에는 필수적이지 않지만, 혹시 모를 디버깅 등에 대비해 둘 수 있습니다.
+#include <stdlib.h>  // 공간 필터의 임시 버퍼(malloc, free)와 abs를 위해 포함합니다.
+#include <stdint.h>  // 상자 블러의 나눗셈을 곱셈으로 바꿀 때 사용하는 uint64_t를 위해 포함합니다.
 
 // --- 이제 이미지를 흑백으로 변환하는 C 함수를 정의할 차례입니다 ---
 // 이 함수는 파이썬에서 호출되어 실제 이미지 픽셀 데이터에 접근하고 수정할 것입니다.
@@ -115,4 +120,467 @@ void apply_brightness_c(unsigned char *pixels, int width, int height, int bright
         pixels[i*3 + 1] = (unsigned char)new_g;
         pixels[i*3 + 2] = (unsigned char)new_b;
     }
-}
\ No newline at end of file
+}
+
+// --- 행(row) 범위 필터 함수들 ---
+// 아래 함수들은 이미지 전체가 아니라 [start_row, end_row) 범위의 행만 처리합니다.
+// 파이썬 쪽(ImageHandler)에서 이미지를 여러 개의 띠(band)로 나눈 뒤, 각 띠를 서로 다른 스레드에서
+// 동시에 호출하면 여러 CPU 코어를 함께 사용할 수 있습니다. (ctypes는 C 함수를 호출하는 동안 GIL을 풀어 줍니다.)
+// 각 띠는 서로 겹치지 않는 메모리만 수정하므로 스레드 사이에 잠금(lock)이 필요 없고,
+// 픽셀마다 하는 계산이 전체 처리 함수와 똑같기 때문에 결과도 비트 단위로 동일합니다.
+//
+// - pixels: 이미지 전체 픽셀 데이터의 시작 주소 (0번째 행의 시작)
+// - width: 한 행의 픽셀 수
+// - start_row, end_row: 처리할 행 범위 (start_row 포함, end_row 미포함)
+// - stride: 한 행이 메모리에서 차지하는 바이트 수 (꽉 찬 RGB 이미지라면 width * 3)
+void apply_grayscale_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride) {
+    for (int y = start_row; y < end_row; y++) {
+        unsigned char *row = pixels + (size_t)y * (size_t)stride;
+        for (int x = 0; x < width; x++) {
+            unsigned char *px = row + (size_t)x * 3;
+            unsigned char gray = (unsigned char)((px[0] + px[1] + px[2]) / 3);
+            px[0] = gray;
+            px[1] = gray;
+            px[2] = gray;
+        }
+    }
+}
+
+void apply_brightness_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride, int brightness_factor) {
+    for (int y = start_row; y < end_row; y++) {
+        unsigned char *row = pixels + (size_t)y * (size_t)stride;
+        // 한 행의 R, G, B 값은 모두 같은 방식으로 처리되므로, 행 전체를 바이트 단위로 한 번에 훑습니다.
+        for (size_t i = 0; i < (size_t)width * 3; i++) {
+            int value = row[i] + brightness_factor;
+            if (value < 0) value = 0;
+            else if (value > 255) value = 255;
+            row[i] = (unsigned char)value;
+        }
+    }
+}
+
+// --- 합쳐진(fused) 점 연산 파이프라인 함수 ---
+// 여러 필터(예: 흑백 → 밝기)를 차례로 적용할 때, 필터마다 이미지 전체를 한 번씩 훑으면
+// 필터 개수만큼 메모리를 읽고 써야 합니다. 이 함수는 모든 필터를 한 번의 순회(single pass)로 처리합니다.
+//
+// 파이썬 쪽(src/pipeline.py)에서 필터 목록을 '단계(stage)'들로 미리 정리해 둡니다.
+// - 밝기처럼 픽셀 값 하나만 보고 결과가 정해지는 '점 연산'들은 하나의 룩업 테이블(LUT)로 합쳐집니다.
+// - 흑백 변환처럼 R, G, B를 섞는 연산은 단계와 단계 사이의 경계가 됩니다.
+// 즉, 픽셀마다 [LUT 0] → (흑백 → [LUT 1]) → (흑백 → [LUT 2]) ... 순서로 계산됩니다.
+//
+// - luts: num_stages개 단계의 테이블이 이어져 있는 배열입니다.
+//         단계 하나는 R, G, B 채널별 256칸 테이블 3개(총 768바이트)로 이루어져 있습니다.
+// - num_stages: 단계의 개수 (1 이상)
+void apply_point_pipeline_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride,
+                                 const unsigned char *luts, int num_stages) {
+    for (int y = start_row; y < end_row; y++) {
+        unsigned char *row = pixels + (size_t)y * (size_t)stride;
+        for (int x = 0; x < width; x++) {
+            unsigned char *px = row + (size_t)x * 3;
+            const unsigned char *lut = luts;
+            unsigned int r = lut[px[0]];
+            unsigned int g = lut[256 + px[1]];
+            unsigned int b = lut[512 + px[2]];
+            for (int s = 1; s < num_stages; s++) {
+                // 단계 경계: apply_grayscale_c와 같은 방식(평균)으로 흑백 값을 만든 뒤 다음 단계의 테이블을 적용합니다.
+                unsigned int gray = (r + g + b) / 3;
+                lut += 768;
+                r = lut[gray];
+                g = lut[256 + gray];
+                b = lut[512 + gray];
+            }
+            px[0] = (unsigned char)r;
+            px[1] = (unsigned char)g;
+            px[2] = (unsigned char)b;
+        }
+    }
+}
+
+// --- 룩업 테이블(LUT) 점 연산 함수 ---
+// 밝기, 대비, 감마, 레벨, 반전, 임계값처럼 '픽셀 값 하나만 보고 결과가 정해지는' 조정은
+// 0~255 각 입력 값에 대한 결과를 미리 계산한 256칸짜리 표(룩업 테이블)로 표현할 수 있습니다.
+// 그러면 어떤 조정이든 픽셀마다 '표에서 값 찾기' 한 번이면 되므로, 조정마다 새 C 함수를 만들 필요가 없습니다.
+// apply_brightness_c의 if 비교(클리핑)도 표를 만들 때 미리 처리되므로, 이 반복문 안에는 분기(if)가 없습니다.
+//
+// - luts: R, G, B 채널별 256칸 테이블 3개가 이어진 배열 (총 768바이트, R → G → B 순서)
+//
+// restrict: 'pixels'와 'luts'가 서로 겹치지 않는 메모리라고 컴파일러에게 알려 주어,
+//           테이블 값을 반복해서 다시 읽지 않고 더 공격적으로 최적화할 수 있게 합니다.
+void apply_lut_rows_c(unsigned char *restrict pixels, int width, int start_row, int end_row, int stride,
+                      const unsigned char *restrict luts) {
+    const unsigned char *restrict lut_r = luts;
+    const unsigned char *restrict lut_g = luts + 256;
+    const unsigned char *restrict lut_b = luts + 512;
+    for (int y = start_row; y < end_row; y++) {
+        unsigned char *restrict row = pixels + (size_t)y * (size_t)stride;
+        for (int x = 0; x < width; x++) {
+            unsigned char *px = row + (size_t)x * 3;
+            px[0] = lut_r[px[0]];
+            px[1] = lut_g[px[1]];
+            px[2] = lut_b[px[2]];
+        }
+    }
+}
+
+// 이미지 전체에 룩업 테이블을 적용합니다. (apply_grayscale_c, apply_brightness_c와 같은 형태의 함수)
+void apply_lut_c(unsigned char *pixels, int width, int height, const unsigned char *luts) {
+    apply_lut_rows_c(pixels, width, 0, height, width * 3, luts);
+}
+
+// --- 채널 수, 행 간격(stride), 비트 깊이를 받는 범용 필터 함수들 ---
+// 위의 함수들은 한 픽셀이 R, G, B 3바이트로 꽉 채워진 RGB 이미지만 처리합니다.
+// 아래 함수들은 흑백(L), 알파가 있는 이미지(RGBA, LA), 16비트 이미지(I;16)도 RGB로 바꾸지 않고 그대로 처리합니다.
+//
+// - channels: 픽셀 하나의 채널 수 (L=1, LA=2, RGB=3, RGBA/RGBX=4)
+// - color_channels: 그중 앞쪽의 색 채널 수 (L, LA=1 / RGB, RGBA=3). 나머지 채널(알파 등)은 건드리지 않습니다.
+// - bits_per_sample: 채널 값 하나의 비트 수. 8이면 unsigned char, 16이면 unsigned short(시스템 바이트 순서)입니다.
+// - stride: 한 행이 메모리에서 차지하는 바이트 수
+// - luts: 색 채널별 테이블 3개(R → G → B 순서). 테이블 하나는 8비트면 256칸, 16비트면 65536칸입니다.
+//         색 채널이 하나뿐인 이미지(L, LA, I;16)에는 첫 번째(R) 테이블을 사용합니다.
+//
+// 8비트와 16비트 함수는 값의 타입만 다르고 계산은 같으므로, 아래 매크로로 두 벌을 만듭니다.
+#define DEFINE_FORMAT_KERNELS(T, SUFFIX, LUT_SIZE)                                                          \
+static void grayscale_rows_##SUFFIX(unsigned char *pixels, int width, int start_row, int end_row,          \
+                                    int stride, int channels) {                                            \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        T *row = (T *)(pixels + (size_t)y * (size_t)stride);                                               \
+        for (int x = 0; x < width; x++) {                                                                  \
+            T *px = row + (size_t)x * channels;                                                            \
+            T gray = (T)(((unsigned int)px[0] + px[1] + px[2]) / 3);                                       \
+            px[0] = gray;                                                                                  \
+            px[1] = gray;                                                                                  \
+            px[2] = gray;                                                                                  \
+        }                                                                                                  \
+    }                                                                                                      \
+}                                                                                                          \
+                                                                                                           \
+static void point_pipeline_rows_##SUFFIX(unsigned char *pixels, int width, int start_row, int end_row,     \
+                                         int stride, int channels, int color_channels,                     \
+                                         const T *luts, int num_stages) {                                  \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        T *row = (T *)(pixels + (size_t)y * (size_t)stride);                                               \
+        if (color_channels == 1) {                                                                         \
+            /* 색 채널이 하나면 흑백 변환은 아무것도 바꾸지 않으므로, 단계마다 첫 번째 테이블만 이어서 적용합니다. */ \
+            for (int x = 0; x < width; x++) {                                                              \
+                T *px = row + (size_t)x * channels;                                                        \
+                const T *lut = luts;                                                                       \
+                unsigned int value = lut[px[0]];                                                           \
+                for (int s = 1; s < num_stages; s++) {                                                     \
+                    lut += 3 * (size_t)(LUT_SIZE);                                                         \
+                    value = lut[value];                                                                    \
+                }                                                                                          \
+                px[0] = (T)value;                                                                          \
+            }                                                                                              \
+            continue;                                                                                      \
+        }                                                                                                  \
+        for (int x = 0; x < width; x++) {                                                                  \
+            T *px = row + (size_t)x * channels;                                                            \
+            const T *lut = luts;                                                                           \
+            unsigned int r = lut[px[0]];                                                                   \
+            unsigned int g = lut[(LUT_SIZE) + px[1]];                                                      \
+            unsigned int b = lut[2 * (LUT_SIZE) + px[2]];                                                  \
+            for (int s = 1; s < num_stages; s++) {                                                         \
+                unsigned int gray = (r + g + b) / 3;                                                       \
+                lut += 3 * (size_t)(LUT_SIZE);                                                             \
+                r = lut[gray];                                                                             \
+                g = lut[(LUT_SIZE) + gray];                                                                \
+                b = lut[2 * (LUT_SIZE) + gray];                                                            \
+            }                                                                                              \
+            px[0] = (T)r;                                                                                  \
+            px[1] = (T)g;                                                                                  \
+            px[2] = (T)b;                                                                                  \
+        }                                                                                                  \
+    }                                                                                                      \
+}
+
+DEFINE_FORMAT_KERNELS(unsigned char, u8, 256)
+DEFINE_FORMAT_KERNELS(unsigned short, u16, 65536)
+
+// 흑백 변환: 색 채널이 3개인 이미지만 바꿉니다. (L, LA, I;16은 이미 흑백이므로 그대로 둡니다)
+void apply_grayscale_format_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride,
+                                   int channels, int color_channels, int bits_per_sample) {
+    if (color_channels != 3) return;
+    if (bits_per_sample == 16) grayscale_rows_u16(pixels, width, start_row, end_row, stride, channels);
+    else grayscale_rows_u8(pixels, width, start_row, end_row, stride, channels);
+}
+
+// 여러 단계의 테이블(apply_point_pipeline_rows_c와 같은 구성)을 한 번의 순회로 적용합니다.
+// 단계가 하나뿐이면 룩업 테이블 한 번 적용과 같습니다.
+void apply_point_pipeline_format_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride,
+                                        int channels, int color_channels, int bits_per_sample,
+                                        const void *luts, int num_stages) {
+    if (bits_per_sample == 16)
+        point_pipeline_rows_u16(pixels, width, start_row, end_row, stride, channels, color_channels,
+                                (const unsigned short *)luts, num_stages);
+    else
+        point_pipeline_rows_u8(pixels, width, start_row, end_row, stride, channels, color_channels,
+                               (const unsigned char *)luts, num_stages);
+}
+
+// --- 공간(spatial) 필터: 블러, 언샤프 마스크, 소벨 에지 ---
+// 위의 점 연산은 픽셀 하나만 보고 결과가 정해지지만, 공간 필터는 주변 픽셀까지 읽어야 합니다.
+// 그래서 제자리(in-place)에서 처리할 수 없고, 읽는 버퍼(src)와 쓰는 버퍼(dst)를 따로 받습니다.
+// 두 버퍼는 크기, 채널 수, 행 간격(stride)이 모두 같아야 합니다.
+//
+// 가우시안 블러는 '분리 가능한(separable)' 필터입니다. 2차원 (2r+1)x(2r+1) 커널 대신
+// 가로 방향 1차원 커널을 적용한 뒤 세로 방향 1차원 커널을 적용해도 결과가 같으므로,
+// 픽셀마다 (2r+1)^2번이 아니라 2(2r+1)번만 계산하면 됩니다.
+// 반지름이 크면 상자(box) 블러를 3번 반복해 가우시안을 근사합니다. 상자 블러는 '누적 합(running sum)'으로
+// 반지름과 관계없이 픽셀마다 덧셈/뺄셈 한 번씩만 하므로, 반지름 20이든 200이든 걸리는 시간이 같습니다.
+//
+// - 이미지 가장자리 밖의 픽셀은 가장 가까운 가장자리 픽셀 값으로 봅니다. (clamp-to-edge)
+// - 모든 채널(알파 포함)을 같은 방식으로 블러합니다. (Pillow의 GaussianBlur, BoxBlur와 같습니다)
+// - 가로 방향 함수는 각 행이 독립적이므로 [start_row, end_row) 행만 읽고 씁니다.
+// - 세로 방향 함수는 위아래 행을 읽어야 하므로 src 전체(height행)를 읽고, dst의 [start_row, end_row) 행만 씁니다.
+//   그래서 여러 스레드가 행 범위를 나눠 동시에 실행해도 서로의 결과를 덮어쓰지 않습니다.
+//
+// 가중치(weights)는 합이 (1 << CONV_SHIFT)인 정수입니다. (src/spatial.py에서 만듭니다)
+// 실수 대신 정수로 계산하므로, 어떤 컴퓨터에서 실행해도 (NumPy 대체 구현과도) 결과가 똑같습니다.
+#define CONV_SHIFT 14
+
+// 세로 방향 함수는 한 번에 이만큼의 값(열 블록)만 처리합니다.
+// 누적 값 배열(블록 크기 x 4바이트 = 16KB)이 L1 캐시에 머무르고, 위아래 (2r+1)행의 같은 블록도 L2 캐시에 들어갑니다.
+// 행 전체를 한 번에 처리하면, 폭이 넓은 이미지에서 다음 행을 읽을 때 이미 앞 행의 데이터가 캐시에서 밀려나 있습니다.
+#define SPATIAL_BLOCK_SAMPLES 4096
+
+// 상자 블러의 나눗셈: (sum + n/2) / n (반올림)을 곱셈과 시프트로 계산합니다.
+// 나눗셈은 곱셈보다 수십 배 느리므로, 1/n을 2^48배 한 값(올림)을 미리 구해 두고 곱합니다.
+// n < 65536이고 sum이 n x 65535 이하면 나눗셈 결과와 항상 같습니다.
+static inline uint64_t box_divisor(int n) {
+    return (((uint64_t)1 << 48) + (uint64_t)n - 1) / (uint64_t)n;
+}
+#define BOX_DIVIDE(sum, n, m) ((unsigned int)((((uint64_t)(sum) + (uint64_t)((n) / 2)) * (m)) >> 48))
+
+#define DEFINE_SPATIAL_KERNELS(T, SUFFIX, MAX_VALUE)                                                        \
+static int convolve_h_rows_##SUFFIX(const unsigned char *src, int width, int start_row, int end_row,       \
+                                    int stride, unsigned char *dst, int channels,                          \
+                                    const int *weights, int radius) {                                      \
+    /* 가장자리 바깥을 채운 한 행 (앞뒤로 radius 픽셀씩) */                                                   \
+    T *line = (T *)malloc(((size_t)width + 2 * (size_t)radius) * (size_t)channels * sizeof(T));            \
+    if (line == NULL) return -1;                                                                           \
+    size_t row_len = (size_t)width * channels;                                                             \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        const T *in = (const T *)(src + (size_t)y * (size_t)stride);                                       \
+        T *out = (T *)(dst + (size_t)y * (size_t)stride);                                                  \
+        for (int i = 0; i < radius; i++) {                                                                 \
+            for (int c = 0; c < channels; c++) {                                                           \
+                line[(size_t)i * channels + c] = in[c];                                                    \
+                line[(size_t)(radius + width + i) * channels + c] = in[row_len - channels + c];            \
+            }                                                                                              \
+        }                                                                                                  \
+        for (size_t i = 0; i < row_len; i++) line[(size_t)radius * channels + i] = in[i];                  \
+        for (size_t i = 0; i < row_len; i++) {                                                             \
+            const T *taps = line + i;                                                                      \
+            unsigned int acc = 1u << (CONV_SHIFT - 1);                                                     \
+            for (int k = 0; k <= 2 * radius; k++) acc += (unsigned int)weights[k] * taps[(size_t)k * channels]; \
+            out[i] = (T)(acc >> CONV_SHIFT);                                                               \
+        }                                                                                                  \
+    }                                                                                                      \
+    free(line);                                                                                            \
+    return 0;                                                                                              \
+}                                                                                                          \
+                                                                                                           \
+static void convolve_v_rows_##SUFFIX(const unsigned char *src, int width, int start_row, int end_row,      \
+                                     int stride, unsigned char *dst, int height, int channels,             \
+                                     const int *weights, int radius) {                                     \
+    unsigned int acc[SPATIAL_BLOCK_SAMPLES];                                                               \
+    size_t row_len = (size_t)width * channels;                                                             \
+    for (size_t block = 0; block < row_len; block += SPATIAL_BLOCK_SAMPLES) {                              \
+        size_t count = row_len - block < SPATIAL_BLOCK_SAMPLES ? row_len - block : SPATIAL_BLOCK_SAMPLES;  \
+        for (int y = start_row; y < end_row; y++) {                                                        \
+            for (size_t i = 0; i < count; i++) acc[i] = 1u << (CONV_SHIFT - 1);                            \
+            for (int k = -radius; k <= radius; k++) {                                                      \
+                int sy = y + k < 0 ? 0 : (y + k >= height ? height - 1 : y + k);                           \
+                const T *in = (const T *)(src + (size_t)sy * (size_t)stride) + block;                      \
+                unsigned int w = (unsigned int)weights[k + radius];                                        \
+                for (size_t i = 0; i < count; i++) acc[i] += w * in[i];                                    \
+            }                                                                                              \
+            T *out = (T *)(dst + (size_t)y * (size_t)stride) + block;                                      \
+            for (size_t i = 0; i < count; i++) out[i] = (T)(acc[i] >> CONV_SHIFT);                         \
+        }                                                                                                  \
+    }                                                                                                      \
+}                                                                                                          \
+                                                                                                           \
+/* 한 행(in)에 반지름 radius의 상자 블러를 적용해 out에 씁니다. 채널마다 누적 합을 따로 유지하되,          \
+   메모리를 앞에서부터 차례로 읽도록 픽셀 단위로 모든 채널을 함께 진행합니다. (channels는 4 이하) */       \
+static void box_line_##SUFFIX(const T *in, T *out, int width, int channels, int radius) {                  \
+    int n = 2 * radius + 1;                                                                                \
+    uint64_t m = box_divisor(n);                                                                           \
+    unsigned int sums[4];                                                                                  \
+    for (int c = 0; c < channels; c++) {                                                                   \
+        sums[c] = (unsigned int)(radius + 1) * in[c];                                                      \
+        for (int i = 1; i <= radius; i++) sums[c] += in[(size_t)(i < width ? i : width - 1) * channels + c]; \
+    }                                                                                                      \
+    for (int x = 0; x < width; x++) {                                                                      \
+        const T *add = in + (size_t)(x + radius + 1 < width ? x + radius + 1 : width - 1) * channels;      \
+        const T *sub = in + (size_t)(x - radius > 0 ? x - radius : 0) * channels;                          \
+        T *px = out + (size_t)x * channels;                                                                \
+        for (int c = 0; c < channels; c++) {                                                               \
+            px[c] = (T)BOX_DIVIDE(sums[c], n, m);                                                          \
+            sums[c] += add[c];                                                                             \
+            sums[c] -= sub[c];                                                                             \
+        }                                                                                                  \
+    }                                                                                                      \
+}                                                                                                          \
+                                                                                                           \
+static int box_blur_h_rows_##SUFFIX(const unsigned char *src, int width, int start_row, int end_row,       \
+                                    int stride, unsigned char *dst, int channels,                          \
+                                    const int *radii, int num_passes) {                                    \
+    /* 한 행에 모든 가로 방향 패스를 이어서 적용합니다. 행 하나가 캐시에 있는 동안 패스를 모두 끝냅니다. */     \
+    size_t row_len = (size_t)width * channels;                                                             \
+    T *lines = (T *)malloc(2 * row_len * sizeof(T));                                                       \
+    if (lines == NULL) return -1;                                                                          \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        const T *in = (const T *)(src + (size_t)y * (size_t)stride);                                       \
+        T *out = (T *)(dst + (size_t)y * (size_t)stride);                                                  \
+        for (int p = 0; p < num_passes; p++) {                                                             \
+            /* 마지막 패스는 dst에 바로 쓰고, 나머지는 두 줄짜리 임시 버퍼를 번갈아 씁니다. */                  \
+            T *target = p == num_passes - 1 ? out : lines + (size_t)(p % 2) * row_len;                     \
+            box_line_##SUFFIX(in, target, width, channels, radii[p]);                                      \
+            in = target;                                                                                   \
+        }                                                                                                  \
+    }                                                                                                      \
+    free(lines);                                                                                           \
+    return 0;                                                                                              \
+}                                                                                                          \
+                                                                                                           \
+static void box_blur_v_rows_##SUFFIX(const unsigned char *src, int width, int start_row, int end_row,      \
+                                     int stride, unsigned char *dst, int height, int channels, int radius) { \
+    unsigned int sums[SPATIAL_BLOCK_SAMPLES];                                                              \
+    int n = 2 * radius + 1;                                                                                \
+    uint64_t m = box_divisor(n);                                                                           \
+    size_t row_len = (size_t)width * channels;                                                             \
+    for (size_t block = 0; block < row_len; block += SPATIAL_BLOCK_SAMPLES) {                              \
+        size_t count = row_len - block < SPATIAL_BLOCK_SAMPLES ? row_len - block : SPATIAL_BLOCK_SAMPLES;  \
+        /* 이 스레드가 맡은 첫 행(start_row)의 누적 합을 직접 구한 뒤, 아래로 내려가며 한 행씩 더하고 뺍니다. */ \
+        for (size_t i = 0; i < count; i++) sums[i] = 0;                                                    \
+        for (int k = -radius; k <= radius; k++) {                                                          \
+            int sy = start_row + k < 0 ? 0 : (start_row + k >= height ? height - 1 : start_row + k);       \
+            const T *in = (const T *)(src + (size_t)sy * (size_t)stride) + block;                          \
+            for (size_t i = 0; i < count; i++) sums[i] += in[i];                                           \
+        }                                                                                                  \
+        for (int y = start_row; y < end_row; y++) {                                                        \
+            T *out = (T *)(dst + (size_t)y * (size_t)stride) + block;                                      \
+            int add_y = y + radius + 1 < height ? y + radius + 1 : height - 1;                             \
+            int sub_y = y - radius > 0 ? y - radius : 0;                                                   \
+            const T *add = (const T *)(src + (size_t)add_y * (size_t)stride) + block;                      \
+            const T *sub = (const T *)(src + (size_t)sub_y * (size_t)stride) + block;                      \
+            for (size_t i = 0; i < count; i++) {                                                           \
+                out[i] = (T)BOX_DIVIDE(sums[i], n, m);                                                     \
+                sums[i] += add[i];                                                                         \
+                sums[i] -= sub[i];                                                                         \
+            }                                                                                              \
+        }                                                                                                  \
+    }                                                                                                      \
+}                                                                                                          \
+                                                                                                           \
+static void unsharp_rows_##SUFFIX(unsigned char *pixels, int width, int start_row, int end_row, int stride, \
+                                  const unsigned char *blurred, int channels, int color_channels,          \
+                                  int percent, int threshold) {                                            \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        T *row = (T *)(pixels + (size_t)y * (size_t)stride);                                               \
+        const T *blur_row = (const T *)(blurred + (size_t)y * (size_t)stride);                             \
+        for (int x = 0; x < width; x++) {                                                                  \
+            for (int c = 0; c < color_channels; c++) {                                                     \
+                size_t i = (size_t)x * channels + c;                                                       \
+                int diff = (int)row[i] - (int)blur_row[i];                                                 \
+                if (abs(diff) < threshold) continue;                                                       \
+                long long value = row[i] + (long long)diff * percent / 100;                                \
+                if (value < 0) value = 0;                                                                  \
+                else if (value > (MAX_VALUE)) value = (MAX_VALUE);                                         \
+                row[i] = (T)value;                                                                         \
+            }                                                                                              \
+        }                                                                                                  \
+    }                                                                                                      \
+}                                                                                                          \
+                                                                                                           \
+static void sobel_rows_##SUFFIX(const unsigned char *src, int width, int start_row, int end_row,           \
+                                int stride, unsigned char *dst, int height, int channels,                  \
+                                int color_channels) {                                                      \
+    for (int y = start_row; y < end_row; y++) {                                                            \
+        const T *up = (const T *)(src + (size_t)(y > 0 ? y - 1 : 0) * (size_t)stride);                     \
+        const T *mid = (const T *)(src + (size_t)y * (size_t)stride);                                      \
+        const T *down = (const T *)(src + (size_t)(y + 1 < height ? y + 1 : height - 1) * (size_t)stride); \
+        T *out = (T *)(dst + (size_t)y * (size_t)stride);                                                  \
+        for (int x = 0; x < width; x++) {                                                                  \
+            size_t l = (size_t)(x > 0 ? x - 1 : 0) * channels;                                             \
+            size_t r = (size_t)(x + 1 < width ? x + 1 : width - 1) * channels;                             \
+            size_t o = (size_t)x * channels;                                                               \
+            for (int c = 0; c < color_channels; c++) {                                                     \
+                int gx = ((int)up[r + c] + 2 * mid[r + c] + down[r + c])                                   \
+                       - ((int)up[l + c] + 2 * mid[l + c] + down[l + c]);                                  \
+                int gy = ((int)down[l + c] + 2 * down[o + c] + down[r + c])                                \
+                       - ((int)up[l + c] + 2 * up[o + c] + up[r + c]);                                     \
+                /* 기울기 크기는 sqrt(gx^2 + gy^2) 대신 |gx| + |gy|로 근사합니다. (수학 라이브러리 없이 정수로 계산) */ \
+                int magnitude = abs(gx) + abs(gy);                                                         \
+                out[o + c] = (T)(magnitude > (MAX_VALUE) ? (MAX_VALUE) : magnitude);                       \
+            }                                                                                              \
+            for (int c = color_channels; c < channels; c++) out[o + c] = mid[o + c];                       \
+        }                                                                                                  \
+    }                                                                                                      \
+}
+
+DEFINE_SPATIAL_KERNELS(unsigned char, u8, 255)
+DEFINE_SPATIAL_KERNELS(unsigned short, u16, 65535)
+
+// 가로 방향 1차원 합성곱: 가중치 2r+1개(weights[0]이 가장 왼쪽)를 적용합니다.
+// 임시 버퍼를 할당하지 못하면 -1, 성공하면 0을 반환합니다.
+int apply_convolve_h_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+                            unsigned char *dst, int channels, int bits_per_sample,
+                            const int *weights, int radius) {
+    if (bits_per_sample == 16)
+        return convolve_h_rows_u16(src, width, start_row, end_row, stride, dst, channels, weights, radius);
+    return convolve_h_rows_u8(src, width, start_row, end_row, stride, dst, channels, weights, radius);
+}
+
+// 세로 방향 1차원 합성곱: 가중치 2r+1개(weights[0]이 가장 위쪽)를 적용합니다.
+void apply_convolve_v_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+                             unsigned char *dst, int height, int channels, int bits_per_sample,
+                             const int *weights, int radius) {
+    if (bits_per_sample == 16)
+        convolve_v_rows_u16(src, width, start_row, end_row, stride, dst, height, channels, weights, radius);
+    else
+        convolve_v_rows_u8(src, width, start_row, end_row, stride, dst, height, channels, weights, radius);
+}
+
+// 가로 방향 상자 블러를 num_passes번 이어서 적용합니다. (radii[i]: i번째 패스의 반지름)
+// 임시 버퍼를 할당하지 못하면 -1, 성공하면 0을 반환합니다.
+int apply_box_blur_h_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+                            unsigned char *dst, int channels, int bits_per_sample,
+                            const int *radii, int num_passes) {
+    if (bits_per_sample == 16)
+        return box_blur_h_rows_u16(src, width, start_row, end_row, stride, dst, channels, radii, num_passes);
+    return box_blur_h_rows_u8(src, width, start_row, end_row, stride, dst, channels, radii, num_passes);
+}
+
+// 세로 방향 상자 블러 한 번 (누적 합 방식)
+void apply_box_blur_v_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+                             unsigned char *dst, int height, int channels, int bits_per_sample, int radius) {
+    if (bits_per_sample == 16)
+        box_blur_v_rows_u16(src, width, start_row, end_row, stride, dst, height, channels, radius);
+    else
+        box_blur_v_rows_u8(src, width, start_row, end_row, stride, dst, height, channels, radius);
+}
+
+// 언샤프 마스크: 원본(pixels)과 블러한 이미지(blurred)의 차이를 percent%만큼 원본에 더해 윤곽을 또렷하게 합니다.
+// 차이가 threshold보다 작은 값(잡음이나 매끈한 면)은 그대로 둡니다. (Pillow의 UnsharpMask와 같은 계산)
+// 색 채널만 바꾸고 알파 채널은 그대로 둡니다. pixels를 제자리에서 수정합니다.
+void apply_unsharp_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride,
+                          const unsigned char *blurred, int channels, int color_channels, int bits_per_sample,
+                          int percent, int threshold) {
+    if (bits_per_sample == 16)
+        unsharp_rows_u16(pixels, width, start_row, end_row, stride, blurred, channels, color_channels,
+                         percent, threshold);
+    else
+        unsharp_rows_u8(pixels, width, start_row, end_row, stride, blurred, channels, color_channels,
+                        percent, threshold);
+}
+
+// 소벨(Sobel) 에지 검출: 3x3 가로/세로 기울기의 크기를 색 채널마다 dst에 씁니다. 알파 채널은 그대로 복사합니다.
+void apply_sobel_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+                        unsigned char *dst, int height, int channels, int color_channels, int bits_per_sample) {
+    if (bits_per_sample == 16)
+        sobel_rows_u16(src, width, start_row, end_row, stride, dst, height, channels, color_channels);
+    else
+        sobel_rows_u8(src, width, start_row, end_row, stride, dst, height, channels, color_channels);
+}
@@ -1,20 +1,139 @@
 import ctypes       # Python과 C 언어를 연결해주는 핵심 모듈입니다.
+import hashlib      # C 소스와 빌드 옵션으로 캐시 파일 이름을 만들 때 사용합니다.
+import logging      # 라이브러리 로드/함수 정의 메시지를 print() 대신 로그 수준으로 켜고 끌 수 있게 합니다.
 import os           # 파일이나 폴더의 경로를 다루기 위한 운영체제 관련 모듈입니다.
+import platform
+import shlex        # CC 환경 변수('ccache gcc', 'gcc -m64' 등)를 명령과 인자로 나눌 때 사용합니다.
+import shutil       # C 컴파일러(cc, gcc, clang)가 설치되어 있는지 찾을 때 사용합니다.
+import subprocess   # C 컴파일러를 실행할 때 사용합니다.
+import sys
+import tempfile
+import threading
 
-# 이 함수는 C 공유 라이브러리를 로드하고 모든 C 함수를 정의하는 역할을 합니다.
-def load_c_filters_library():
-    # --- 1. C 공유 라이브러리 로드 ---
-    current_dir = os.path.dirname(os.path.abspath(__file__))
-    library_path = os.path.join(current_dir, 'c_filters.so')
+logger = logging.getLogger(__name__)
+
+_SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+_SOURCE_PATH = os.path.join(_SOURCE_DIR, 'c_filters.c')
+_PREBUILT_PATH = os.path.join(_SOURCE_DIR, 'c_filters.so')
+
+# 라이브러리에 반드시 있어야 하는 C 함수들입니다. 하나라도 없으면 예전 c_filters.c로 만든 '오래된' 라이브러리로 봅니다.
+KERNEL_NAMES = (
+    'apply_grayscale_c', 'apply_brightness_c',
+    'apply_grayscale_rows_c', 'apply_brightness_rows_c',
+    'apply_point_pipeline_rows_c', 'apply_lut_c', 'apply_lut_rows_c',
+    'apply_grayscale_format_rows_c', 'apply_point_pipeline_format_rows_c',
+    'apply_convolve_h_rows_c', 'apply_convolve_v_rows_c', 'apply_box_blur_h_rows_c', 'apply_box_blur_v_rows_c',
+    'apply_unsharp_rows_c', 'apply_sobel_rows_c',
+)
+
+# 라이브러리를 직접 빌드할 때 사용하는 컴파일 옵션입니다. (README의 gcc 명령보다 높은 최적화 수준)
+BUILD_FLAGS = ('-O3', '-shared', '-fPIC')
+
+# 프로세스 전체에서 한 번만 불러와 공유하는 필터 함수 모음 (get_kernels() 참고)
+_kernels = None
+_kernels_lock = threading.Lock()
+
+
+def build_cache_dir():
+    # 직접 빌드한 라이브러리를 저장하는 폴더입니다. IMAGE_APP_CACHE_DIR 환경 변수로 바꿀 수 있습니다.
+    cache_root = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.environ.get('IMAGE_APP_CACHE_DIR') or os.path.join(cache_root, 'python_c_image_app')
+
+
+def _find_compiler():
+    # 컴파일러 실행 명령을 [실행 파일 경로, 추가 인자...] 목록으로 돌려줍니다. 찾지 못하면 None입니다.
+    # CC는 make와 같이 인자를 포함할 수 있으므로('ccache gcc', 'gcc -m64'), 첫 단어만 실행 파일로 찾고 나머지는 인자로 넘깁니다.
+    compiler = os.environ.get('CC')
+    if compiler:
+        try:
+            parts = shlex.split(compiler)
+        except ValueError as e:
+            logger.warning("C_Interface: CC 환경 변수를 해석할 수 없습니다: %r - %s", compiler, e)
+            return None
+        path = shutil.which(parts[0]) if parts else None
+        return [path, *parts[1:]] if path else None
+    for name in ('cc', 'gcc', 'clang'):
+        path = shutil.which(name)
+        if path:
+            return [path]
+    return None
 
+
+def _open_library(library_path):
+    # 라이브러리를 불러오고 필요한 함수가 모두 있는지 확인합니다. 불러올 수 없거나 오래된 라이브러리면 None을 돌려줍니다.
     try:
         c_library = ctypes.CDLL(library_path)
-        print(f"C_Interface: '{library_path}' 라이브러리가 성공적으로 로드되었습니다.")
     except OSError as e:
-        print(f"오류: C_Interface: C 라이브러리 로드 실패 - {e}")
-        print(f"경로를 확인해주세요: {library_path}")
-        print("c_filters.so 파일이 src 폴더에 있거나, 경로가 정확한지 확인하세요.")
-        exit()
+        logger.warning("C_Interface: '%s' 라이브러리를 불러올 수 없습니다 - %s", library_path, e)
+        return None
+    missing = [name for name in KERNEL_NAMES if not hasattr(c_library, name)]
+    if missing:
+        logger.warning("C_Interface: '%s' 라이브러리가 오래되었습니다. (없는 함수: %s)", library_path, ', '.join(missing))
+        return None
+    return c_library
+
+
+def _build_library():
+    # c_filters.c를 컴파일해서 캐시 폴더에 저장하고 그 경로를 돌려줍니다. 컴파일러가 없거나 실패하면 None입니다.
+    # 파일 이름에 소스 내용, 컴파일러, 옵션, 플랫폼의 해시를 넣으므로 소스가 바뀌면 자동으로 다시 빌드됩니다.
+    compiler = _find_compiler()
+    if compiler is None or not os.path.exists(_SOURCE_PATH):
+        return None
+    with open(_SOURCE_PATH, 'rb') as f:
+        source = f.read()
+    digest = hashlib.blake2b(digest_size=8)
+    for part in (source, shlex.join(compiler).encode(), ' '.join(BUILD_FLAGS).encode(),
+                 sys.platform.encode(), platform.machine().encode()):
+        digest.update(part)
+        digest.update(b'\0')
+    cache_dir = build_cache_dir()
+    library_path = os.path.join(cache_dir, f"c_filters-{digest.hexdigest()}.so")
+    if os.path.exists(library_path):
+        return library_path
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        # 여러 프로세스가 동시에 빌드하더라도 반쯤 쓰인 파일을 불러오지 않도록, 임시 파일로 빌드한 뒤 이름을 바꿉니다.
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix='.so.tmp')
+        os.close(fd)
+    except OSError as e:
+        logger.warning("C_Interface: 빌드 캐시 폴더를 사용할 수 없습니다 - %s", e)
+        return None
+    logger.info("C_Interface: '%s'을(를) %s로 빌드합니다. → %s", _SOURCE_PATH, shlex.join(compiler), library_path)
+    try:
+        result = subprocess.run([*compiler, *BUILD_FLAGS, '-o', temp_path, _SOURCE_PATH],
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            logger.warning("C_Interface: C 라이브러리 빌드 실패\n%s", result.stderr.strip())
+            return None
+        os.replace(temp_path, library_path)
+        return library_path
+    except OSError as e:
+        logger.warning("C_Interface: C 라이브러리 빌드 실패 - %s", e)
+        return None
+    finally:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+# 이 함수는 C 공유 라이브러리를 로드하고 모든 C 함수를 정의하는 역할을 합니다.
+# 불러올 수 있는 라이브러리가 없으면 None을 돌려줍니다. (예전처럼 프로그램을 종료하지 않습니다)
+def load_c_filters_library():
+    # --- 1. C 공유 라이브러리 로드 ---
+    # src/c_filters.so가 c_filters.c보다 새 파일이면 그대로 사용하고,
+    # 없거나 오래되었거나 다른 환경(ABI)에서 빌드되어 불러올 수 없다면 c_filters.c를 직접 빌드합니다.
+    c_library = None
+    library_path = _PREBUILT_PATH
+    if os.path.exists(library_path) and (not os.path.exists(_SOURCE_PATH)
+                                         or os.path.getmtime(library_path) >= os.path.getmtime(_SOURCE_PATH)):
+        c_library = _open_library(library_path)
+    if c_library is None:
+        library_path = _build_library()
+        if library_path is not None:
+            c_library = _open_library(library_path)
+    if c_library is None:
+        logger.warning("C_Interface: C 라이브러리를 불러오거나 빌드할 수 없습니다. (경로: %s)", _PREBUILT_PATH)
+        return None
+    logger.info("C_Interface: '%s' 라이브러리가 성공적으로 로드되었습니다.", library_path)
 
     # --- 2. C 함수(apply_grayscale_c)의 인자 및 반환형 정의 ---
     # C 함수 시그니처: void apply_grayscale_c(unsigned char *pixels, int width, int height)
@@ -24,7 +143,7 @@ def load_c_filters_library():
         ctypes.c_int                     # height
     ]
     c_library.apply_grayscale_c.restype = None
-    print("C_Interface: C 함수 'apply_grayscale_c'의 시그니처가 성공적으로 정의되었습니다.")
+    logger.debug("C_Interface: C 함수 'apply_grayscale_c'의 시그니처가 성공적으로 정의되었습니다.")
 
     # --- NEW: C 함수(apply_brightness_c)의 인자 및 반환형 정의 ---
     # C 함수 시그니처: void apply_brightness_c(unsigned char *pixels, int width, int height, int brightness_factor)
@@ -35,12 +154,241 @@ def load_c_filters_library():
         ctypes.c_int                     # brightness_factor (밝기 조절 계수)
     ]
     c_library.apply_brightness_c.restype = None
-    print("C_Interface: C 함수 'apply_brightness_c'의 시그니처도 성공적으로 정의되었습니다.")
+    logger.debug("C_Interface: C 함수 'apply_brightness_c'의 시그니처도 성공적으로 정의되었습니다.")
+
+    # --- 행 범위(row-range) 필터 함수들의 인자 및 반환형 정의 ---
+    # 여러 스레드가 이미지를 띠(band) 단위로 나누어 처리할 때 사용합니다.
+    # C 함수 시그니처: void apply_grayscale_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride)
+    c_library.apply_grayscale_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels (이미지 전체의 시작 주소)
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row (포함)
+        ctypes.c_int,                    # end_row (미포함)
+        ctypes.c_int                     # stride (한 행의 바이트 수)
+    ]
+    c_library.apply_grayscale_rows_c.restype = None
+
+    # C 함수 시그니처: void apply_brightness_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride, int brightness_factor)
+    c_library.apply_brightness_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.c_int                     # brightness_factor
+    ]
+    c_library.apply_brightness_rows_c.restype = None
+    logger.debug("C_Interface: 행 범위 C 함수 'apply_grayscale_rows_c', 'apply_brightness_rows_c'의 시그니처도 정의되었습니다.")
+
+    # --- 합쳐진(fused) 파이프라인 함수의 인자 및 반환형 정의 ---
+    # C 함수 시그니처: void apply_point_pipeline_rows_c(unsigned char *pixels, int width, int start_row, int end_row,
+    #                                                  int stride, const unsigned char *luts, int num_stages)
+    c_library.apply_point_pipeline_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # luts (단계마다 R, G, B 256칸 테이블 3개)
+        ctypes.c_int                     # num_stages
+    ]
+    c_library.apply_point_pipeline_rows_c.restype = None
+    logger.debug("C_Interface: C 함수 'apply_point_pipeline_rows_c'의 시그니처도 정의되었습니다.")
+
+    # --- 룩업 테이블(LUT) 점 연산 함수들의 인자 및 반환형 정의 ---
+    # C 함수 시그니처: void apply_lut_c(unsigned char *pixels, int width, int height, const unsigned char *luts)
+    c_library.apply_lut_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # height
+        ctypes.POINTER(ctypes.c_ubyte)   # luts (R, G, B 채널별 256칸 테이블 3개, 총 768바이트)
+    ]
+    c_library.apply_lut_c.restype = None
+
+    # C 함수 시그니처: void apply_lut_rows_c(unsigned char *pixels, int width, int start_row, int end_row,
+    #                                       int stride, const unsigned char *luts)
+    c_library.apply_lut_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte)   # luts
+    ]
+    c_library.apply_lut_rows_c.restype = None
+    logger.debug("C_Interface: 룩업 테이블 C 함수 'apply_lut_c', 'apply_lut_rows_c'의 시그니처도 정의되었습니다.")
+
+    # --- 채널 수/비트 깊이를 받는 범용 함수들의 인자 및 반환형 정의 ---
+    # L, LA, RGBA, I;16 이미지를 RGB로 바꾸지 않고 처리할 때 사용합니다.
+    # C 함수 시그니처: void apply_grayscale_format_rows_c(unsigned char *pixels, int width, int start_row, int end_row,
+    #                                                    int stride, int channels, int color_channels, int bits_per_sample)
+    c_library.apply_grayscale_format_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride (바이트 단위)
+        ctypes.c_int,                    # channels (픽셀 하나의 채널 수)
+        ctypes.c_int,                    # color_channels (그중 색 채널 수, 나머지는 그대로 둠)
+        ctypes.c_int                     # bits_per_sample (8 또는 16)
+    ]
+    c_library.apply_grayscale_format_rows_c.restype = None
+
+    # C 함수 시그니처: void apply_point_pipeline_format_rows_c(unsigned char *pixels, int width, int start_row, int end_row,
+    #                                                         int stride, int channels, int color_channels,
+    #                                                         int bits_per_sample, const void *luts, int num_stages)
+    c_library.apply_point_pipeline_format_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # color_channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.c_void_p,                 # luts (8비트면 unsigned char, 16비트면 unsigned short 배열)
+        ctypes.c_int                     # num_stages
+    ]
+    c_library.apply_point_pipeline_format_rows_c.restype = None
+    logger.debug("C_Interface: 범용 C 함수 'apply_grayscale_format_rows_c', 'apply_point_pipeline_format_rows_c'의 시그니처도 정의되었습니다.")
+
+    # --- 공간(spatial) 필터 함수들의 인자 및 반환형 정의 ---
+    # 블러, 언샤프 마스크, 소벨 에지는 주변 픽셀을 읽으므로 읽는 버퍼(src)와 쓰는 버퍼(dst)를 따로 받습니다.
+    # 세로 방향 함수는 위아래 행을 읽기 위해 이미지 전체의 높이(height)도 받습니다.
+    # C 함수 시그니처: int apply_convolve_h_rows_c(const unsigned char *src, int width, int start_row, int end_row,
+    #                                             int stride, unsigned char *dst, int channels, int bits_per_sample,
+    #                                             const int *weights, int radius)
+    c_library.apply_convolve_h_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # src
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # dst
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.POINTER(ctypes.c_int),    # weights (2 * radius + 1개, 합이 1 << 14)
+        ctypes.c_int                     # radius
+    ]
+    c_library.apply_convolve_h_rows_c.restype = ctypes.c_int  # 0: 성공, -1: 임시 버퍼 할당 실패
+
+    # C 함수 시그니처: void apply_convolve_v_rows_c(const unsigned char *src, int width, int start_row, int end_row,
+    #                                              int stride, unsigned char *dst, int height, int channels,
+    #                                              int bits_per_sample, const int *weights, int radius)
+    c_library.apply_convolve_v_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # src
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # dst
+        ctypes.c_int,                    # height (이미지 전체의 행 수)
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.POINTER(ctypes.c_int),    # weights
+        ctypes.c_int                     # radius
+    ]
+    c_library.apply_convolve_v_rows_c.restype = None
+
+    # C 함수 시그니처: int apply_box_blur_h_rows_c(const unsigned char *src, int width, int start_row, int end_row,
+    #                                             int stride, unsigned char *dst, int channels, int bits_per_sample,
+    #                                             const int *radii, int num_passes)
+    c_library.apply_box_blur_h_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # src
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # dst
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.POINTER(ctypes.c_int),    # radii (패스별 반지름)
+        ctypes.c_int                     # num_passes
+    ]
+    c_library.apply_box_blur_h_rows_c.restype = ctypes.c_int  # 0: 성공, -1: 임시 버퍼 할당 실패
+
+    # C 함수 시그니처: void apply_box_blur_v_rows_c(const unsigned char *src, int width, int start_row, int end_row,
+    #                                              int stride, unsigned char *dst, int height, int channels,
+    #                                              int bits_per_sample, int radius)
+    c_library.apply_box_blur_v_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # src
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # dst
+        ctypes.c_int,                    # height
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.c_int                     # radius
+    ]
+    c_library.apply_box_blur_v_rows_c.restype = None
+
+    # C 함수 시그니처: void apply_unsharp_rows_c(unsigned char *pixels, int width, int start_row, int end_row, int stride,
+    #                                           const unsigned char *blurred, int channels, int color_channels,
+    #                                           int bits_per_sample, int percent, int threshold)
+    c_library.apply_unsharp_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # pixels (제자리에서 수정)
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # blurred (같은 이미지를 블러한 버퍼)
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # color_channels
+        ctypes.c_int,                    # bits_per_sample
+        ctypes.c_int,                    # percent
+        ctypes.c_int                     # threshold
+    ]
+    c_library.apply_unsharp_rows_c.restype = None
+
+    # C 함수 시그니처: void apply_sobel_rows_c(const unsigned char *src, int width, int start_row, int end_row, int stride,
+    #                                         unsigned char *dst, int height, int channels, int color_channels,
+    #                                         int bits_per_sample)
+    c_library.apply_sobel_rows_c.argtypes = [
+        ctypes.POINTER(ctypes.c_ubyte),  # src
+        ctypes.c_int,                    # width
+        ctypes.c_int,                    # start_row
+        ctypes.c_int,                    # end_row
+        ctypes.c_int,                    # stride
+        ctypes.POINTER(ctypes.c_ubyte),  # dst
+        ctypes.c_int,                    # height
+        ctypes.c_int,                    # channels
+        ctypes.c_int,                    # color_channels
+        ctypes.c_int                     # bits_per_sample
+    ]
+    c_library.apply_sobel_rows_c.restype = None
+    logger.debug("C_Interface: 공간 필터 C 함수(블러, 언샤프 마스크, 소벨)의 시그니처도 정의되었습니다.")
 
     return c_library
 
+
+def get_kernels():
+    # 프로세스 전체에서 함께 쓰는 필터 함수 모음을 돌려줍니다. 처음 호출될 때 한 번만 불러옵니다.
+    # C 라이브러리를 사용할 수 없으면 같은 이름과 같은 결과의 NumPy 구현(src/numpy_kernels.py)을 돌려줍니다.
+    # IMAGE_APP_KERNELS=numpy 환경 변수로 NumPy 구현을 강제로 사용할 수 있습니다.
+    global _kernels
+    if _kernels is None:
+        with _kernels_lock:
+            if _kernels is None:
+                c_library = None
+                if os.environ.get('IMAGE_APP_KERNELS', '').lower() != 'numpy':
+                    c_library = load_c_filters_library()
+                if c_library is None:
+                    from src import numpy_kernels
+                    logger.warning("C_Interface: C 라이브러리 대신 NumPy 필터 함수를 사용합니다. (더 느릴 수 있습니다)")
+                    c_library = numpy_kernels
+                _kernels = c_library
+    return _kernels
+
+
+def kernel_backend():
+    # 현재 사용 중인 필터 구현의 이름입니다. ('c' 또는 'numpy')
+    return 'c' if isinstance(get_kernels(), ctypes.CDLL) else 'numpy'
+
 # --- 모듈이 직접 실행될 때만 실행되는 코드 블록 (자체 테스트 용도) ---
 if __name__ == '__main__':
+    logging.basicConfig(level=logging.DEBUG, format='%(message)s')
     print("\n--- src/c_interface.py 모듈 자체 테스트 시작 ---")
     c_lib = load_c_filters_library() # 위에서 정의한 함수를 호출하여 C 라이브러리를 로드하고 설정합니다.
 
@@ -78,4 +426,122 @@ if __name__ == '__main__':
     c_lib.apply_brightness_c(dummy_brightness_pixels, dummy_brightness_width, dummy_brightness_height, -200)
     print(f"더미 픽셀 데이터 (밝기 -200 적용 후, 클리핑): {list(dummy_brightness_pixels)}") # 예상: [0, 0, 0]
 
+    # --- 행 범위 필터 테스트 ---
+    print("\n--- 행 범위 필터 테스트 ---")
+    # 가로 1픽셀, 세로 2픽셀 이미지에서 두 번째 행(1번 행)만 흑백으로 바꿉니다.
+    dummy_rows_pixels = (ctypes.c_ubyte * 6)(255, 0, 0, 255, 0, 0)
+    c_lib.apply_grayscale_rows_c(dummy_rows_pixels, 1, 1, 2, 3)
+    print(f"더미 픽셀 데이터 (1번 행만 흑백 적용 후): {list(dummy_rows_pixels)}") # 예상: [255, 0, 0, 85, 85, 85]
+    c_lib.apply_brightness_rows_c(dummy_rows_pixels, 1, 0, 1, 3, 10)
+    print(f"더미 픽셀 데이터 (0번 행만 밝기 +10 적용 후): {list(dummy_rows_pixels)}") # 예상: [255, 10, 10, 85, 85, 85]
+
+    # --- 룩업 테이블 필터 테스트 ---
+    print("\n--- 룩업 테이블 필터 테스트 ---")
+    # R 채널은 반전(255 - v), G 채널은 그대로, B 채널은 모두 0으로 바꾸는 테이블입니다.
+    dummy_luts = (ctypes.c_ubyte * 768)(*([255 - v for v in range(256)] + list(range(256)) + [0] * 256))
+    dummy_lut_pixels = (ctypes.c_ubyte * 3)(10, 20, 30)
+    c_lib.apply_lut_c(dummy_lut_pixels, 1, 1, dummy_luts)
+    print(f"더미 픽셀 데이터 (룩업 테이블 적용 후): {list(dummy_lut_pixels)}") # 예상: [245, 20, 0]
+
+    # --- 직접 빌드 테스트 ---
+    print("\n--- c_filters.c 직접 빌드 테스트 ---")
+    os.environ['IMAGE_APP_CACHE_DIR'] = tempfile.mkdtemp()
+    built_path = _build_library()
+    if built_path is None:
+        print("C 컴파일러가 없어 건너뜁니다.")
+    else:
+        assert _open_library(built_path) is not None, "직접 빌드한 라이브러리를 불러올 수 없습니다."
+        assert _build_library() == built_path, "같은 소스를 다시 빌드했습니다. (캐시가 사용되지 않음)"
+        print(f"빌드 및 캐시 재사용 확인: {built_path}")
+        # CC에 인자가 붙어 있어도('ccache gcc', 'gcc -m64' 등) 첫 단어만 실행 파일로 찾고 나머지는 인자로 넘겨야 합니다.
+        saved_cc = os.environ.get('CC')
+        try:
+            os.environ['CC'] = f"{shlex.quote(_find_compiler()[0])} -DIMAGE_APP_CC_TEST"
+            assert _find_compiler()[1:] == ['-DIMAGE_APP_CC_TEST'], f"CC를 잘못 나눴습니다: {_find_compiler()}"
+            cc_built_path = _build_library()
+            assert cc_built_path not in (None, built_path), "인자가 있는 CC로 빌드하지 못했습니다."
+            assert _open_library(cc_built_path) is not None
+            os.environ['CC'] = 'no-such-compiler -m64'
+            assert _find_compiler() is None
+        finally:
+            if saved_cc is None:
+                os.environ.pop('CC', None)
+            else:
+                os.environ['CC'] = saved_cc
+        print(f"인자가 있는 CC로 빌드 확인: {cc_built_path}")
+
+    # --- NumPy 대체 구현 비교 테스트 ---
+    # C 라이브러리가 없을 때 사용하는 NumPy 구현이 C 함수와 비트 단위로 같은 결과를 내는지 확인합니다.
+    print("\n--- NumPy 대체 구현 비교 테스트 ---")
+    sys.path.insert(0, os.path.dirname(_SOURCE_DIR))
+    import numpy as np
+    from src import numpy_kernels
+
+    rng = np.random.default_rng(0)
+    width, height, stride = 37, 23, 37 * 3 + 5   # 행 끝에 여분 바이트가 있는 버퍼
+    deep_stride = width * 4 * 2 + 6               # 16비트 4채널 버퍼 (행 끝 여분 포함)
+    source = rng.integers(0, 256, size=height * deep_stride, dtype=np.uint8)
+    random_luts = rng.integers(0, 256, size=768 * 3, dtype=np.uint8)
+    random_luts16 = rng.integers(0, 65536, size=3 * 65536 * 3, dtype=np.uint16)
+    cases = [
+        ('apply_grayscale_rows_c', (width, 3, 19, stride)),
+        ('apply_brightness_rows_c', (width, 0, height, stride, 77)),
+        ('apply_brightness_rows_c', (width, 5, 6, stride, -300)),
+        ('apply_lut_rows_c', (width, 2, height, stride, random_luts)),
+        ('apply_point_pipeline_rows_c', (width, 0, height, stride, random_luts, 1)),
+        ('apply_point_pipeline_rows_c', (width, 1, 22, stride, random_luts, 3)),
+        ('apply_grayscale_c', (width, 4)),
+        ('apply_brightness_c', (width, 4, 255)),
+        ('apply_lut_c', (width, 4, random_luts)),
+        # 채널/비트 깊이를 인자로 받는 함수: (채널 수, 색 채널 수, 비트 수)
+        ('apply_grayscale_format_rows_c', (width, 0, height, deep_stride, 4, 3, 8)),
+        ('apply_grayscale_format_rows_c', (width, 2, 20, deep_stride, 4, 3, 16)),
+        ('apply_point_pipeline_format_rows_c', (width, 0, height, stride, 1, 1, 8, random_luts, 3)),
+        ('apply_point_pipeline_format_rows_c', (width, 1, height, stride, 2, 1, 8, random_luts, 2)),
+        ('apply_point_pipeline_format_rows_c', (width, 0, height, deep_stride, 4, 3, 8, random_luts, 3)),
+        ('apply_point_pipeline_format_rows_c', (width, 0, height, deep_stride, 1, 1, 16, random_luts16, 3)),
+        ('apply_point_pipeline_format_rows_c', (width, 3, height, deep_stride, 4, 3, 16, random_luts16, 3)),
+        ('apply_point_pipeline_format_rows_c', (width, 0, height, deep_stride, 3, 3, 16, random_luts16, 1)),
+    ]
+    for name, args in cases:
+        c_pixels, numpy_pixels = source.copy(), source.copy()
+        c_args = [(ctypes.c_ubyte * a.nbytes).from_buffer(a) if isinstance(a, np.ndarray) else a for a in args]
+        getattr(c_lib, name)((ctypes.c_ubyte * c_pixels.size).from_buffer(c_pixels), *c_args)
+        getattr(numpy_kernels, name)((ctypes.c_ubyte * numpy_pixels.size).from_buffer(numpy_pixels), *c_args)
+        assert np.array_equal(c_pixels, numpy_pixels), f"{name}{args[:1]}: NumPy 구현 결과가 C와 다릅니다."
+    print(f"{len(cases)}개 경우 모두 C 함수와 결과 동일")
+
+    # 공간 필터: src를 읽어 dst에 쓰는 함수들은 dst를 비교합니다. (세로 방향/소벨은 가장자리 행을 포함한 행 범위도 확인)
+    weights5 = (ctypes.c_int * 11)(*([1489] * 11))     # 반지름 5, 합 1 << 14 (가운데에 나머지를 둠)
+    weights5[5] += (1 << 14) - 1489 * 11
+    radii = (ctypes.c_int * 3)(4, 4, 6)
+    spatial_cases = [
+        ('apply_convolve_h_rows_c', (width, 0, height, stride, 3, 8, weights5, 5)),
+        ('apply_convolve_h_rows_c', (width, 2, 9, deep_stride, 4, 16, weights5, 5)),
+        ('apply_convolve_v_rows_c', (width, 0, height, stride, height, 3, 8, weights5, 5)),
+        ('apply_convolve_v_rows_c', (width, 20, height, deep_stride, height, 2, 16, weights5, 5)),
+        ('apply_box_blur_h_rows_c', (width, 0, height, stride, 3, 8, radii, 3)),
+        ('apply_box_blur_h_rows_c', (width, 1, 5, deep_stride, 4, 16, radii, 2)),
+        ('apply_box_blur_h_rows_c', (width, 0, height, stride, 1, 8, (ctypes.c_int * 1)(60), 1)),
+        ('apply_box_blur_v_rows_c', (width, 0, height, stride, height, 3, 8, 6)),
+        ('apply_box_blur_v_rows_c', (width, 7, 16, deep_stride, height, 4, 16, 30)),
+        ('apply_sobel_rows_c', (width, 0, height, stride, height, 3, 3, 8)),
+        ('apply_sobel_rows_c', (width, 21, height, deep_stride, height, 4, 3, 16)),
+    ]
+    for name, (w, start, end, row_stride, *extra) in spatial_cases:
+        dst_c, dst_numpy = np.zeros_like(source), np.zeros_like(source)
+        src_c = (ctypes.c_ubyte * source.size).from_buffer(source.copy())
+        for dst, kernels in ((dst_c, c_lib), (dst_numpy, numpy_kernels)):
+            getattr(kernels, name)(src_c, w, start, end, row_stride, (ctypes.c_ubyte * dst.size).from_buffer(dst), *extra)
+        assert np.array_equal(dst_c, dst_numpy), f"{name}{tuple(extra[:3])}: NumPy 구현 결과가 C와 다릅니다."
+    blurred = np.ascontiguousarray(source[::-1])
+    for bits, percent, threshold in ((8, 150, 3), (16, 250, 771), (8, 0, 0)):
+        c_pixels, numpy_pixels = source.copy(), source.copy()
+        for pixels, kernels in ((c_pixels, c_lib), (numpy_pixels, numpy_kernels)):
+            kernels.apply_unsharp_rows_c((ctypes.c_ubyte * pixels.size).from_buffer(pixels), width, 0, height,
+                                         deep_stride, (ctypes.c_ubyte * blurred.size).from_buffer(blurred),
+                                         4, 3, bits, percent, threshold)
+        assert np.array_equal(c_pixels, numpy_pixels), f"apply_unsharp_rows_c({bits}비트): NumPy 구현 결과가 C와 다릅니다."
+    print(f"공간 필터 {len(spatial_cases) + 3}개 경우 모두 C 함수와 결과 동일")
+
     print("--- src/c_interface.py 모듈 자체 테스트 완료 ---\n")
\ No newline at end of file
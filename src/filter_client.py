@@ -0,0 +1,375 @@
+import json
+import os
+import socket
+import sys
+import threading
+import time
+from multiprocessing import shared_memory
+
+from PIL import Image
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈과 동일한 방식으로 프로젝트 루트를 검색 경로에 추가합니다.
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src import instrumentation
+from src.filter_server import DEFAULT_SOCKET_PATH
+from src.image_handler import copy_pixels_into, pixel_layout, to_supported_mode
+
+# 로컬 필터 서버(src/filter_server.py)의 클라이언트입니다.
+# 사용 예:
+#     with FilterClient() as client:
+#         result, report = client.apply_image(image, Pipeline().grayscale().brightness(40))
+#         print(report['kernel_ms'], report['overhead_ms'])
+#
+# 같은 크기의 프레임을 계속 처리한다면 SharedFrame을 직접 만들어 재사용하면 복사 없이 처리됩니다.
+#     with SharedFrame(640, 480, 'RGB') as frame:
+#         camera.read_into(frame.buf)          # 픽셀을 공유 메모리에 바로 씀
+#         client.apply(frame, 'grayscale')     # 서버가 frame.buf를 제자리에서 수정함
+
+
+class FilterServerError(RuntimeError):
+    # 서버에 연결할 수 없거나, 서버가 요청을 처리하지 못했을 때 발생합니다.
+    pass
+
+
+class ServerBusyError(FilterServerError):
+    # 서버의 대기 요청이 가득 차서 거절되었을 때(backpressure) 발생합니다. 잠시 뒤에 다시 보내면 됩니다.
+    pass
+
+
+class SharedFrame:
+    # 서버와 함께 쓰는 공유 메모리 픽셀 버퍼입니다. (PIXEL_LAYOUTS의 모드 배치, 예: RGB는 높이 x 너비 x 3 바이트)
+    # 만든 쪽(클라이언트)이 close()할 때 공유 메모리를 지웁니다.
+    def __init__(self, width, height, mode='RGB'):
+        channels, _, bits_per_sample = pixel_layout(mode)
+        self.width = width
+        self.height = height
+        self.mode = mode
+        self.nbytes = width * height * channels * bits_per_sample // 8
+        self._shm = shared_memory.SharedMemory(create=True, size=max(1, self.nbytes))
+        self.buf = self._shm.buf[:self.nbytes]   # 쓰기 가능한 memoryview (NumPy, ctypes 등에서 복사 없이 사용 가능)
+
+    @property
+    def name(self):
+        return self._shm.name
+
+    @classmethod
+    def from_image(cls, image):
+        image = to_supported_mode(image)
+        frame = cls(image.width, image.height, image.mode)
+        frame.write_image(image)
+        return frame
+
+    def write_image(self, image):
+        # Pillow 이미지의 픽셀을 공유 메모리로 한 번 복사합니다. (크기와 모드가 같아야 합니다)
+        if image.size != (self.width, self.height) or image.mode != self.mode:
+            raise ValueError(f"{image.width}x{image.height} {image.mode} 이미지는 "
+                             f"{self.width}x{self.height} {self.mode} 프레임에 쓸 수 없습니다.")
+        copy_pixels_into(image, self.buf)
+
+    def to_image(self):
+        # 공유 메모리의 픽셀로 새 Pillow 이미지를 만듭니다. (프레임을 닫거나 다시 써도 영향을 받지 않도록 복사본)
+        image = Image.frombuffer(self.mode, (self.width, self.height), self.buf, 'raw', self.mode, 0, 1)
+        return image.copy() if image.readonly else image
+
+    def as_array(self):
+        # 공유 메모리를 그대로 가리키는 NumPy 배열입니다. close() 전에 배열 참조를 모두 지워야 합니다.
+        import numpy as np
+        channels, _, bits_per_sample = pixel_layout(self.mode)
+        shape = (self.height, self.width) if channels == 1 else (self.height, self.width, channels)
+        return np.frombuffer(self.buf, dtype=np.uint16 if bits_per_sample == 16 else np.uint8).reshape(shape)
+
+    def close(self):
+        if self._shm is None:
+            return
+        self.buf.release()
+        self._shm.close()
+        self._shm.unlink()
+        self._shm = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+
+class FilterClient:
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, timeout=None, busy_retries=5, busy_backoff=0.005):
+        # timeout: 응답을 기다리는 최대 시간(초). (None이면 서버의 request_timeout까지 기다림)
+        # busy_retries: 서버가 'busy'로 거절했을 때 다시 보내는 횟수. 다 실패하면 ServerBusyError가 발생합니다.
+        # busy_backoff: 첫 재시도 전 기다리는 시간(초). 재시도마다 두 배씩 늘어납니다.
+        # 한 클라이언트(연결)는 요청을 하나씩 차례로 처리합니다. 여러 스레드에서 동시에 보내려면 스레드마다 클라이언트를 만드세요.
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.busy_retries = busy_retries
+        self.busy_backoff = busy_backoff
+        self._sock = None
+        self._file = None
+        self._lock = threading.Lock()
+        self._next_id = 0
+        self._frame = None   # apply_image()가 재사용하는 공유 메모리 프레임
+
+    def connect(self):
+        if self._sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError as e:
+                sock.close()
+                raise FilterServerError(f"필터 서버('{self.socket_path}')에 연결할 수 없습니다 - {e}")
+            self._sock = sock
+            self._file = sock.makefile('rb')
+        return self
+
+    def close(self):
+        if self._frame is not None:
+            self._frame.close()
+            self._frame = None
+        if self._sock is not None:
+            self._file.close()
+            self._sock.close()
+            self._sock = None
+            self._file = None
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
+
+    def _call(self, request):
+        # 요청 하나를 보내고 응답을 받습니다. 실패 응답이면 FilterServerError(또는 ServerBusyError)를 발생시킵니다.
+        with self._lock:
+            self.connect()
+            self._next_id += 1
+            request['id'] = self._next_id
+            try:
+                self._sock.sendall(json.dumps(request).encode() + b'\n')
+                line = self._file.readline()
+            except OSError as e:
+                self.close()
+                raise FilterServerError(f"필터 서버와 통신하지 못했습니다 - {e}")
+        if not line:
+            self.close()
+            raise FilterServerError("필터 서버가 연결을 끊었습니다.")
+        reply = json.loads(line)
+        if not reply.get('ok'):
+            error_type = ServerBusyError if reply.get('busy') else FilterServerError
+            raise error_type(f"필터 서버: {reply.get('error')}")
+        return reply
+
+    def ping(self):
+        return self._call({'op': 'ping'})
+
+    def stats(self):
+        return self._call({'op': 'stats'})
+
+    def apply(self, frame, pipeline):
+        # frame(SharedFrame)에 pipeline(Pipeline 또는 'grayscale,brightness=40' 같은 필터 문자열)을 서버에서 제자리로 적용합니다.
+        # 반환값은 지연 시간 보고서입니다. (ms 단위)
+        #   wait_ms, queue_ms, attach_ms, kernel_ms, server_ms: 서버가 잰 단계별 시간 (src/filter_server.py 참고)
+        #   round_trip_ms: 요청을 보내고 응답을 받기까지 전체, overhead_ms: 그중 커널을 뺀 시간
+        #   retries: 'busy'로 거절되어 다시 보낸 횟수, worker: 처리한 작업자 프로세스 번호
+        request = {'op': 'apply', 'shm': frame.name, 'width': frame.width, 'height': frame.height, 'mode': frame.mode,
+                   'filter': pipeline if isinstance(pipeline, str) else pipeline.to_spec()}
+        backoff = self.busy_backoff
+        for retries in range(self.busy_retries + 1):
+            start = time.perf_counter()
+            try:
+                reply = self._call(dict(request))
+                break
+            except ServerBusyError:
+                if retries == self.busy_retries:
+                    raise
+                time.sleep(backoff)
+                backoff *= 2
+        round_trip = time.perf_counter() - start
+        instrumentation.record('client.round_trip', round_trip)
+        report = dict(reply['timing'])
+        report['round_trip_ms'] = round_trip * 1000
+        report['overhead_ms'] = report['round_trip_ms'] - report['kernel_ms']
+        report['retries'] = retries
+        report['worker'] = reply['worker']
+        return report
+
+    def apply_image(self, image, pipeline):
+        # Pillow 이미지에 필터를 적용한 새 이미지와 지연 시간 보고서를 돌려줍니다.
+        # 공유 메모리 프레임은 크기와 모드가 같은 동안 계속 재사용합니다. (복사는 넣을 때와 꺼낼 때 한 번씩)
+        image = to_supported_mode(image)
+        frame = self._frame
+        if frame is None or (frame.width, frame.height, frame.mode) != (image.width, image.height, image.mode):
+            if frame is not None:
+                frame.close()
+            frame = self._frame = SharedFrame(image.width, image.height, image.mode)
+        frame.write_image(image)
+        try:
+            report = self.apply(frame, pipeline)
+        except FilterServerError:
+            # 시간 초과 뒤에는 작업자가 아직 이 프레임을 수정하고 있을 수 있으므로, 이 프레임은 다시 쓰지 않습니다.
+            self._frame = None
+            frame.close()
+            raise
+        return frame.to_image(), report
+
+
+if __name__ == '__main__':
+    import logging
+    import signal
+    import statistics
+    import tempfile
+    import numpy as np
+    from src.filter_server import FilterServer
+    from src.image_handler import ImageHandler
+    from src.pipeline import Pipeline
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    print("\n--- src/filter_client.py 모듈 자체 테스트 시작 ---")
+    socket_dir = tempfile.mkdtemp()
+    socket_path = os.path.join(socket_dir, 'filters.sock')
+    handler = ImageHandler()
+    rng = np.random.default_rng(0)
+
+    with FilterServer(socket_path, workers=2) as server, FilterClient(socket_path) as client:
+        print(f"ping: {client.ping()}")
+
+        print("\n--- 결과 비교 테스트 ---")
+        # 서버에서 처리한 결과가 같은 프로세스의 ImageHandler로 처리한 결과와 같아야 합니다.
+        test_pipeline = Pipeline().contrast(1.2).grayscale().brightness(30).gamma(1.5)
+        for mode, source in (('RGB', rng.integers(0, 256, size=(131, 257, 3), dtype=np.uint8)),
+                             ('RGBA', rng.integers(0, 256, size=(131, 257, 4), dtype=np.uint8)),
+                             ('L', rng.integers(0, 256, size=(131, 257), dtype=np.uint8)),
+                             ('I;16', rng.integers(0, 65536, size=(131, 257), dtype=np.uint16))):
+            image = Image.fromarray(source, mode if mode != 'I;16' else None)
+            served, report = client.apply_image(image, test_pipeline)
+            expected = handler.apply_pipeline(image, test_pipeline)
+            assert served.mode == mode and served.tobytes() == expected.tobytes(), f"{mode}: 서버 결과가 다릅니다."
+            print(f"{mode:<5} 결과 동일 (왕복 {report['round_trip_ms']:.2f} ms, 커널 {report['kernel_ms']:.2f} ms)")
+
+        # 잘못된 요청은 서버를 멈추지 않고 오류로 돌아와야 합니다.
+        for bad_filter in ('blur=3', ''):
+            with SharedFrame(4, 4) as frame:
+                try:
+                    client.apply(frame, bad_filter)
+                    raise AssertionError(f"'{bad_filter}' 필터가 거부되지 않았습니다.")
+                except FilterServerError as e:
+                    print(f"잘못된 필터 거부: {e}")
+        try:
+            client._call({'op': 'apply', 'shm': 'no_such_frame', 'width': 4, 'height': 4, 'filter': 'invert'})
+            raise AssertionError("없는 공유 메모리가 거부되지 않았습니다.")
+        except FilterServerError as e:
+            print(f"없는 공유 메모리 거부: {e}")
+
+        print("\n--- 크기별 통신 비용 테스트 ---")
+        # 픽셀은 공유 메모리에 그대로 있으므로, 커널을 뺀 왕복 비용(overhead)은 이미지 크기와 상관없이 비슷해야 합니다.
+        for megapixels in (0.1, 1, 10):
+            width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+            height = int(megapixels * 1e6) // width
+            with SharedFrame(width, height) as frame:
+                array = frame.as_array()
+                array[...] = rng.integers(0, 256, size=array.shape, dtype=np.uint8)
+                del array
+                reports = [client.apply(frame, 'grayscale,brightness=10') for _ in range(15)]
+            kernel_ms = statistics.median(r['kernel_ms'] for r in reports)
+            overhead_ms = statistics.median(r['overhead_ms'] for r in reports)
+            print(f"{megapixels:>5} MP: 커널 중앙값 {kernel_ms:8.2f} ms, 커널 외 왕복 비용 중앙값 {overhead_ms:6.2f} ms")
+
+        stats = client.stats()
+        assert stats['metrics']['spans']['server.request']['count'] == stats['metrics']['counters']['server.requests']
+        print(f"서버 요청 수: {stats['metrics']['counters']['server.requests']}, 대기 중: {stats['pending']}")
+
+    print("\n--- backpressure 테스트 ---")
+    # 작업자 1개, 대기 요청 1개인 서버에 여러 클라이언트가 동시에 보내면 일부는 'busy'로 거절되어야 하고,
+    # 재시도를 켠 클라이언트는 모두 처리되어야 합니다.
+    with FilterServer(socket_path, workers=1, max_pending=1, queue_timeout=0) as server:
+        outcomes = []
+        barrier = threading.Barrier(4)
+
+        def send(busy_retries):
+            with FilterClient(socket_path, busy_retries=busy_retries) as sender, SharedFrame(2000, 1500) as frame:
+                barrier.wait()
+                try:
+                    outcomes.append(sender.apply(frame, 'gamma=2.2,grayscale,invert')['retries'])
+                except ServerBusyError:
+                    outcomes.append('busy')
+
+        for busy_retries in (0, 20):
+            outcomes.clear()
+            threads = [threading.Thread(target=send, args=(busy_retries,)) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            print(f"재시도 {busy_retries}회: 결과 {outcomes}")
+            if busy_retries == 0:
+                assert 'busy' in outcomes and outcomes.count('busy') < 4, outcomes
+            else:
+                assert 'busy' not in outcomes, outcomes
+
+    print("\n--- 시간 초과 테스트 ---")
+    # 응답 시간(request_timeout)이 지나도 작업자는 계속 처리하므로, 끝날 때까지 그 요청의 자리는 돌려받지 않아야 합니다.
+    with FilterServer(socket_path, workers=1, max_pending=1, queue_timeout=0, request_timeout=0.05) as server:
+        with FilterClient(socket_path, busy_retries=0) as client, SharedFrame(4000, 3000) as frame:
+            try:
+                client.apply(frame, 'gaussian_blur=20')
+                raise AssertionError("시간 초과가 발생하지 않았습니다.")
+            except FilterServerError as e:
+                assert not isinstance(e, ServerBusyError), e
+                print(f"시간 초과 응답: {e}")
+            assert client.stats()['pending'] == 1, "처리 중인 작업자의 자리가 먼저 반환되었습니다."
+            try:
+                client.apply(frame, 'invert')
+                raise AssertionError("처리 중인 작업자가 있는데 새 요청이 받아들여졌습니다.")
+            except ServerBusyError:
+                pass
+            deadline = time.monotonic() + 30
+            while client.stats()['pending'] and time.monotonic() < deadline:
+                time.sleep(0.05)
+            assert client.stats()['pending'] == 0, "작업자가 끝난 뒤에도 자리가 반환되지 않았습니다."
+        print("시간 초과 후에도 작업자가 끝날 때까지 자리가 유지되고, 끝나면 반환됨")
+
+    print("\n--- 작업자 비정상 종료 테스트 ---")
+    # 처리 중인 작업자가 죽어도 그 요청의 자리는 돌아와야 하고, 서버는 새 작업자로 계속 요청을 처리해야 합니다.
+    with FilterServer(socket_path, workers=1, max_pending=1, queue_timeout=0) as server:
+        with FilterClient(socket_path, busy_retries=0) as client, SharedFrame(4000, 3000) as frame:
+            worker_pid = client.apply(frame, 'invert')['worker']
+            if os.path.exists('/proc/self/maps'):
+                # 작업자는 기본값으로 마지막 프레임 하나만 붙여 둡니다. 다른 프레임이 오면 앞의 프레임은 떼어야 합니다.
+                with SharedFrame(4000, 3000) as other:
+                    client.apply(other, 'invert')
+                with open(f'/proc/{worker_pid}/maps') as maps:
+                    assert frame.name.lstrip('/') not in maps.read(), "작업자가 지난 프레임을 계속 붙여 두고 있습니다."
+                print("작업자는 마지막 프레임만 붙여 둠")
+
+            outcomes = []
+
+            def send_long_request():
+                with FilterClient(socket_path, busy_retries=0) as sender_client:
+                    try:
+                        outcomes.append(sender_client.apply(frame, 'gaussian_blur=20'))
+                    except FilterServerError as e:
+                        outcomes.append(e)
+
+            sender = threading.Thread(target=send_long_request)
+            sender.start()
+            deadline = time.monotonic() + 10
+            while client.stats()['pending'] == 0 and time.monotonic() < deadline:
+                time.sleep(0.01)
+            time.sleep(0.1)   # 작업자가 요청을 받아 처리를 시작할 때까지
+            os.kill(worker_pid, signal.SIGKILL)
+            sender.join()
+            assert isinstance(outcomes[0], FilterServerError), "죽은 작업자의 요청이 성공으로 응답되었습니다."
+            print(f"처리 중 작업자 종료 응답: {outcomes[0]}")
+            assert client.stats()['pending'] == 0, "죽은 작업자가 차지한 자리가 반환되지 않았습니다."
+            new_worker_pid = client.apply(frame, 'invert')['worker']
+            assert new_worker_pid != worker_pid
+            assert client.stats()['metrics']['counters']['server.pool_restarts'] >= 1
+        print(f"작업자 {worker_pid}가 죽은 뒤 자리가 반환되고, 새 작업자 {new_worker_pid}가 요청을 처리함")
+    assert not os.path.exists(socket_path), "서버 종료 후 소켓 파일이 남아 있습니다."
+    print("--- src/filter_client.py 모듈 자체 테스트 완료 ---\n")
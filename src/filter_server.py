@@ -0,0 +1,420 @@
+import argparse                       # <--- 명령줄 인자(소켓 경로, 작업자 수 등)를 해석하기 위한 모듈입니다.
+import collections
+import concurrent.futures             # <--- 미리 C 라이브러리를 불러 둔 작업자 프로세스 풀을 만듭니다.
+import json                           # <--- 요청/응답 메시지를 한 줄짜리 JSON으로 주고받습니다.
+import logging
+import multiprocessing
+import os
+import queue
+import socket
+import socketserver                   # <--- Unix 도메인 소켓 서버 (연결마다 스레드 하나)
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory   # <--- 픽셀 버퍼를 복사하지 않고 프로세스끼리 공유합니다.
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈(batch.py, streaming.py)과 동일한 방식으로 프로젝트 루트를 검색 경로에 추가합니다.
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src import c_interface
+from src import instrumentation
+from src.image_handler import ImageHandler, pixel_layout
+from src.pipeline import Pipeline
+
+# 로컬 필터 서버입니다.
+# 여러 서비스가 각자 ImageHandler를 두고 c_filters.so를 불러오는 대신, 이 서버 하나에 Unix 도메인 소켓으로 요청을 보냅니다.
+#
+# - 픽셀은 소켓으로 보내지 않습니다. 클라이언트가 multiprocessing.shared_memory 공유 메모리에 프레임을 두고,
+#   요청에는 공유 메모리 이름, 크기, 모드, 필터 문자열만 담습니다. 작업자는 그 메모리를 직접 붙여서(attach) 제자리에서 수정합니다.
+#   그래서 요청 한 번의 통신 비용은 이미지 크기와 상관없이 거의 일정합니다.
+# - 작업자 프로세스들은 서버가 시작할 때 C 라이브러리를 미리 불러 둡니다. (첫 요청도 느리지 않음)
+# - 동시에 처리 중이거나 기다리는 요청이 max_pending개를 넘으면, queue_timeout초까지 기다린 뒤 'busy' 오류로 거절합니다. (backpressure)
+# - 응답마다 단계별 지연 시간(대기, 작업자 배정, 공유 메모리 연결, 커널, 서버 전체)을 돌려줍니다.
+#
+# 프로토콜: 한 연결에서 '\n'으로 끝나는 JSON 요청을 보내면 같은 형식의 응답이 하나씩 돌아옵니다.
+#     {"op": "apply", "id": 1, "shm": "psm_1234", "width": 640, "height": 480, "mode": "RGB", "filter": "grayscale,brightness=40"}
+#     → {"ok": true, "id": 1, "worker": 4321, "timing": {"wait_ms": ..., "queue_ms": ..., "attach_ms": ...,
+#                                                        "kernel_ms": ..., "server_ms": ...}}
+#     {"op": "ping"} → {"ok": true, "workers": 4, "kernel_backend": "c"}
+#     {"op": "stats"} → {"ok": true, "pending": 0, "metrics": instrumentation.snapshot()}
+#     실패하면 {"ok": false, "error": "메시지"}이며, 거절된 요청은 "busy": true가 붙습니다.
+#     request_timeout이 지난 요청은 "timeout": true가 붙습니다. 이때 작업자는 아직 그 프레임을 수정하고 있을 수 있으므로
+#     프레임 내용은 정의되지 않으며, 작업자가 끝낼 때까지 그 요청의 자리는 max_pending에 계속 포함됩니다.
+#     작업자 프로세스가 처리 중에 죽으면(크래시, kill 등) 그때 처리 중이던 요청은 모두 "worker_died": true로 실패하고,
+#     서버는 작업자 풀을 새로 만들어 계속 요청을 받습니다. 이 요청들의 프레임 내용도 정의되지 않습니다.
+#
+# 클라이언트는 src/filter_client.py의 FilterClient를 사용하세요.
+
+logger = logging.getLogger(__name__)
+
+# 기본 소켓 경로입니다. IMAGE_APP_SOCKET 환경 변수로 바꿀 수 있습니다.
+DEFAULT_SOCKET_PATH = os.environ.get('IMAGE_APP_SOCKET') or os.path.join(tempfile.gettempdir(), 'python_c_image_app.sock')
+
+# 한 요청 메시지의 최대 길이(바이트)입니다. 픽셀은 공유 메모리로 오므로 요청은 항상 작습니다.
+MAX_REQUEST_BYTES = 64 * 1024
+
+# 작업자 하나가 열어 두는 공유 메모리 프레임 수의 기본값입니다. (_attached_frame 참고)
+ATTACH_CACHE_SIZE = 1
+
+# 각 작업자 프로세스가 한 번만 만들어서 계속 재사용하는 ImageHandler와 열어 둔 공유 메모리입니다.
+_worker_handler = None
+_attached = collections.OrderedDict()   # 공유 메모리 이름 → SharedMemory (오래 안 쓴 순서)
+_attach_cache_size = ATTACH_CACHE_SIZE
+
+
+def attach_shared_memory(name):
+    # 다른 프로세스가 만든 공유 메모리를 붙입니다.
+    # Python 3.12 이하에서는 붙이기만 한 프로세스도 resource_tracker에 등록되어, 그 프로세스가 끝날 때
+    # 만든 쪽(클라이언트)의 공유 메모리를 지워 버립니다. 그래서 붙이는 동안에만 등록을 건너뜁니다. (3.13부터는 track=False)
+    # 작업자 프로세스에서 요청을 하나씩 처리하는 스레드 하나만 부르므로, 모듈 함수를 잠시 바꿔도 안전합니다.
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:
+        pass
+    from multiprocessing import resource_tracker
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+
+def _attached_frame(shm_name):
+    # 작업자마다 최근에 붙인 공유 메모리를 _attach_cache_size개(기본값 1)까지 열어 둡니다.
+    # 같은 프레임을 다시 보내는 클라이언트(영상 처리 등)는 요청마다 mmap/munmap을 하지 않으므로,
+    # 통신 비용이 프레임 크기와 상관없이 일정해집니다.
+    # 클라이언트가 지운(unlink) 프레임도 작업자가 열어 두는 동안에는 메모리가 반환되지 않으므로, 기본값은 마지막 프레임 하나만 둡니다.
+    # 여러 클라이언트가 각자 프레임을 재사용하면 --attach-cache로 늘릴 수 있습니다. (작업자마다 프레임 크기 x 개수만큼 메모리를 더 붙잡습니다)
+    shm = _attached.pop(shm_name, None)
+    if shm is None:
+        while _attached and len(_attached) >= _attach_cache_size:
+            _attached.popitem(last=False)[1].close()
+        shm = attach_shared_memory(shm_name)
+    _attached[shm_name] = shm
+    return shm
+
+
+def _init_worker(ready_queue, num_threads, attach_cache_size=ATTACH_CACHE_SIZE):
+    # 작업자 프로세스가 시작될 때 딱 한 번 호출됩니다. 첫 요청이 오기 전에 C 라이브러리를 불러 둡니다.
+    global _worker_handler, _attach_cache_size
+    _attach_cache_size = max(1, attach_cache_size)
+    _worker_handler = ImageHandler(num_threads=num_threads)
+    _worker_handler.c_lib
+    ready_queue.put((os.getpid(), c_interface.kernel_backend()))
+
+
+def _process_request(shm_name, width, height, mode, filter_spec):
+    # 작업자 프로세스 안에서 공유 메모리의 프레임에 필터를 제자리(in-place)로 적용합니다.
+    # 서버 프로세스와 시간을 비교할 수 있도록 time.monotonic() 값을 돌려줍니다. (시스템 전체에서 같은 시계)
+    started = time.monotonic()
+    pipeline = Pipeline.from_spec(filter_spec)
+    channels, _, bits_per_sample = pixel_layout(mode)
+    num_bytes = width * height * channels * bits_per_sample // 8
+    shm = _attached_frame(shm_name)
+    if shm.size < num_bytes:
+        raise ValueError(f"공유 메모리 크기({shm.size} 바이트)가 {width}x{height} {mode} 프레임({num_bytes} 바이트)보다 작습니다.")
+    with shm.buf[:num_bytes] as frame:
+        kernel_start = time.monotonic()
+        ok = _worker_handler.apply_pipeline_inplace(frame, width, height, pipeline, mode=mode)
+        kernel_end = time.monotonic()
+    if not ok:
+        raise ValueError("필터를 적용할 수 없는 프레임입니다.")
+    return os.getpid(), started, kernel_start, kernel_end
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    # 연결 하나를 담당합니다. 연결이 끊길 때까지 요청을 한 줄씩 읽어 처리하고 응답을 한 줄씩 씁니다.
+    def handle(self):
+        while True:
+            line = self.rfile.readline(MAX_REQUEST_BYTES + 1)
+            if not line:
+                return
+            if len(line) > MAX_REQUEST_BYTES:
+                self._reply({'ok': False, 'error': "요청이 너무 깁니다."})
+                return
+            try:
+                request = json.loads(line)
+                if not isinstance(request, dict):
+                    raise ValueError("요청은 JSON 객체여야 합니다.")
+            except ValueError as e:
+                self._reply({'ok': False, 'error': f"요청을 해석할 수 없습니다 - {e}"})
+                continue
+            self._reply(self.server.filter_server.handle_request(request))
+
+    def _reply(self, reply):
+        try:
+            self.wfile.write(json.dumps(reply, ensure_ascii=False).encode() + b'\n')
+        except OSError:
+            pass   # 클라이언트가 먼저 연결을 끊은 경우
+
+
+class _UnixServer(socketserver.ThreadingUnixStreamServer):
+    daemon_threads = True
+
+
+class FilterServer:
+    def __init__(self, socket_path=DEFAULT_SOCKET_PATH, workers=None, max_pending=None, queue_timeout=1.0,
+                 request_timeout=60.0, threads_per_worker=1, attach_cache_size=ATTACH_CACHE_SIZE):
+        # workers: 작업자 프로세스 수 (기본값: CPU 코어 수)
+        # max_pending: 동시에 받아 둘 수 있는 요청 수 (처리 중 + 대기 중, 기본값: 작업자 수의 2배)
+        # queue_timeout: 자리가 없을 때 거절하기 전까지 기다리는 시간(초). 0이면 바로 거절합니다.
+        # request_timeout: 작업자가 이 시간(초) 안에 끝내지 못하면 오류로 응답합니다. (작업자는 계속 처리하며, 끝날 때까지 자리를 차지합니다)
+        # threads_per_worker: 작업자 하나가 큰 프레임을 나누어 처리할 스레드 수 (기본값 1: 프로세스끼리 코어를 나눔)
+        # attach_cache_size: 작업자 하나가 붙여 둔 채로 재사용하는 공유 메모리 프레임 수 (기본값 1, _attached_frame 참고)
+        self.socket_path = socket_path
+        self.workers = max(1, workers or os.cpu_count() or 1)
+        self.max_pending = max(1, max_pending or self.workers * 2)
+        self.queue_timeout = queue_timeout
+        self.request_timeout = request_timeout
+        self.threads_per_worker = max(1, threads_per_worker)
+        self.attach_cache_size = max(1, attach_cache_size)
+        self.kernel_backend = None
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._pending = 0
+        self._pending_lock = threading.Lock()
+        self._pool = None
+        self._pool_lock = threading.Lock()   # 죽은 작업자 때문에 깨진 풀을 한 요청만 새로 만들도록 합니다.
+        self._server = None
+        self._serve_thread = None
+
+    def start(self):
+        # 작업자 풀을 만들고 모든 작업자가 C 라이브러리를 불러올 때까지 기다린 뒤, 소켓에서 요청을 받기 시작합니다.
+        self._remove_stale_socket()
+        self._pool = self._start_pool()
+        self._server = _UnixServer(self.socket_path, _RequestHandler)
+        self._server.filter_server = self
+        self._serve_thread = threading.Thread(target=self._server.serve_forever, name='filter-server', daemon=True)
+        self._serve_thread.start()
+        logger.info("FilterServer: '%s'에서 요청을 받습니다. (작업자 %d개, 커널 %s, 최대 대기 요청 %d개)",
+                    self.socket_path, self.workers, self.kernel_backend, self.max_pending)
+        return self
+
+    def _start_pool(self):
+        # 작업자 풀은 concurrent.futures.ProcessPoolExecutor입니다. 작업자가 처리 중에 죽으면 multiprocessing.Pool은
+        # 그 작업의 callback을 영영 부르지 않아 자리가 새지만, ProcessPoolExecutor는 처리 중이던 작업을 모두
+        # BrokenProcessPool로 끝내므로 자리가 항상 돌아옵니다. (대신 깨진 풀은 다시 쓸 수 없어 _replace_broken_pool로 새로 만듭니다)
+        ready_queue = multiprocessing.Queue()
+        pool = concurrent.futures.ProcessPoolExecutor(
+            max_workers=self.workers, initializer=_init_worker,
+            initargs=(ready_queue, self.threads_per_worker, self.attach_cache_size))
+        # ProcessPoolExecutor는 작업이 들어와야 작업자 프로세스를 띄우므로, 작업자 수만큼 빈 작업을 보내 모두 미리 띄웁니다.
+        for _ in range(self.workers):
+            pool.submit(os.getpid)
+        try:
+            backends = {ready_queue.get(timeout=120)[1] for _ in range(self.workers)}
+        except queue.Empty:
+            self._terminate_pool(pool)
+            raise RuntimeError("FilterServer: 작업자 프로세스가 준비되지 않았습니다.")
+        self.kernel_backend = ','.join(sorted(backends))
+        return pool
+
+    @staticmethod
+    def _terminate_pool(pool):
+        # 처리 중인 작업을 기다리지 않고 작업자 프로세스를 끝냅니다. (multiprocessing.Pool.terminate()와 같은 동작)
+        # ProcessPoolExecutor에는 공개된 terminate가 없어 작업자 프로세스 목록(_processes)을 직접 씁니다.
+        processes = list((pool._processes or {}).values())
+        for process in processes:
+            process.terminate()
+        pool.shutdown(wait=True, cancel_futures=True)
+        for process in processes:
+            process.join()
+
+    def _replace_broken_pool(self, broken_pool):
+        # 작업자가 죽어 깨진 풀을 새 풀로 바꾸고, 지금 쓸 풀을 돌려줍니다.
+        # 여러 요청이 동시에 깨진 풀을 만나도 한 번만 새로 만듭니다.
+        with self._pool_lock:
+            if self._pool is broken_pool:
+                logger.warning("FilterServer: 작업자 프로세스가 비정상 종료했습니다. 작업자 풀을 다시 만듭니다.")
+                instrumentation.count('server.pool_restarts')
+                self._terminate_pool(broken_pool)
+                self._pool = self._start_pool()
+            return self._pool
+
+    def serve_forever(self):
+        # start() 후 Ctrl+C(KeyboardInterrupt)가 올 때까지 기다립니다.
+        if self._serve_thread is None:
+            self.start()
+        try:
+            while self._serve_thread.is_alive():
+                self._serve_thread.join(0.5)
+        except KeyboardInterrupt:
+            logger.info("FilterServer: 종료합니다.")
+        finally:
+            self.shutdown()
+
+    def shutdown(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+        if self._pool is not None:
+            self._terminate_pool(self._pool)
+            self._pool = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.shutdown()
+        return False
+
+    def _remove_stale_socket(self):
+        # 이전 서버가 비정상 종료하며 남긴 소켓 파일은 지우고, 실제로 실행 중인 서버가 있으면 오류를 냅니다.
+        if not os.path.exists(self.socket_path):
+            return
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except OSError:
+            os.remove(self.socket_path)
+        else:
+            raise RuntimeError(f"FilterServer: '{self.socket_path}'에서 이미 다른 서버가 실행 중입니다.")
+        finally:
+            probe.close()
+
+    def handle_request(self, request):
+        op = request.get('op')
+        if op == 'apply':
+            return self._handle_apply(request)
+        if op == 'ping':
+            return {'ok': True, 'id': request.get('id'), 'workers': self.workers, 'kernel_backend': self.kernel_backend}
+        if op == 'stats':
+            return {'ok': True, 'id': request.get('id'), 'pending': self._pending, 'max_pending': self.max_pending,
+                    'metrics': instrumentation.snapshot()}
+        return {'ok': False, 'id': request.get('id'), 'error': f"알 수 없는 요청입니다: {op!r}"}
+
+    def _release_slot(self, _future=None):
+        # 작업자가 요청 하나를 끝냈을 때(성공, 실패, 작업자 비정상 종료 모두) 풀의 관리 스레드에서 호출됩니다. (Future.add_done_callback)
+        with self._pending_lock:
+            self._pending -= 1
+        self._slots.release()
+
+    def _handle_apply(self, request):
+        received = time.monotonic()
+        request_id = request.get('id')
+        try:
+            args = (str(request['shm']), int(request['width']), int(request['height']),
+                    str(request.get('mode', 'RGB')), str(request['filter']))
+        except (KeyError, TypeError, ValueError) as e:
+            return {'ok': False, 'id': request_id, 'error': f"요청 항목이 올바르지 않습니다 - {e!r}"}
+
+        # backpressure: 자리가 날 때까지 queue_timeout초만 기다리고, 그래도 없으면 거절해서 클라이언트가 속도를 줄이게 합니다.
+        if self.queue_timeout > 0:
+            acquired = self._slots.acquire(timeout=self.queue_timeout)
+        else:
+            acquired = self._slots.acquire(blocking=False)
+        if not acquired:
+            instrumentation.count('server.rejected')
+            return {'ok': False, 'id': request_id, 'busy': True,
+                    'error': f"서버가 바쁩니다. (대기 요청 {self.max_pending}개)"}
+        with self._pending_lock:
+            self._pending += 1
+        # 자리는 작업자가 실제로 작업을 끝냈을 때(성공이든 실패든) 돌려줍니다. 응답 시간이 지나도 작업자는 계속 처리하므로,
+        # 그때 자리를 먼저 돌려주면 바쁜 작업자가 세어지지 않아 backpressure가 작동하지 않습니다.
+        submitted = time.monotonic()
+        pool = self._pool
+        try:
+            try:
+                future = pool.submit(_process_request, *args)
+            except BrokenProcessPool:
+                # 다른 요청을 처리하던 작업자가 죽어 풀이 이미 깨져 있으면, 새 풀을 만들어 한 번 더 보냅니다.
+                pool = self._replace_broken_pool(pool)
+                future = pool.submit(_process_request, *args)
+        except Exception as e:
+            self._release_slot()
+            instrumentation.count('server.errors')
+            return {'ok': False, 'id': request_id, 'error': str(e)}
+        future.add_done_callback(self._release_slot)   # 이미 끝난 작업이면 바로 호출됩니다.
+        try:
+            worker_pid, started, kernel_start, kernel_end = future.result(self.request_timeout)
+        except concurrent.futures.TimeoutError:
+            instrumentation.count('server.errors')
+            instrumentation.count('server.timeouts')
+            # 작업자는 아직 이 프레임을 수정하고 있을 수 있습니다. 클라이언트는 이 프레임의 내용을 믿을 수 없습니다.
+            return {'ok': False, 'id': request_id, 'timeout': True,
+                    'error': f"{self.request_timeout}초 안에 처리되지 않았습니다. "
+                             f"작업자가 아직 처리 중일 수 있어 프레임 내용은 정의되지 않습니다."}
+        except BrokenProcessPool:
+            instrumentation.count('server.errors')
+            instrumentation.count('server.worker_deaths')
+            try:
+                self._replace_broken_pool(pool)
+            except RuntimeError as e:
+                logger.error("오류: %s", e)
+            return {'ok': False, 'id': request_id, 'worker_died': True,
+                    'error': "작업자 프로세스가 처리 중에 비정상 종료했습니다. 프레임 내용은 정의되지 않습니다."}
+        except Exception as e:
+            instrumentation.count('server.errors')
+            return {'ok': False, 'id': request_id, 'error': str(e)}
+
+        finished = time.monotonic()
+        timing = {
+            'wait_ms': (submitted - received) * 1000,        # backpressure 자리를 기다린 시간
+            'queue_ms': (started - submitted) * 1000,        # 작업자에게 전달되기까지
+            'attach_ms': (kernel_start - started) * 1000,    # 필터 해석 + 공유 메모리 연결
+            'kernel_ms': (kernel_end - kernel_start) * 1000,  # C 필터
+            'server_ms': (finished - received) * 1000,       # 서버가 요청을 받고 응답하기까지 전체
+        }
+        instrumentation.count('server.requests')
+        instrumentation.count('pixels', args[1] * args[2])
+        instrumentation.record('server.queue', started - submitted)
+        instrumentation.record('server.kernel', kernel_end - kernel_start)
+        instrumentation.record('server.request', finished - received)
+        logger.debug("FilterServer: 요청 %s %dx%d %s '%s' → %s", request_id, args[1], args[2], args[3], args[4],
+                     ', '.join(f"{k} {v:.2f}" for k, v in timing.items()))
+        return {'ok': True, 'id': request_id, 'worker': worker_pid, 'timing': timing}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m src.filter_server',
+        description="공유 메모리로 프레임을 주고받는 로컬 필터 서버를 실행합니다. (클라이언트: src/filter_client.py)")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH,
+                        help=f"Unix 도메인 소켓 경로 (기본값: {DEFAULT_SOCKET_PATH}, IMAGE_APP_SOCKET 환경 변수)")
+    parser.add_argument('-j', '--workers', type=int, default=None,
+                        help="작업자 프로세스 수 (기본값: CPU 코어 수)")
+    parser.add_argument('--max-pending', type=int, default=None,
+                        help="동시에 받아 둘 요청 수. 넘치면 'busy'로 거절합니다. (기본값: 작업자 수의 2배)")
+    parser.add_argument('--queue-timeout', type=float, default=1.0,
+                        help="자리가 없을 때 거절하기 전까지 기다리는 시간(초) (기본값: 1.0)")
+    parser.add_argument('--threads-per-worker', type=int, default=1,
+                        help="작업자 하나가 큰 프레임을 나누어 처리할 스레드 수 (기본값: 1)")
+    parser.add_argument('--attach-cache', type=int, default=ATTACH_CACHE_SIZE,
+                        help="작업자 하나가 붙여 둔 채로 재사용하는 공유 메모리 프레임 수. 클라이언트가 지운 프레임도 "
+                             f"밀려날 때까지 메모리에 남습니다. (기본값: {ATTACH_CACHE_SIZE})")
+    parser.add_argument('--metrics-interval', type=float, default=0,
+                        help="이 간격(초)마다 요청 지연 시간 측정값을 로그에 남깁니다. (기본값: 0, 사용 안 함)")
+    parser.add_argument('-v', '--verbose', action='store_true', help="요청마다 지연 시간을 로그에 남깁니다.")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("작업자 수는 1 이상이어야 합니다.")
+    if args.max_pending is not None and args.max_pending < 1:
+        parser.error("--max-pending은 1 이상이어야 합니다.")
+    if args.attach_cache < 1:
+        parser.error("--attach-cache는 1 이상이어야 합니다.")
+
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.INFO, format='%(message)s')
+    if args.metrics_interval > 0:
+        instrumentation.start_periodic_dump(args.metrics_interval)
+    server = FilterServer(args.socket, workers=args.workers, max_pending=args.max_pending,
+                          queue_timeout=args.queue_timeout, threads_per_worker=args.threads_per_worker,
+                          attach_cache_size=args.attach_cache)
+    try:
+        server.start()
+    except (OSError, RuntimeError) as e:
+        logger.error("오류: %s", e)
+        return 1
+    server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -3,6 +3,8 @@ from tkinter import filedialog, messagebox # <--- 파일 열기/저장 창과 
 from PIL import Image, ImageTk        # <--- 이미지 로드/표시를 위해 Pillow 라이브러리와 Tkinter용 확장 기능을 가져옵니다.
 import os                             # <--- 파일 경로를 다룰 때 사용합니다.
 import sys                            # <--- 모듈 검색 경로를 설정하기 위해 필요합니다.
+import queue                          # <--- 백그라운드 작업자가 계산한 미리보기 결과를 메인(Tk) 스레드로 넘겨줄 때 사용합니다.
+from concurrent.futures import ThreadPoolExecutor # <--- 미리보기 필터를 Tk 메인 스레드 밖에서 계산하기 위한 작업자입니다.
 
 # --- 중요: 파이썬 모듈 검색 경로 설정 ---
 # 이 gui_app.py 파일이 다른 모듈(image_handler)을 잘 찾을 수 있도록 경로를 설정합니다.
@@ -12,7 +14,16 @@ project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
 sys.path.insert(0, project_root_dir)
 
 # 이제 image_handler 모듈을 불러올 수 있습니다.
-from src.image_handler import ImageHandler # <--- 우리가 만든 '이미지 처리 담당자' 모듈을 가져옵니다.
+from src.image_handler import ImageHandler, to_8bit # <--- 우리가 만든 '이미지 처리 담당자' 모듈을 가져옵니다.
+from src.pipeline import Pipeline         # <--- 여러 필터를 한 번의 C 순회로 합쳐서 적용하기 위한 파이프라인입니다.
+from src.history import EditHistory       # <--- 되돌리기/다시 실행을 위한 편집 기록입니다.
+
+# --- 미리보기(preview) 관련 설정 ---
+PREVIEW_DEBOUNCE_MS = 15   # 슬라이더 이벤트를 이 시간(ms) 동안 모아서 마지막 값 하나만 계산합니다.
+PREVIEW_POLL_MS = 5        # 백그라운드 작업자의 결과가 도착했는지 확인하는 간격(ms)입니다.
+RESIZE_DEBOUNCE_MS = 150   # 창 크기 변경이 멈춘 뒤 이 시간(ms)이 지나면 미리보기용 축소 이미지를 다시 만듭니다.
+PREVIEW_CACHE_BYTES = 256 * 1024 * 1024  # 미리보기 결과를 기억해 둘 캐시 크기. 슬라이더를 전에 본 값으로 되돌리면 다시 계산하지 않습니다.
+HISTORY_BUDGET_BYTES = 64 * 1024 * 1024  # 편집 기록이 미리보기 체크포인트를 저장하는 데 쓸 수 있는 메모리 크기입니다.
 
 # ImageApp 클래스: 우리 앱의 '얼굴'과 모든 기능을 총괄하는 역할을 합니다.
 # 마치 자동차 설계도처럼, 이 클래스로 '앱'이라는 자동차를 만들 수 있어요.
@@ -21,12 +32,37 @@ class ImageApp:
         self.master = master
         master.title("Python-C Image Filter App")
 
-        self.image_handler = ImageHandler()
+        self.image_handler = ImageHandler(cache_bytes=PREVIEW_CACHE_BYTES)
 
-        self.original_image = None
+        self.image_path = None       # 불러온 이미지 파일 경로 (화면용 축소 이미지와 원본을 모두 이 파일에서 불러옵니다)
+        self.original_image = None   # 원본 해상도 이미지 (처음 저장할 때 불러와서 이후 저장에 재사용합니다)
         self.processed_image = None
         self.tk_image = None
         self.current_brightness = 0 # COMMENT: 빨간색으로 표시된 추가 코드입니다. 현재 밝기 값을 저장할 변수
+        self.current_blur = 0          # 가우시안 블러 반지름 (원본 해상도 기준 픽셀, 0이면 블러 없음)
+        self.original_size = None      # 원본 이미지의 (너비, 높이). 미리보기에서 블러 반지름을 축소 비율에 맞출 때 사용합니다.
+
+        # --- 편집 기록(되돌리기/다시 실행) ---
+        # 흑백, 선명하게, 윤곽선 버튼은 누를 때마다 한 단계로 기록됩니다.
+        # 밝기/블러 슬라이더는 아직 기록하지 않은 '조정 중' 상태로 미리보기에만 보이고, 다른 버튼을 누르면 한 단계로 기록됩니다.
+        # 기록은 단계마다 이미지를 저장하지 않고 필터 목록만 남기므로(src/history.py), 편집이 길어져도 메모리가 늘지 않습니다.
+        # 미리보기는 축소 이미지로 기록하고, 저장할 때는 기록된 필터 전체를 원본 해상도에 한 번에 적용합니다.
+        # 기록/되돌리기는 미리보기 작업자 스레드에서 실행합니다. (run_history_action 참고)
+        self.history = None
+
+        # --- 미리보기(preview) 상태 ---
+        # 화면에는 원본을 표시 영역 크기로 한 번만 줄여 둔 '축소 이미지(proxy)'에 필터를 적용한 결과를 보여줍니다.
+        # 원본 해상도 처리는 저장할 때만 합니다. 그래서 원본이 아무리 커도 슬라이더 반응 속도는 화면 크기에만 좌우됩니다.
+        # 축소 이미지는 원본 해상도로 풀지 않고 처음부터 줄여서 불러옵니다. (JPEG은 1/2, 1/4, 1/8 크기로 바로 디코딩)
+        self.preview_proxy = None          # 표시 영역 크기로 줄인 원본 (이미지 로드/창 크기 변경 시에만 다시 만듦)
+        self.preview_proxy_basis = None    # preview_proxy를 만들 때 기준이 된 (표시 영역 너비, 높이)
+        self.preview_generation = 0        # 미리보기 요청 번호. 번호가 바뀌면 그 전 요청의 결과는 버립니다.
+        self.preview_shown_generation = 0  # 마지막으로 화면에 표시한 미리보기 요청 번호
+        self.preview_pending = None        # 모아 둔 슬라이더 이벤트를 처리할 after() 예약 ID
+        self.preview_polling = False       # 결과 확인(after) 반복이 진행 중인지 여부
+        self.preview_results = queue.Queue()
+        self.preview_worker = ThreadPoolExecutor(max_workers=1) # 미리보기 전용 백그라운드 작업자 (한 번에 하나씩)
+        self.resize_pending = None         # 창 크기 변경 처리를 위한 after() 예약 ID
 
         # --- GUI 요소들을 생성합니다 ---
 
@@ -50,6 +86,12 @@ class ImageApp:
         self.save_button = tk.Button(self.button_frame, text="이미지 저장", command=self.save_image)
         self.save_button.pack(side=tk.LEFT, padx=5)
 
+        # '실행 취소', '다시 실행' 버튼 (Ctrl+Z, Ctrl+Y로도 사용할 수 있습니다)
+        self.undo_button = tk.Button(self.button_frame, text="실행 취소", command=self.undo)
+        self.undo_button.pack(side=tk.LEFT, padx=5)
+        self.redo_button = tk.Button(self.button_frame, text="다시 실행", command=self.redo)
+        self.redo_button.pack(side=tk.LEFT, padx=5)
+
         # --- NEW CODE START --- (COMMENT: 빨간색으로 표시된 추가 코드입니다.)
         # 6. 밝기 조절 프레임 (슬라이더와 레이블을 묶어서 관리)
         self.brightness_frame = tk.Frame(master)
@@ -74,6 +116,27 @@ class ImageApp:
         self.reset_brightness_button.pack(side=tk.LEFT, padx=5)
         # --- NEW CODE END ---
 
+        # 10. 공간 필터 프레임 (블러 슬라이더와 선명하게/윤곽선 버튼)
+        self.spatial_frame = tk.Frame(master)
+        self.spatial_frame.pack(pady=5)
+
+        # 11. 블러 반지름 슬라이더 (0이면 블러 없음)
+        self.blur_scale = tk.Scale(self.spatial_frame, from_=0, to=20, orient=tk.HORIZONTAL,
+                                   label="블러 반지름", command=self.update_blur, length=200)
+        self.blur_scale.set(self.current_blur)
+        self.blur_scale.pack(side=tk.LEFT, padx=5)
+
+        # 12. '선명하게'(언샤프 마스크)와 '윤곽선'(소벨) 버튼: 누를 때마다 한 단계로 기록됩니다.
+        self.sharpen_button = tk.Button(self.spatial_frame, text="선명하게", command=self.apply_sharpen_filter)
+        self.sharpen_button.pack(side=tk.LEFT, padx=5)
+        self.edges_button = tk.Button(self.spatial_frame, text="윤곽선", command=self.apply_edges_filter)
+        self.edges_button.pack(side=tk.LEFT, padx=5)
+
+        # 창 크기가 바뀌면 미리보기용 축소 이미지를 새 크기에 맞게 다시 만듭니다.
+        master.bind('<Configure>', self.on_window_resize)
+        master.bind('<Control-z>', lambda event: self.undo())
+        master.bind('<Control-y>', lambda event: self.redo())
+
 
     # --- 버튼을 눌렀을 때 실행될 기능들 (메서드) ---
 
@@ -81,15 +144,22 @@ class ImageApp:
         file_path = filedialog.askopenfilename(
             initialdir=os.path.join(project_root_dir, 'assets'),
             title="이미지 파일 선택",
-            filetypes=(("Image files", "*.jpg;*.jpeg;*.png;*.bmp"), ("All files", "*.*"))
+            filetypes=(("Image files", "*.jpg;*.jpeg;*.png;*.bmp;*.tif;*.tiff"), ("All files", "*.*"))
         )
         if file_path:
-            loaded_img = self.image_handler.load_image(file_path)
+            # 화면 표시용 축소 이미지만 불러옵니다. 원본 해상도 디코딩은 저장할 때까지 미룹니다.
+            self.preview_proxy_basis = self.display_area_size()
+            loaded_img = self.image_handler.load_image(file_path, target_size=self.preview_proxy_basis)
             if loaded_img:
-                self.original_image = loaded_img # 원본 이미지를 저장해 둡니다.
-                self.processed_image = loaded_img.copy() # 처리할 이미지도 원본 복사본으로 초기화합니다.
-                self.display_image(self.processed_image) # 불러온 이미지를 GUI 창에 표시합니다.
-                self.reset_brightness() # COMMENT: 빨간색으로 표시된 추가 코드입니다. 이미지 로드 시 밝기 초기화
+                self.image_path = file_path # 원본은 이 경로에서 필요할 때 불러옵니다.
+                with Image.open(file_path) as header: # 픽셀은 풀지 않고 머리말에서 원본 크기만 읽습니다.
+                    self.original_size = header.size
+                self.original_image = None
+                self.processed_image = None # 원본 해상도 결과는 저장할 때 계산합니다.
+                self.preview_proxy = loaded_img
+                self.history = EditHistory(self.image_handler, loaded_img, budget_bytes=HISTORY_BUDGET_BYTES,
+                                           scale=self.preview_scale()) # 새 이미지는 편집 기록도 새로 시작합니다.
+                self.reset_brightness() # COMMENT: 빨간색으로 표시된 추가 코드입니다. 이미지 로드 시 밝기 초기화 (미리보기도 다시 그림)
                 print(f"GUI: 이미지 '{file_path}' 로드 완료.")
             else:
                 messagebox.showerror("오류", "이미지 불러오기 실패!")
@@ -98,19 +168,70 @@ class ImageApp:
 
     # COMMENT: 빨간색으로 표시된 수정 코드입니다. 메서드명을 apply_grayscale_filter로 변경하여 다른 메서드와 구분
     def apply_grayscale_filter(self):
-        if self.processed_image:
-            # '이미지 처리 담당자'에게 흑백 필터 적용을 시킵니다.
-            filtered_img = self.image_handler.apply_grayscale(self.processed_image.copy()) # COMMENT: 빨간색으로 표시된 수정 코드입니다. (copy() 추가)
-            if filtered_img:
-                self.processed_image = filtered_img
-                self.display_image(self.processed_image)
-                print("GUI: 흑백 필터 적용 완료.")
-            else:
-                messagebox.showerror("오류", "흑백 필터 적용 실패!")
-                print("GUI: 흑백 필터 적용 실패.")
-        else:
+        self.apply_step(Pipeline().grayscale(), "흑백")
+
+    def apply_sharpen_filter(self):
+        self.apply_step(Pipeline().unsharp_mask(), "선명하게")
+
+    def apply_edges_filter(self):
+        self.apply_step(Pipeline().sobel(), "윤곽선")
+
+    def apply_step(self, pipeline, name):
+        # 조정 중인 슬라이더 값을 먼저 한 단계로 기록한 뒤, pipeline을 새 단계로 기록하고 미리보기를 다시 그립니다.
+        if not self.image_path:
             messagebox.showinfo("정보", "먼저 이미지를 불러와 주세요.")
-            print("GUI: 흑백 필터 적용을 위해 이미지 불러오기 필요.")
+            print(f"GUI: {name} 필터 적용을 위해 이미지 불러오기 필요.")
+            return
+        self.commit_adjustments()
+        self.run_history_action(self.history.push, (pipeline,), f"{name} 필터 적용")
+
+    def commit_adjustments(self):
+        # 조정 중인 밝기/블러 값을 한 단계로 기록하고 슬라이더를 0으로 되돌립니다. (화면의 결과는 그대로입니다)
+        adjustments = self.build_pipeline()
+        if len(adjustments):
+            self.run_history_action(self.history.push, (adjustments,), "밝기/블러 조정 기록")
+            self.clear_adjustments()
+
+    def clear_adjustments(self):
+        self.brightness_scale.set(0)
+        self.current_brightness = 0
+        self.brightness_value_label.config(text=f"{self.current_brightness}")
+        self.blur_scale.set(0)
+        self.current_blur = 0
+
+    def undo(self):
+        # 조정 중인 슬라이더 값이 있으면 그것부터 취소하고, 없으면 기록된 단계를 하나 되돌립니다.
+        if self.history is None:
+            return
+        if len(self.build_pipeline()):
+            self.clear_adjustments()
+            self.request_preview()
+            print("GUI: 조정 중인 밝기/블러 값을 취소했습니다.")
+            return
+        self.run_history_action(self.history.undo, (), "실행 취소")
+
+    def redo(self):
+        # 조정 중인 값이 있을 때 다시 실행하면 그 조정이 사라지므로, 먼저 실행 취소나 다른 필터 적용을 해야 합니다.
+        if self.history is None:
+            return
+        if len(self.build_pipeline()):
+            print("GUI: 조정 중인 값이 있어 다시 실행할 수 없습니다.")
+            return
+        self.run_history_action(self.history.redo, (), "다시 실행")
+
+    def run_history_action(self, action, args, name):
+        # 편집 기록 작업(기록, 되돌리기, 다시 실행, 축소 이미지 교체)은 체크포인트부터 필터를 다시 적용하느라 오래 걸릴 수 있으므로,
+        # Tk 메인 스레드에서 실행하지 않고 미리보기 작업자에게 넘깁니다. 작업자는 하나뿐이라 요청한 순서대로 실행되고,
+        # 편집 기록은 작업자 스레드에서만 바뀝니다. 기록 작업은 오래된 요청이어도 건너뛰지 않고, 그 뒤의 미리보기만 최신 요청일 때 그립니다.
+        self.preview_worker.submit(self.history_job, self.history, action, args, name)
+        self.request_preview()
+
+    def history_job(self, history, action, args, name):
+        # 백그라운드 작업자 스레드에서 실행됩니다. (render_preview_job과 마찬가지로 Tk 위젯은 건드리지 않습니다)
+        if action(*args) is None:
+            print(f"GUI: {name}할 단계가 없습니다." if action in (history.undo, history.redo) else f"GUI: {name} 실패.")
+            return
+        print(f"GUI: {name} ({history.position}/{len(history.steps)}단계).")
 
     # --- NEW CODE START --- (COMMENT: 빨간색으로 표시된 추가 코드입니다.)
     def update_brightness(self, value):
@@ -118,41 +239,152 @@ class ImageApp:
         self.current_brightness = int(value) # 현재 밝기 값을 정수로 업데이트
         self.brightness_value_label.config(text=f"{self.current_brightness}") # 레이블 텍스트 업데이트
 
-        if self.original_image: # 원본 이미지가 불러와진 상태라면
-            # 원본 이미지의 복사본에 밝기 필터를 적용하여 표시합니다.
-            # processed_image는 항상 원본 이미지로부터 시작해서 필터링 결과를 보여줍니다.
-            temp_image = self.original_image.copy()
-            adjusted_image = self.image_handler.apply_brightness(temp_image, self.current_brightness)
-            if adjusted_image:
-                self.processed_image = adjusted_image # 밝기 조절된 이미지를 처리된 이미지로 저장
-                self.display_image(self.processed_image) # GUI에 표시
-            else:
-                print("GUI: 밝기 조절 이미지 처리 실패.")
+        if self.image_path: # 이미지가 불러와진 상태라면
+            # 슬라이더가 움직일 때마다 바로 계산하지 않고, 잠깐 모았다가 마지막 값만 백그라운드에서 계산합니다.
+            self.request_preview()
         else:
             # 이미지가 없는데 슬라이더가 움직인 경우
             print("GUI: 이미지가 없어 밝기 조절을 할 수 없습니다.")
 
+    def update_blur(self, value):
+        # 블러 슬라이더 값이 변경될 때마다 호출됩니다. 밝기와 같은 방식으로 미리보기를 다시 요청합니다.
+        self.current_blur = int(value)
+        if self.image_path:
+            self.request_preview()
+
+    def preview_scale(self):
+        # 미리보기 축소 이미지가 원본의 몇 배 크기인지입니다. (원본 크기를 모르면 1)
+        if self.preview_proxy is None or not self.original_size:
+            return 1.0
+        return self.preview_proxy.width / self.original_size[0]
+
+    def build_pipeline(self, scale=1.0):
+        # 아직 기록하지 않은 슬라이더 조정(블러, 밝기)을 하나의 필터 파이프라인으로 만듭니다.
+        # 미리보기와 저장 결과는 '기록된 단계들 + 이 파이프라인'입니다.
+        # scale: 처리할 이미지가 원본의 몇 배 크기인지입니다. 블러 반지름은 원본 픽셀 기준이므로,
+        #        축소 이미지에는 그만큼 줄인 반지름을 써야 저장 결과와 같은 정도로 흐려 보입니다.
+        pipeline = Pipeline()
+        if self.current_blur:
+            pipeline.gaussian_blur(self.current_blur * scale)
+        if self.current_brightness:
+            pipeline.brightness(self.current_brightness)
+        return pipeline
+
+    # --- 미리보기(preview) 처리 ---
+    # 흐름: 슬라이더 이벤트 → request_preview()가 잠깐 모음 → submit_preview()가 작업자에게 전달
+    #       → 작업자 스레드에서 축소 이미지에 C 필터 적용 → poll_preview_results()가 Tk 메인 스레드에서 표시
+    def request_preview(self):
+        # 짧은 시간 안에 여러 번 호출되어도 after() 예약은 하나만 유지합니다. (이벤트 모으기, debounce)
+        if self.preview_proxy is None:
+            return
+        if self.preview_pending is None:
+            self.preview_pending = self.master.after(PREVIEW_DEBOUNCE_MS, self.submit_preview)
+
+    def submit_preview(self):
+        # 현재 상태로 새 요청 번호를 만들고 작업자에게 넘깁니다. 이전 요청들은 이 순간부터 '오래된 요청'이 됩니다.
+        self.preview_pending = None
+        self.preview_generation += 1
+        self.preview_worker.submit(self.render_preview_job, self.preview_generation,
+                                   self.history, self.build_pipeline(self.preview_scale()))
+        if not self.preview_polling:
+            self.preview_polling = True
+            self.master.after(PREVIEW_POLL_MS, self.poll_preview_results)
+
+    def render_preview_job(self, generation, history, pipeline):
+        # 백그라운드 작업자 스레드에서 실행됩니다. 여기서는 Tk 위젯을 절대 건드리지 않습니다.
+        # 작업자 차례가 왔을 때 이미 더 새로운 요청이 있다면, 계산하지 않고 건너뜁니다. (오래된 요청 취소)
+        # 기록된 단계는 앞서 실행된 history_job이 이미 적용해 두었으므로, 그 결과에 조정 중인 값만 더해서 그립니다.
+        if generation != self.preview_generation:
+            return
+        self.preview_results.put((generation, self.image_handler.apply_pipeline(history.current_image, pipeline)))
+
+    def poll_preview_results(self):
+        # Tk 메인 스레드에서 after()로 호출됩니다. 도착한 결과 중 가장 최신 요청의 결과만 화면에 표시합니다.
+        latest = None
+        while True:
+            try:
+                generation, preview_image = self.preview_results.get_nowait()
+            except queue.Empty:
+                break
+            if generation == self.preview_generation:
+                latest = (generation, preview_image)
+        if latest is not None:
+            self.preview_shown_generation = latest[0]
+            if latest[1] is not None:
+                self.display_image(latest[1])
+            else:
+                print("GUI: 미리보기 이미지 처리 실패.")
+        if self.preview_shown_generation != self.preview_generation:
+            self.master.after(PREVIEW_POLL_MS, self.poll_preview_results)
+        else:
+            self.preview_polling = False
+
+    def display_area_size(self):
+        # 이미지를 표시할 수 있는 영역의 크기입니다. (창이 아직 그려지지 않았다면 기본값 사용)
+        max_width = self.master.winfo_width() - 40
+        if max_width <= 0: max_width = 800
+        max_height = self.master.winfo_height() - 150
+        if max_height <= 0: max_height = 600
+        return max_width, max_height
+
+    def rebuild_preview_proxy(self):
+        # 이미지 파일을 표시 영역 크기로 줄여서 다시 불러옵니다. 이후 슬라이더 미리보기는 모두 이 축소 이미지로 계산합니다.
+        if not self.image_path:
+            return
+        self.preview_proxy_basis = self.display_area_size()
+        proxy = self.image_handler.load_image(self.image_path, target_size=self.preview_proxy_basis)
+        if proxy is not None:
+            self.preview_proxy = proxy
+            # 기록된 단계는 그대로 두고, 새 축소 이미지에서 현재 단계의 미리보기를 다시 계산합니다.
+            self.run_history_action(self.history.rebase, (proxy, self.preview_scale()), "축소 이미지 교체")
+
+    def on_window_resize(self, event):
+        # <Configure> 이벤트는 창 안의 모든 위젯에서 발생하므로, 최상위 창의 크기 변경만 처리합니다.
+        if event.widget is not self.master or not self.image_path:
+            return
+        if self.resize_pending is not None:
+            self.master.after_cancel(self.resize_pending)
+        self.resize_pending = self.master.after(RESIZE_DEBOUNCE_MS, self.on_window_resize_done)
+
+    def on_window_resize_done(self):
+        self.resize_pending = None
+        if self.display_area_size() != self.preview_proxy_basis:
+            self.rebuild_preview_proxy()
+            self.request_preview()
+
     def reset_brightness(self):
-        # 밝기 슬라이더와 값, 그리고 이미지 상태를 초기화합니다.
-        self.brightness_scale.set(0) # 슬라이더를 0으로 설정
-        self.current_brightness = 0 # 밝기 값 초기화
-        self.brightness_value_label.config(text=f"{self.current_brightness}") # 레이블 업데이트
-        if self.original_image: # 원본 이미지가 있다면
-            self.processed_image = self.original_image.copy() # 처리된 이미지를 원본으로 되돌리고
-            self.display_image(self.processed_image) # GUI에 다시 표시
+        # 아직 기록하지 않은 밝기/블러 조정을 초기화합니다. (이미 기록된 단계는 '실행 취소'로 되돌립니다)
+        self.clear_adjustments()
+        if self.image_path: # 이미지가 있다면
+            self.request_preview() # 조정 없는 상태로 미리보기를 다시 그립니다.
             print("GUI: 밝기 조절 초기화 완료.")
         else:
             print("GUI: 원본 이미지가 없어 밝기 조절을 초기화할 수 없습니다.")
     # --- NEW CODE END ---
 
     def save_image(self):
-        if self.processed_image:
+        if self.image_path:
             file_path = filedialog.asksaveasfilename(
                 defaultextension=".jpg",
                 initialfile="processed_image.jpg", # COMMENT: 빨간색으로 표시된 수정 코드입니다. (초기 파일명 변경)
                 filetypes=(("JPEG files", "*.jpg"), ("PNG files", "*.png"), ("All files", "*.*"))
             )
             if file_path:
+                # 화면에는 축소 이미지로 만든 미리보기만 보여주므로, 원본 해상도 디코딩과 처리는 저장할 때 한 번만 합니다.
+                if self.original_image is None:
+                    self.original_image = self.image_handler.load_image(self.image_path)
+                if self.original_image is None:
+                    messagebox.showerror("오류", "원본 이미지를 불러올 수 없어 저장하지 못했습니다!")
+                    print(f"GUI: 원본 이미지 '{self.image_path}' 불러오기 실패로 저장 취소.")
+                    return
+                # 기록된 모든 단계와 조정 중인 값을 하나의 파이프라인으로 이어서 원본 해상도에 한 번에 적용합니다.
+                # 단계별 원본 해상도 이미지는 만들지 않으므로, 편집이 아무리 길어도 필요한 메모리는 원본과 결과 정도입니다.
+                # (원본 해상도 결과는 크기가 커서 미리보기 캐시를 밀어내므로 캐시를 거치지 않습니다)
+                # (편집 기록은 작업자 스레드에서만 바뀌므로, 앞서 요청한 기록 작업이 끝난 뒤의 필터 목록을 작업자에게서 받아 옵니다)
+                recorded = self.preview_worker.submit(self.history.pipeline).result()
+                full_pipeline = Pipeline(recorded.ops + self.build_pipeline().ops)
+                self.processed_image = self.image_handler.apply_pipeline(self.original_image, full_pipeline,
+                                                                         use_cache=False)
                 saved = self.image_handler.save_image(self.processed_image, file_path)
                 if saved:
                     messagebox.showinfo("성공", f"이미지를 '{os.path.basename(file_path)}'에 성공적으로 저장했습니다.")
@@ -166,21 +398,22 @@ class ImageApp:
             messagebox.showinfo("정보", "저장할 이미지가 없습니다.")
             print("GUI: 저장할 이미지가 없어 작업 취소.")
 
-    def display_image(self, image):
-        max_width = self.master.winfo_width() - 40
-        if max_width <= 0: max_width = 800
-        max_height = self.master.winfo_height() - 150
-        if max_height <= 0: max_height = 600
-
+    def fit_to_display(self, image, display_size):
+        # 이미지가 표시 영역보다 크면 비율을 유지하며 줄이고, 작으면 그대로 돌려줍니다.
+        max_width, max_height = display_size
         img_width, img_height = image.size
         ratio = min(max_width / img_width, max_height / img_height)
 
         if ratio < 1:
-            new_width = int(img_width * ratio)
-            new_height = int(img_height * ratio)
-            resized_image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        else:
-            resized_image = image
+            new_width = max(1, int(img_width * ratio))
+            new_height = max(1, int(img_height * ratio))
+            return image.resize((new_width, new_height), Image.Resampling.LANCZOS)
+        return image
+
+    def display_image(self, image):
+        # 미리보기 이미지는 이미 표시 영역 크기에 맞춰져 있으므로 보통은 다시 줄이지 않습니다.
+        # 16비트 흑백 이미지는 Tk가 8비트로 표시하므로, 값을 잘라 버리지 않도록 먼저 8비트로 줄입니다.
+        resized_image = to_8bit(self.fit_to_display(image, self.display_area_size()))
 
         self.tk_image = ImageTk.PhotoImage(resized_image)
         self.image_label.config(image=self.tk_image)
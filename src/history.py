@@ -0,0 +1,335 @@
+import logging
+import os
+import sys
+import time          # <--- 자체 테스트에서 되돌리기 시간을 잴 때 사용합니다.
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈과 같은 방식으로 프로젝트 루트를 모듈 검색 경로에 추가합니다.
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src import instrumentation
+from src.pipeline import Pipeline
+from src.result_cache import image_nbytes
+
+logger = logging.getLogger(__name__)
+
+# 편집 기록(되돌리기/다시 실행) 모듈입니다.
+# 단계마다 결과 이미지를 통째로 저장하면 메모리가 '단계 수 x 이미지 크기'만큼 늘어납니다. (50 MP RGB면 단계마다 150MB)
+# 대신 단계마다 적용한 필터(Pipeline)만 기록하고, 가끔씩만 그 단계의 이미지 전체를 '체크포인트'로 저장해 둡니다.
+# 어떤 단계의 이미지가 필요하면, 그보다 앞에서 가장 가까운 체크포인트(없으면 처음 이미지)부터 필터를 다시 적용합니다.
+# 다시 적용할 필터들은 하나의 Pipeline으로 이어서 C 함수로 실행하므로, 이어진 점 연산(밝기, 흑백 등)은
+# 단계가 몇 개든 이미지를 한 번만 훑습니다. 블러 같은 공간 필터만 하나에 한 번씩 더 훑습니다.
+#
+# - 체크포인트 전체 크기는 budget_bytes를 넘지 않습니다. 넘으면 지웠을 때 생기는 '체크포인트 사이 간격'이 가장 작은 것을 지워서
+#   남은 체크포인트가 전체 기록에 고르게 퍼지도록 합니다. 그래서 어느 단계로 되돌리든, 다시 계산할 양은 가장 큰 간격을 넘지 않습니다.
+#   (간격은 이미지를 훑는 횟수로 잽니다. 체크포인트 k개로 전체 T번 훑는 기록을 나누면 가장 큰 간격은
+#    max(max_replay_passes, 2T / (k + 1)) 이하입니다. 아래 replay_bound() 참고)
+# - 기록하는 필터는 원본 해상도 기준입니다. scale을 주면(예: 화면용 축소 이미지) 블러 반지름을 그만큼 줄여서 적용합니다.
+
+# 체크포인트를 저장하는 데 쓸 수 있는 기본 메모리 크기입니다.
+DEFAULT_BUDGET_BYTES = 512 * 1024 * 1024
+# 마지막 체크포인트부터 현재 단계까지 다시 계산할 때 이미지를 이만큼 훑어야 하면 현재 이미지를 체크포인트로 저장합니다.
+MAX_REPLAY_PASSES = 4
+# 점 연산만 이어져도 이미지는 한 번만 훑지만, 단계가 많으면 테이블 합성 시간이 길어지므로 단계 수도 제한합니다.
+MAX_REPLAY_STEPS = 32
+
+
+def replay_passes(ops):
+    # ops를 한 번에 적용할 때 이미지 전체를 훑는 횟수입니다.
+    # 이어진 점 연산은 한 번으로 합쳐지고, 공간 필터는 하나에 한 번씩입니다. (Pipeline.segments() 참고)
+    return len(Pipeline(ops).segments())
+
+
+# EditHistory 클래스: 처음 이미지(base_image)에 단계별로 필터를 쌓아 가며, 되돌리기/다시 실행을 처리합니다.
+# 사용 예:
+#     history = EditHistory(handler, image)
+#     history.push(Pipeline().brightness(40))
+#     history.push(Pipeline().gaussian_blur(3))
+#     previous_image = history.undo()
+# 처음 이미지와 현재 이미지는 항상 가지고 있으며, 체크포인트 예산(budget_bytes)에는 포함되지 않습니다.
+# 반환하는 이미지는 체크포인트로 함께 보관될 수 있으므로 직접 수정하지 말고, 필요하면 copy()해서 사용하세요.
+class EditHistory:
+    def __init__(self, handler, base_image, budget_bytes=DEFAULT_BUDGET_BYTES, scale=1.0,
+                 max_replay_passes=MAX_REPLAY_PASSES, max_replay_steps=MAX_REPLAY_STEPS):
+        self.handler = handler
+        self.budget_bytes = max(0, int(budget_bytes))
+        self.scale = scale
+        self.max_replay_passes = max(1, max_replay_passes)
+        self.max_replay_steps = max(1, max_replay_steps)
+        self.steps = []             # 단계별로 적용한 Pipeline 목록 (원본 해상도 기준)
+        self.position = 0           # 현재 이미지에 적용된 단계 수 (steps[:position]까지 적용한 상태)
+        self._base = base_image
+        self._current = base_image
+        self._checkpoints = {}      # 단계 위치 → 그 단계까지 적용한 이미지
+        self.checkpoint_bytes = 0
+        # 통계: 다시 계산한 횟수, 다시 적용한 단계 수, 마지막으로 다시 계산할 때 이미지를 훑은 횟수
+        self.replay_count = 0
+        self.replayed_steps = 0
+        self.last_replay_passes = 0
+
+    @property
+    def current_image(self):
+        return self._current
+
+    def can_undo(self):
+        return self.position > 0
+
+    def can_redo(self):
+        return self.position < len(self.steps)
+
+    def pipeline(self, position=None):
+        # 처음 이미지에서 position 단계(기본값: 현재 단계)까지의 필터를 하나로 이은 Pipeline입니다. (원본 해상도 기준)
+        # 원본 해상도 이미지에 한 번에 적용할 때(저장 등) 사용합니다.
+        position = self.position if position is None else position
+        return Pipeline([op for step in self.steps[:position] for op in step.ops])
+
+    def push(self, pipeline):
+        # 현재 이미지에 pipeline을 적용한 결과를 새 단계로 기록하고 돌려줍니다.
+        # 되돌리기 후에 새 단계를 기록하면, 그 뒤의 (다시 실행할 수 있던) 단계들은 버립니다.
+        if not len(pipeline):
+            return self._current
+        frame = self._apply(self._current, pipeline.ops)
+        if frame is None:
+            return None
+        for position in [p for p in self._checkpoints if p > self.position]:
+            self._drop(position)
+        del self.steps[self.position:]
+        self.steps.append(Pipeline(pipeline.ops))
+        self.position += 1
+        self._current = frame
+        self._maybe_checkpoint()
+        return frame
+
+    def undo(self):
+        # 한 단계 전의 이미지를 돌려줍니다. 되돌릴 단계가 없으면 None입니다.
+        if not self.can_undo():
+            return None
+        # 되돌리기 직전 이미지는 이미 계산되어 있으므로 체크포인트 후보로 남겨 두어, 다시 실행을 바로 처리할 수 있게 합니다.
+        # (다른 체크포인트와 똑같이 예산과 간격 규칙에 따라 남거나 지워집니다)
+        if self.position not in self._checkpoints:
+            self._add_checkpoint(self.position, self._current)
+        self.position -= 1
+        self._current = self._reconstruct(self.position)
+        return self._current
+
+    def redo(self):
+        # 되돌렸던 단계를 다시 적용한 이미지를 돌려줍니다. 다시 실행할 단계가 없으면 None입니다.
+        if not self.can_redo():
+            return None
+        self.position += 1
+        frame = self._checkpoints.get(self.position)
+        if frame is None:
+            # 현재 이미지에서 한 단계만 적용하면 되므로 체크포인트부터 다시 계산하지 않습니다.
+            frame = self._apply(self._current, self.steps[self.position - 1].ops)
+        self._current = frame
+        self._maybe_checkpoint()
+        return frame
+
+    def rebase(self, base_image, scale=None):
+        # 처음 이미지를 바꿉니다. (예: 창 크기가 바뀌어 화면용 축소 이미지를 새로 만든 경우)
+        # 기록한 단계는 그대로 두고, 체크포인트는 모두 버린 뒤 현재 단계의 이미지를 새 이미지에서 다시 계산합니다.
+        self._base = base_image
+        if scale is not None:
+            self.scale = scale
+        for position in list(self._checkpoints):
+            self._drop(position)
+        self._current = self._reconstruct(self.position)
+        return self._current
+
+    def replay_bound(self):
+        # 지금 기록에서 한 번 되돌릴 때 이미지를 훑는 횟수의 상한입니다. (예산에 들어가는 체크포인트 수 기준)
+        # 체크포인트 k + 1개 중 하나를 지울 때 '합쳐지는 간격이 가장 작은 것'을 고르므로, 새로 생기는 간격은
+        # 이웃한 두 간격 합의 평균, 즉 2T / (k + 1) 이하입니다. (T: 전체 기록을 다시 계산할 때 훑는 횟수)
+        frame_bytes = image_nbytes(self._current)
+        capacity = self.budget_bytes // frame_bytes if frame_bytes else 0
+        total = replay_passes(self._ops_between(0, len(self.steps)))
+        return max(self.max_replay_passes, -(-2 * total // (capacity + 1)))
+
+    def stats(self):
+        return {
+            'steps': len(self.steps),
+            'position': self.position,
+            'checkpoints': sorted(self._checkpoints),
+            'checkpoint_bytes': self.checkpoint_bytes,
+            'budget_bytes': self.budget_bytes,
+            'replay_count': self.replay_count,
+            'replayed_steps': self.replayed_steps,
+        }
+
+    # --- 내부 처리 ---
+    def _apply(self, frame, ops):
+        # 결과 캐시는 거치지 않습니다. (체크포인트와 같은 큰 이미지가 캐시를 밀어내지 않도록)
+        return self.handler.apply_pipeline(frame, Pipeline(ops).scaled(self.scale), use_cache=False)
+
+    def _ops_between(self, start, end):
+        return [op for step in self.steps[start:end] for op in step.ops]
+
+    def _nearest_checkpoint(self, position):
+        # position 이하에서 가장 가까운 체크포인트의 위치입니다. (없으면 처음 이미지인 0)
+        return max([p for p in self._checkpoints if p <= position], default=0)
+
+    def _reconstruct(self, position):
+        # 가장 가까운 체크포인트부터 position 단계까지의 필터를 이어서 다시 적용합니다.
+        # 다시 적용할 단계가 많으면 이미지를 max_replay_passes번 훑을 만큼씩 나누어 적용하고, 중간 이미지를 체크포인트로 남깁니다.
+        # 그래서 한 단계씩 계속 되돌릴 때, 처음 한 번만 오래 걸리고 그다음부터는 남겨 둔 중간 이미지에서 짧게 다시 계산합니다.
+        start = self._nearest_checkpoint(position)
+        frame = self._checkpoints[start] if start else self._base
+        self.last_replay_passes = 0
+        if start == position:
+            return frame
+        first = start
+        with instrumentation.span('history.replay'):
+            while start < position:
+                end = start + 1
+                while (end < position and end - start < self.max_replay_steps
+                       and replay_passes(self._ops_between(start, end + 1)) <= self.max_replay_passes):
+                    end += 1
+                ops = self._ops_between(start, end)
+                frame = self._apply(frame, ops)
+                self.last_replay_passes += replay_passes(ops)
+                if end < position:
+                    self._add_checkpoint(end, frame)
+                start = end
+        self.replay_count += 1
+        self.replayed_steps += position - first
+        logger.debug("EditHistory: %d단계 → %d단계를 다시 계산했습니다. (이미지 %d번 순회)",
+                     first, position, self.last_replay_passes)
+        return frame
+
+    def _maybe_checkpoint(self):
+        # 마지막 체크포인트부터 현재 단계까지 다시 계산하는 비용이 한도에 닿으면 현재 이미지를 체크포인트로 저장합니다.
+        start = self._nearest_checkpoint(self.position)
+        if start == self.position:
+            return
+        if (self.position - start >= self.max_replay_steps
+                or replay_passes(self._ops_between(start, self.position)) >= self.max_replay_passes):
+            self._add_checkpoint(self.position, self._current)
+
+    def _add_checkpoint(self, position, frame):
+        nbytes = image_nbytes(frame)
+        if nbytes > self.budget_bytes:
+            logger.debug("EditHistory: 이미지 하나(%d 바이트)가 체크포인트 예산보다 커서 저장하지 않습니다.", nbytes)
+            return
+        self._store(position, frame)
+        while self.checkpoint_bytes > self.budget_bytes:
+            self._drop(self._eviction_candidate())
+        if position in self._checkpoints:
+            instrumentation.count('history.checkpoints')
+
+    def _eviction_candidate(self):
+        # 지웠을 때 앞뒤 간격이 합쳐진 새 간격(이미지를 훑는 횟수)이 가장 작은 체크포인트를 고릅니다.
+        # 방금 추가한 체크포인트도 후보이므로, 촘촘한 곳에 추가된 것은 바로 지워지고 남는 체크포인트는 고르게 퍼집니다.
+        # (같은 간격이면 현재 단계에서 먼 것을 지워서, 지금 편집 중인 곳 근처를 조금 더 촘촘하게 둡니다)
+        positions = sorted(self._checkpoints)
+        best, best_score = None, None
+        for index, position in enumerate(positions):
+            previous = positions[index - 1] if index > 0 else 0
+            following = positions[index + 1] if index + 1 < len(positions) else len(self.steps)
+            score = (replay_passes(self._ops_between(previous, following)), -abs(self.position - position))
+            if best_score is None or score < best_score:
+                best, best_score = position, score
+        return best
+
+    def _store(self, position, frame):
+        self._checkpoints[position] = frame
+        self.checkpoint_bytes += image_nbytes(frame)
+
+    def _drop(self, position):
+        self.checkpoint_bytes -= image_nbytes(self._checkpoints.pop(position))
+
+
+# --- 모듈이 직접 실행될 때만 실행되는 코드 블록 (자체 테스트) ---
+if __name__ == '__main__':
+    import random
+    import resource
+    import numpy as np
+    from PIL import Image
+    from src.image_handler import ImageHandler
+
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+    print("\n--- src/history.py 모듈 자체 테스트 시작 ---")
+    handler = ImageHandler()
+    rng = random.Random(0)
+
+    def random_step():
+        choice = rng.random()
+        if choice < 0.25:
+            return rng.choice([Pipeline().gaussian_blur(rng.uniform(0.5, 6)), Pipeline().box_blur(rng.randint(1, 4)),
+                               Pipeline().unsharp_mask(), Pipeline().sobel()])
+        if choice < 0.4:
+            return Pipeline().grayscale()
+        return rng.choice([Pipeline().brightness(rng.randint(-30, 30)), Pipeline().contrast(rng.uniform(0.8, 1.2)),
+                           Pipeline().gamma(rng.uniform(0.8, 1.3)), Pipeline().invert()])
+
+    # 1. 되돌리기/다시 실행으로 얻은 이미지는 처음 이미지에 그 단계까지의 필터를 한 번에 적용한 결과와 비트 단위로 같아야 합니다.
+    base = handler.load_image(os.path.join(project_root_dir, 'assets', 'test_image.jpg'))
+    frame_bytes = image_nbytes(base)
+    history = EditHistory(handler, base, budget_bytes=frame_bytes * 3)
+    for _ in range(40):
+        history.push(random_step())
+    for _ in range(120):
+        action = rng.random()
+        if action < 0.5:
+            history.undo()
+        elif action < 0.9:
+            history.redo()
+        else:
+            history.push(random_step())
+        expected = handler.apply_pipeline(base, history.pipeline(), use_cache=False)
+        assert np.array_equal(np.asarray(history.current_image), np.asarray(expected)), \
+            f"{history.position}단계 이미지가 다릅니다."
+        assert history.checkpoint_bytes <= history.budget_bytes, "체크포인트가 예산을 넘었습니다."
+    print(f"무작위 되돌리기/다시 실행 120회 결과 일치 (통계: {history.stats()})")
+
+    # 2. 처음까지 되돌리면 처음 이미지, 끝까지 다시 실행하면 마지막 이미지가 되고, 새 단계를 기록하면 다시 실행할 단계는 없어집니다.
+    while history.can_undo():
+        history.undo()
+    assert history.current_image is base and history.undo() is None
+    while history.can_redo():
+        history.redo()
+    assert history.redo() is None
+    history.undo()
+    history.push(Pipeline().invert())
+    assert not history.can_redo() and history.position == len(history.steps)
+    assert max(history.stats()['checkpoints'], default=0) <= history.position
+
+    # 3. 축소 이미지에 기록할 때는 블러 반지름을 줄여서 적용합니다. (원본 해상도 기준 반지름 8 → 절반 크기에서는 4)
+    half = base.resize((base.width // 2, base.height // 2))
+    scaled_history = EditHistory(handler, half, scale=0.5)
+    scaled_history.push(Pipeline().gaussian_blur(8))
+    assert np.array_equal(np.asarray(scaled_history.current_image),
+                          np.asarray(handler.apply_gaussian_blur(half, 4))), "축소 비율이 적용되지 않았습니다."
+    assert scaled_history.pipeline().ops == [('gaussian_blur', 8.0)], "기록은 원본 해상도 기준이어야 합니다."
+    print("축소 이미지에서 반지름 비율 적용 확인")
+
+    # 4. 큰 이미지의 긴 편집: 체크포인트 메모리는 예산 안에 있어야 하고, 처음 단계까지 한 단계씩 되돌리는 동안
+    #    어느 되돌리기도 replay_bound()보다 많이 이미지를 훑으면 안 됩니다. (가장 오래된 체크포인트보다 앞으로 가도 마찬가지)
+    width, height, num_steps = 4000, 3000, 60
+    large = Image.fromarray(np.random.default_rng(1).integers(0, 256, size=(height, width, 3), dtype=np.uint8))
+    large_history = EditHistory(handler, large)
+    push_start = time.perf_counter()
+    for _ in range(num_steps):
+        large_history.push(random_step())
+    push_time = time.perf_counter() - push_start
+    bound = large_history.replay_bound()
+    undo_times, undo_passes = [], []
+    while large_history.can_undo():
+        undo_start = time.perf_counter()
+        large_history.undo()
+        undo_times.append(time.perf_counter() - undo_start)
+        undo_passes.append(large_history.last_replay_passes)
+        assert large_history.checkpoint_bytes <= large_history.budget_bytes, "체크포인트가 예산을 넘었습니다."
+    assert large_history.current_image is large
+    for _ in range(12):
+        large_history.redo()
+    stats = large_history.stats()
+    assert max(undo_passes) <= bound, f"되돌리기 한 번이 이미지를 {max(undo_passes)}번 훑었습니다. (상한 {bound}): {undo_passes}"
+    peak_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"{width * height / 1e6:.0f} MP, {num_steps}단계 (평균 {push_time / num_steps * 1000:.0f} ms/단계): "
+          f"되돌리기 최대 {max(undo_times) * 1000:.0f} ms, 평균 {sum(undo_times) / len(undo_times) * 1000:.0f} ms "
+          f"(순회 최대 {max(undo_passes)}번, 상한 {bound}번)")
+    print(f"체크포인트 {len(stats['checkpoints'])}개 {stats['checkpoint_bytes'] / 2**20:.0f}MB "
+          f"(예산 {stats['budget_bytes'] / 2**20:.0f}MB, 위치 {stats['checkpoints']}), 최대 메모리 {peak_mb:.0f}MB")
+    print("--- src/history.py 모듈 자체 테스트 완료 ---\n")
@@ -1,8 +1,10 @@
 from PIL import Image         # <--- 'Pillow' 라이브러리에서 'Image' 모듈을 가져옵니다.
                               #      이것이 파이썬에서 이미지 파일을 열고 저장하고 조작하는 핵심 도구예요.
 import ctypes                 # <--- C 언어와 연결하기 위해 역시 필요합니다. (픽셀 데이터 변환에 사용)
+import logging                # <--- 필터를 적용할 때마다 나오는 메시지를 print() 대신 로그 수준으로 켜고 끌 수 있게 합니다.
 import sys
 import os                     # <--- 파일 경로를 다룰 때 사용합니다.
+from concurrent.futures import ThreadPoolExecutor  # <--- 이미지를 띠(band)로 나누어 여러 스레드에서 C 필터를 실행할 때 사용합니다.
 
 # --- 중요: 파이썬 모듈 검색 경로 설정 ---
 # 이 코드는 현재 스크립트(image_handler.py)가 들어있는 'src' 폴더의 부모 폴더 (즉, 'python_c_image_app' 폴더)를
@@ -14,22 +16,125 @@ project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..')) # src
 sys.path.insert(0, project_root_dir) # 이 프로젝트 루트 폴더를 파이썬 모듈 검색 경로의 가장 앞에 추가!
 # --- 여기까지 새롭게 추가되는 코드 ---
 
-import numpy as np            # <--- 숫자 배열을 효율적으로 다루기 위한 라이브러리 (옵션이지만 매우 유용!)
-                              #      'pip install numpy'로 설치해야 할 수도 있습니다.
-
 # 우리가 만든 '통역가' 모듈을 가져옵니다.
 # 이렇게 다른 모듈의 기능을 가져다 쓰는 것이 모듈화의 장점입니다!
 from src import c_interface
+from src import instrumentation   # <--- 단계별 시간과 픽셀/바이트/호출 횟수를 기록합니다.
+from src import lut
+from src import spatial           # <--- 블러 반지름별 가중치/상자 블러 계획을 만듭니다.
+from src.pipeline import Pipeline
+from src.result_cache import DEFAULT_DISK_CACHE_BYTES, ResultCache, image_fingerprint, iter_raw_chunks
+
+# 필터 적용 메시지는 자주 나오므로 DEBUG 수준으로 남깁니다. (logging 설정으로 보이게 하거나 숨길 수 있습니다)
+logger = logging.getLogger(__name__)
 
 # ImageHandler 클래스를 정의합니다.
 # 클래스는 여러 함수(메서드)와 데이터를 한 덩어리로 묶어서 관리하는 '청사진' 또는 '템플릿'입니다.
 # ImageHandler 객체를 만들면, 이미지 처리와 관련된 모든 기능을 깔끔하게 사용할 수 있어요.
+# 이미지의 픽셀 수가 이 값보다 작으면 스레드로 나누는 비용이 필터 계산보다 커지므로, 한 스레드에서 처리합니다.
+MIN_PIXELS_FOR_THREADING = 1 << 20   # 약 100만 픽셀 (1 MP)
+
+# 줄여서 불러올 때(load_image의 target_size) 목표 크기의 이 배수까지만 디코더에서 줄이고, 나머지는 LANCZOS로 줄입니다.
+# (Pillow의 thumbnail()과 같은 방식. 디코더의 1/2, 1/4, 1/8 축소는 빠르지만 화질이 조금 떨어지기 때문입니다)
+REDUCED_DECODE_GAP = 2.0
+
+# C 필터가 변환 없이 바로 처리하는 Pillow 모드 → (채널 수, 색 채널 수, 채널당 비트 수)
+# 색 채널 뒤에 오는 채널(RGBA/LA의 알파, RGBX의 여분 바이트)은 필터가 건드리지 않고 그대로 둡니다.
+PIXEL_LAYOUTS = {
+    'RGB': (3, 3, 8),
+    'RGBA': (4, 3, 8),
+    'RGBX': (4, 3, 8),
+    'L': (1, 1, 8),
+    'LA': (2, 1, 8),
+}
+# 16비트 흑백(I;16)은 리틀 엔디언으로 저장되므로, C가 unsigned short로 바로 읽을 수 있는 리틀 엔디언 시스템에서만 그대로 처리합니다.
+if sys.byteorder == 'little':
+    PIXEL_LAYOUTS['I;16'] = (1, 1, 16)
+    PIXEL_LAYOUTS['I;16L'] = (1, 1, 16)
+# Pillow에는 16비트 컬러 모드가 없으므로, 16비트 컬러 픽셀은 in-place API에 uint16 버퍼(시스템 바이트 순서)와
+# 아래 이름을 mode로 넘겨서 처리합니다. (예: 16비트 TIFF를 읽은 NumPy 배열)
+PIXEL_LAYOUTS['RGB;16'] = (3, 3, 16)
+PIXEL_LAYOUTS['RGBA;16'] = (4, 3, 16)
+
+
+def pixel_layout(mode):
+    # mode 이미지의 (채널 수, 색 채널 수, 비트 수)입니다. C 필터가 처리할 수 없는 모드면 ValueError를 발생시킵니다.
+    layout = PIXEL_LAYOUTS.get(mode)
+    if layout is None:
+        raise ValueError(f"C 필터가 지원하지 않는 이미지 모드입니다: '{mode}'")
+    return layout
+
+
+def to_supported_mode(image):
+    # C 필터가 처리할 수 없는 모드의 이미지만 가장 가까운 지원 모드로 바꿉니다. (지원하는 모드면 그대로 돌려줌)
+    # 투명도가 있는 팔레트(P) 이미지는 알파를 잃지 않도록 RGBA로, 1비트 이미지는 L로, 나머지는 RGB로 바꿉니다.
+    if image.mode in PIXEL_LAYOUTS:
+        return image
+    if image.mode == 'PA' or (image.mode == 'P' and 'transparency' in image.info):
+        return image.convert('RGBA')
+    if image.mode == '1':
+        return image.convert('L')
+    return image.convert('RGB')
+
+
+def to_8bit(image):
+    # 16비트 흑백(I;16) 이미지를 화면 표시나 JPEG 저장용 8비트(L) 이미지로 바꿉니다. (다른 모드는 그대로)
+    # Pillow의 convert('L')은 256 이상의 값을 모두 255로 잘라 버리므로, 값을 257로 나누어 전체 범위를 유지합니다.
+    if pixel_layout(image.mode)[2] != 16:
+        return image
+    return image.convert('I').point(lambda value: value * (1 / 257)).convert('L')
+
+
+def copy_pixels_into(image_obj, target):
+    # image_obj의 픽셀을 모드 그대로의 배치로 target(쓰기 가능한 바이트 memoryview)에 복사합니다.
+    # Pillow의 raw 인코더가 만들어 주는 작은 조각(chunk)들을 바로 채워 넣으므로, 전체 프레임 크기의 bytes를 따로 만들지 않습니다.
+    offset = 0
+    for chunk in iter_raw_chunks(image_obj):
+        target[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+
+
+def available_cpu_count():
+    # 이 프로세스가 실제로 사용할 수 있는 CPU 코어 수입니다. (컨테이너나 taskset으로 제한된 경우 os.cpu_count()보다 작습니다)
+    # 코어보다 많은 스레드로 나누면 띠를 번갈아 실행하느라 오히려 느려지므로, 기본 스레드 수는 이 값을 따릅니다.
+    # (python -m src.benchmark run의 threads/* 항목으로 스레드 수별 속도를 확인할 수 있습니다)
+    if hasattr(os, 'sched_getaffinity'):
+        return max(1, len(os.sched_getaffinity(0)))
+    return os.cpu_count() or 1
+
+
+def fit_size(size, target_size):
+    # size를 비율을 유지하며 target_size 안에 들어가도록 줄인 크기입니다. (이미 작으면 그대로, 키우지는 않음)
+    width, height = size
+    ratio = min(target_size[0] / width, target_size[1] / height)
+    if ratio >= 1:
+        return width, height
+    return max(1, int(width * ratio)), max(1, int(height * ratio))
+
+
 class ImageHandler:
-    def __init__(self):
+    def __init__(self, num_threads=None, cache_bytes=0, cache_dir=None, cache_disk_bytes=DEFAULT_DISK_CACHE_BYTES):
         # ImageHandler 객체가 처음 만들어질 때 자동으로 실행됩니다.
-        # 여기서 C 라이브러리 '통역가'를 불러와 준비시킵니다.
-        self.c_lib = c_interface.load_c_filters_library()
-        print("ImageHandler: C 라이브러리(통역가)가 ImageHandler에 연결되었습니다.")
+        # C 라이브러리 '통역가'는 여기서 바로 불러오지 않고, 처음 필터를 적용할 때 프로세스 전체에서 한 번만 불러옵니다.
+        # (아래 c_lib 속성 참고. 배치 작업자 프로세스나 GUI 시작이 그만큼 빨라집니다)
+        # num_threads: C 필터를 동시에 실행할 스레드 수입니다. (기본값: 사용할 수 있는 CPU 코어 수, 1이면 항상 한 스레드에서 처리)
+        # cache_bytes: apply_pipeline 결과를 기억해 둘 메모리 캐시 크기(바이트)입니다. (0이면 메모리 캐시 사용 안 함)
+        # cache_dir: 결과를 파일로도 저장해 둘 디스크 캐시 폴더입니다. (None이면 사용 안 함)
+        # cache_disk_bytes: 디스크 캐시 폴더의 최대 크기(바이트)입니다. 넘으면 오래 사용하지 않은 파일부터 지웁니다.
+        self.num_threads = max(1, num_threads or available_cpu_count())
+        # 스레드 풀은 여기서 한 번만 만듭니다. (스레드는 처음 작업을 넘길 때 생기므로 미리 만들어도 비용이 없습니다)
+        # 처음 사용할 때 만들면, GUI 미리보기 작업자와 메인 스레드가 동시에 처음 사용할 때 풀이 두 개 생길 수 있습니다.
+        self._thread_pool = ThreadPoolExecutor(max_workers=self.num_threads) if self.num_threads > 1 else None
+        self.result_cache = (ResultCache(cache_bytes, cache_dir, cache_disk_bytes)
+                             if (cache_bytes or cache_dir) else None)
+        # Image 경로에서 전체 프레임을 복사한 횟수입니다. (C용 작업 버퍼로 한 번, 결과 이미지를 만들 때 Pillow가 풀어 넣으면 한 번 더)
+        # 제로-카피 경로(apply_*_inplace)에서는 늘어나지 않습니다.
+        self.copy_count = 0
+
+    @property
+    def c_lib(self):
+        # 필터 함수 모음입니다. C 라이브러리를 쓸 수 없는 환경에서는 같은 결과를 내는 NumPy 구현이 사용됩니다.
+        return c_interface.get_kernels()
 
     # --- 여기서부터 `ImageHandler` 클래스의 메서드들입니다. ---
     # --- class ImageHandler: 줄 바로 아래에 네 칸(스페이스 4번 또는 탭 1번) 들여쓰기가 되어야 합니다. ---
@@ -37,63 +142,382 @@ class ImageHandler:
     # COMMENT: 빨간색으로 표시된 이 두 함수는 반드시 `class ImageHandler:` 안에 정의되어야 합니다.
     # COMMENT: `def __init__` 메서드와 같은 들여쓰기 레벨에 있어야 합니다.
     def _prepare_pixels_for_c(self, image_obj):
-        byte_data = image_obj.tobytes()
-        num_bytes = len(byte_data)
-        raw_pixels_ptr = (ctypes.c_ubyte * num_bytes).from_buffer_copy(byte_data)
-        return raw_pixels_ptr, image_obj.width, image_obj.height
+        # Pillow의 raw 인코더가 만들어 주는 작은 조각(chunk)들을 C용 작업 버퍼에 바로 채워 넣습니다.
+        # tobytes()처럼 전체 프레임 크기의 bytes를 한 번 더 만들지 않으므로, 입력 쪽 전체 프레임 복사는 이 한 번뿐입니다. (결과 쪽은 _create_image_from_c_pixels 참고)
+        # 버퍼는 이미지 모드 그대로의 배치(L은 1바이트, RGBA는 4바이트, I;16은 2바이트/픽셀)입니다.
+        width, height = image_obj.size
+        channels, _, bits_per_sample = pixel_layout(image_obj.mode)
+        num_bytes = width * height * channels * bits_per_sample // 8
+        with instrumentation.span('marshal'):
+            raw_pixels_ptr = (ctypes.c_ubyte * num_bytes)()
+            copy_pixels_into(image_obj, memoryview(raw_pixels_ptr).cast('B'))
+        self.copy_count += 1
+        instrumentation.count('bytes.marshal', num_bytes)
+        return raw_pixels_ptr, width, height
 
-    def _create_image_from_c_pixels(self, raw_pixels_ptr, width, height):
-        return Image.frombytes('RGB', (width, height), raw_pixels_ptr)
+    def _create_image_from_c_pixels(self, raw_pixels_ptr, width, height, mode='RGB'):
+        # L, RGBA, RGBX, I;16은 Pillow의 저장 배치가 C 버퍼와 같아서, frombuffer가 복사 없이 C가 수정한 버퍼를 그대로 결과 이미지로 씁니다.
+        # (이 경우 결과는 읽기 전용(readonly)으로 표시되며, 나중에 paste() 등으로 수정하면 Pillow가 그때 복사합니다)
+        # RGB, LA는 Pillow가 픽셀당 4바이트로 저장하므로 새 저장 공간에 풀어 넣는 복사가 한 번 더 일어납니다.
+        with instrumentation.span('rebuild'):
+            image_obj = Image.frombuffer(mode, (width, height), raw_pixels_ptr, 'raw', mode, 0, 1)
+        if not image_obj.readonly:
+            self.copy_count += 1
+            instrumentation.count('bytes.rebuild', len(raw_pixels_ptr))
+        return image_obj
+
+    def _buffer_to_c_pointer(self, buffer, width, height, mode='RGB'):
+        # NumPy 배열, bytearray, memoryview 등 '버퍼 프로토콜'을 지원하는 객체의 메모리를
+        # 복사하지 않고 그대로 C 함수에 넘길 수 있는 ctypes 배열로 감싸 줍니다.
+        # 반환된 배열은 원래 버퍼와 같은 메모리 주소를 가리키므로, C 함수가 바꾼 값이 원래 버퍼에 바로 반영됩니다.
+        # mode는 버퍼의 픽셀 배치입니다. (PIXEL_LAYOUTS의 모드. 16비트는 uint16 버퍼도 받습니다)
+        channels, _, bits_per_sample = pixel_layout(mode)
+        view = memoryview(buffer)
+        if view.readonly:
+            raise ValueError("버퍼가 읽기 전용입니다. 쓰기 가능한 버퍼(bytearray, NumPy 배열 등)가 필요합니다.")
+        if not view.c_contiguous:
+            raise ValueError("버퍼가 C-연속(C-contiguous) 메모리가 아닙니다.")
+        item_format = view.format.lstrip('@=<>!')
+        if not (item_format == 'B' or (bits_per_sample == 16 and item_format == 'H')):
+            expected_type = 'uint8' if bits_per_sample == 8 else 'uint8 또는 uint16'
+            raise ValueError(f"버퍼의 원소 타입이 {expected_type}이 아닙니다. (format='{view.format}')")
+        if view.nbytes != width * height * channels * bits_per_sample // 8:
+            raise ValueError(f"버퍼 크기({view.nbytes} 바이트)가 {width}x{height} {mode} 이미지 크기와 맞지 않습니다.")
+        return (ctypes.c_ubyte * view.nbytes).from_buffer(view)
     # COMMENT: 이 두 함수가 위 `class ImageHandler:` 아래의 들여쓰기 레벨에 정확히 있는지 확인해주세요.
 
 
-    def load_image(self, image_path):
+    def load_image(self, image_path, target_size=None):
+        # target_size=(너비, 높이)를 주면 비율을 유지하며 그 안에 들어가도록 줄인 이미지를 돌려줍니다. (화면 표시, 썸네일용)
+        # JPEG은 디코더가 1/2, 1/4, 1/8 크기로 바로 풀 수 있어서, 원본 해상도로 풀고 줄이는 것보다 훨씬 빠릅니다.
+        # 원본 해상도가 필요한 작업(저장 등)에서는 target_size 없이 다시 불러오세요.
+        # 흑백(L), 알파가 있는 이미지(RGBA, LA), 16비트 흑백(I;16)은 RGB로 바꾸지 않고 원래 모드 그대로 돌려줍니다.
         try:
-            image = Image.open(image_path).convert('RGB')
-            print(f"ImageHandler: '{image_path}' 이미지를 성공적으로 불러왔습니다. ({image.width}x{image.height})")
+            with instrumentation.span('decode'):
+                image = Image.open(image_path)
+                if target_size:
+                    image = self._decode_reduced(image, target_size)
+                else:
+                    image = to_supported_mode(image)
+                    image.load()
+            logger.info("ImageHandler: '%s' 이미지를 성공적으로 불러왔습니다. (%dx%d)", image_path, image.width, image.height)
             return image
         except FileNotFoundError:
-            print(f"오류: ImageHandler: 파일을 찾을 수 없습니다: {image_path}")
+            logger.error("오류: ImageHandler: 파일을 찾을 수 없습니다: %s", image_path)
             return None
         except Exception as e:
-            print(f"오류: ImageHandler: 이미지 불러오기 실패 - {e}")
+            logger.error("오류: ImageHandler: 이미지 불러오기 실패 - %s", e)
             return None
 
+    def _decode_reduced(self, image, target_size):
+        # 아직 픽셀을 풀지 않은 Image(Image.open 직후)를 target_size 안에 들어가는 이미지로 만듭니다.
+        fitted_size = fit_size(image.size, target_size)
+        if fitted_size == image.size:
+            image = to_supported_mode(image)
+            image.load()
+            return image
+        original_size = image.size
+        # draft()는 JPEG 디코더에게 요청한 크기 이상이 되는 가장 작은 배율(1/2, 1/4, 1/8)로 풀도록 설정합니다.
+        # 다른 형식에서는 아무 일도 하지 않으며(None), 그때는 원본 해상도로 푼 뒤 줄입니다.
+        draft = image.draft(None, (int(fitted_size[0] * REDUCED_DECODE_GAP), int(fitted_size[1] * REDUCED_DECODE_GAP)))
+        box = draft[1] if draft else None
+        image = to_supported_mode(image)
+        logger.debug("ImageHandler: %dx%d 이미지를 %dx%d 크기로 풀어서 %dx%d로 줄입니다.",
+                     original_size[0], original_size[1], image.width, image.height, fitted_size[0], fitted_size[1])
+        # Pillow의 reducing_gap(박스 축소 후 LANCZOS)은 8비트 모드에서만 동작하므로, 16비트는 LANCZOS로만 줄입니다.
+        reducing_gap = REDUCED_DECODE_GAP if pixel_layout(image.mode)[2] == 8 else None
+        return image.resize(fitted_size, Image.Resampling.LANCZOS, box=box, reducing_gap=reducing_gap)
+
     def apply_grayscale(self, image_obj):
         if not image_obj:
-            print("ImageHandler: 이미지가 유효하지 않아 흑백 필터를 적용할 수 없습니다.")
+            logger.warning("ImageHandler: 이미지가 유효하지 않아 흑백 필터를 적용할 수 없습니다.")
             return None
+        image_obj = to_supported_mode(image_obj)
         raw_pixels_ptr, width, height = self._prepare_pixels_for_c(image_obj)
-        print(f"ImageHandler: 흑백 필터 적용 전 - {width}x{height} 이미지 픽셀 데이터 준비 완료.")
-        self.c_lib.apply_grayscale_c(raw_pixels_ptr, width, height)
-        print("ImageHandler: C 흑백 필터 적용 완료.")
-        processed_image = self._create_image_from_c_pixels(raw_pixels_ptr, width, height)
+        logger.debug("ImageHandler: 흑백 필터 적용 전 - %dx%d %s 이미지 픽셀 데이터 준비 완료.", width, height, image_obj.mode)
+        self._run_grayscale_kernel(raw_pixels_ptr, width, height, image_obj.mode)
+        logger.debug("ImageHandler: C 흑백 필터 적용 완료.")
+        processed_image = self._create_image_from_c_pixels(raw_pixels_ptr, width, height, image_obj.mode)
         return processed_image
 
     def apply_brightness(self, image_obj, brightness_factor):
         if not image_obj:
-            print("ImageHandler: 이미지가 유효하지 않아 밝기 필터를 적용할 수 없습니다.")
+            logger.warning("ImageHandler: 이미지가 유효하지 않아 밝기 필터를 적용할 수 없습니다.")
+            return None
+        image_obj = to_supported_mode(image_obj)
+        raw_pixels_ptr, width, height = self._prepare_pixels_for_c(image_obj)
+        logger.debug("ImageHandler: 밝기 필터 적용 전 - %dx%d %s 이미지 픽셀 데이터 준비 완료.", width, height, image_obj.mode)
+        # 밝기 조절은 룩업 테이블 C 함수로 처리합니다. (분기 없는 표 찾기라 더 빠릅니다)
+        self._run_brightness_kernel(raw_pixels_ptr, width, height, brightness_factor, image_obj.mode)
+        logger.debug("ImageHandler: C 밝기 필터 (+/- %d) 적용 완료.", brightness_factor)
+        processed_image = self._create_image_from_c_pixels(raw_pixels_ptr, width, height, image_obj.mode)
+        return processed_image
+
+    def _run_rows_kernel(self, rows_kernel, raw_pixels_ptr, width, height, *kernel_args, stride=None):
+        # 행 범위 C 함수(apply_*_rows_c)를 이미지 전체에 실행합니다.
+        # 큰 이미지는 높이 방향으로 num_threads개의 띠(band)로 나누어 스레드 풀에서 동시에 처리하고,
+        # 작은 이미지는 스레드 비용을 아끼기 위해 현재 스레드에서 한 번에 처리합니다.
+        # 띠마다 같은 C 코드로 서로 다른 행만 수정하므로, 결과는 한 스레드로 처리한 것과 비트 단위로 같습니다.
+        # stride는 한 행의 바이트 수입니다. (기본값: RGB 8비트 이미지의 width * 3)
+        # 띠별 C 함수의 반환값 목록을 돌려줍니다. (반환값이 없는 함수는 None)
+        if stride is None:
+            stride = width * 3
+        instrumentation.count('calls.kernel')
+        instrumentation.count('pixels', width * height)
+        with instrumentation.span('kernel'):
+            if self.num_threads == 1 or width * height < MIN_PIXELS_FOR_THREADING or height < 2:
+                return [rows_kernel(raw_pixels_ptr, width, 0, height, stride, *kernel_args)]
+            rows_per_band = -(-height // min(self.num_threads, height))   # 올림 나눗셈
+            futures = [
+                self._thread_pool.submit(rows_kernel, raw_pixels_ptr, width, start_row,
+                                         min(start_row + rows_per_band, height), stride, *kernel_args)
+                for start_row in range(0, height, rows_per_band)
+            ]
+            # 모든 띠가 끝날 때까지 기다리고, C 호출 중 발생한 예외가 있다면 여기서 다시 발생시킵니다.
+            return [future.result() for future in futures]
+
+    # --- 모드별 C 함수 선택 ---
+    # 8비트 RGB는 지금까지처럼 3채널 전용 C 함수를 사용하고, 나머지 모드(L, LA, RGBA, RGBX, I;16)는
+    # 채널 수/색 채널 수/비트 수를 인자로 받는 *_format_rows_c 함수를 사용합니다. (알파 채널은 그대로 유지)
+    def _run_grayscale_kernel(self, raw_pixels_ptr, width, height, mode='RGB'):
+        if mode == 'RGB':
+            self._run_rows_kernel(self.c_lib.apply_grayscale_rows_c, raw_pixels_ptr, width, height)
+            return
+        channels, color_channels, bits_per_sample = pixel_layout(mode)
+        self._run_rows_kernel(self.c_lib.apply_grayscale_format_rows_c, raw_pixels_ptr, width, height,
+                              channels, color_channels, bits_per_sample,
+                              stride=width * channels * bits_per_sample // 8)
+
+    def _run_luts_kernel(self, raw_pixels_ptr, width, height, luts, num_stages, mode='RGB'):
+        # 단계별 룩업 테이블(Pipeline.compile() 또는 lut.to_c_luts*()의 결과)을 한 번의 순회로 적용합니다.
+        # 8비트 RGB에서 테이블이 한 단계뿐이라면 더 단순한 룩업 테이블 함수(apply_lut_rows_c)를 사용합니다.
+        if mode == 'RGB':
+            if num_stages == 1:
+                self._run_rows_kernel(self.c_lib.apply_lut_rows_c, raw_pixels_ptr, width, height, luts)
+            else:
+                self._run_rows_kernel(self.c_lib.apply_point_pipeline_rows_c, raw_pixels_ptr, width, height,
+                                      luts, num_stages)
+            return
+        channels, color_channels, bits_per_sample = pixel_layout(mode)
+        self._run_rows_kernel(self.c_lib.apply_point_pipeline_format_rows_c, raw_pixels_ptr, width, height,
+                              channels, color_channels, bits_per_sample, luts, num_stages,
+                              stride=width * channels * bits_per_sample // 8)
+
+    def _run_brightness_kernel(self, raw_pixels_ptr, width, height, brightness_factor, mode='RGB'):
+        # 16비트 이미지에서는 밝기 값(8비트 기준)을 257배 해서 전체 정밀도로 더합니다. (+40 → +10280)
+        # 테이블은 Pipeline.compile()로 만들어서, 같은 밝기 값을 다시 적용할 때는 기억해 둔 C 배열을 그대로 씁니다.
+        luts, num_stages = Pipeline().brightness(brightness_factor).compile(pixel_layout(mode)[2])
+        self._run_luts_kernel(raw_pixels_ptr, width, height, luts, num_stages, mode)
+
+    def _run_pipeline_kernel(self, raw_pixels_ptr, width, height, pipeline, mode='RGB'):
+        # 파이프라인을 이미지의 비트 수에 맞는 C 테이블로 정리한 뒤 한 번의 순회로 적용합니다.
+        # 블러 같은 공간 필터가 있으면, 그 앞뒤의 점 연산들을 각각 한 번의 순회로 묶어 순서대로 실행합니다.
+        if not len(pipeline):
+            return
+        for segment in pipeline.segments():
+            if isinstance(segment, Pipeline):
+                luts, num_stages = segment.compile(pixel_layout(mode)[2])
+                self._run_luts_kernel(raw_pixels_ptr, width, height, luts, num_stages, mode)
+            else:
+                self._run_spatial_kernel(raw_pixels_ptr, width, height, segment, mode)
+
+    # --- 공간(spatial) 필터 실행 ---
+    # 공간 필터는 주변 픽셀을 읽으므로 제자리에서 계산할 수 없습니다. 이미지와 같은 크기의 작업 버퍼를 하나 더 만들어
+    # 가로 방향 결과를 작업 버퍼에, 세로 방향 결과를 다시 원래 버퍼에 씁니다.
+    # 방향마다 _run_rows_kernel로 행을 나누어 여러 스레드에서 실행하며, 세로 방향은 가로 방향이 모두 끝난 뒤 시작합니다.
+    def _run_spatial_kernel(self, raw_pixels_ptr, width, height, op, mode='RGB'):
+        if not width or not height:
+            return
+        channels, color_channels, bits_per_sample = pixel_layout(mode)
+        stride = width * channels * bits_per_sample // 8
+        name = op[0]
+        with instrumentation.span(f"spatial.{name}"):
+            if name == 'gaussian_blur':
+                self._run_blur_kernel(raw_pixels_ptr, width, height, spatial.blur_plan(op[1]),
+                                      channels, bits_per_sample, stride)
+            elif name == 'box_blur':
+                self._run_blur_kernel(raw_pixels_ptr, width, height, spatial.box_plan(op[1]),
+                                      channels, bits_per_sample, stride)
+            elif name == 'unsharp_mask':
+                _, radius, percent, threshold = op
+                blurred = (ctypes.c_ubyte * (stride * height))()
+                ctypes.memmove(blurred, raw_pixels_ptr, stride * height)
+                self._run_blur_kernel(blurred, width, height, spatial.blur_plan(radius),
+                                      channels, bits_per_sample, stride)
+                # 임계값은 8비트 기준 값이므로 16비트 이미지에서는 257배 합니다. (lut.py의 인자들과 같은 방식)
+                if bits_per_sample == 16:
+                    threshold *= 257
+                self._run_rows_kernel(self.c_lib.apply_unsharp_rows_c, raw_pixels_ptr, width, height, blurred,
+                                      channels, color_channels, bits_per_sample, max(0, percent), max(0, threshold),
+                                      stride=stride)
+            elif name == 'sobel':
+                edges = (ctypes.c_ubyte * (stride * height))()
+                self._run_rows_kernel(self.c_lib.apply_sobel_rows_c, raw_pixels_ptr, width, height, edges, height,
+                                      channels, color_channels, bits_per_sample, stride=stride)
+                ctypes.memmove(raw_pixels_ptr, edges, stride * height)
+            else:
+                raise ValueError(f"알 수 없는 공간 필터입니다: {op!r}")
+
+    def _run_blur_kernel(self, raw_pixels_ptr, width, height, plan, channels, bits_per_sample, stride):
+        # spatial.blur_plan()/box_plan()의 계획대로 raw_pixels_ptr를 제자리에서 블러합니다.
+        if plan is None:
+            return
+        scratch = (ctypes.c_ubyte * (stride * height))()
+        if plan[0] == 'convolve':
+            _, weights, radius = plan
+            results = self._run_rows_kernel(self.c_lib.apply_convolve_h_rows_c, raw_pixels_ptr, width, height,
+                                            scratch, channels, bits_per_sample, weights, radius, stride=stride)
+            self._check_spatial_results(results)
+            self._run_rows_kernel(self.c_lib.apply_convolve_v_rows_c, scratch, width, height, raw_pixels_ptr,
+                                  height, channels, bits_per_sample, weights, radius, stride=stride)
+            return
+        _, c_radii, radii = plan
+        # 가로 방향은 모든 패스를 행마다 이어서 처리하고(C 함수 한 번), 세로 방향은 패스마다 두 버퍼를 번갈아 씁니다.
+        results = self._run_rows_kernel(self.c_lib.apply_box_blur_h_rows_c, raw_pixels_ptr, width, height,
+                                        scratch, channels, bits_per_sample, c_radii, len(radii), stride=stride)
+        self._check_spatial_results(results)
+        source, target = scratch, raw_pixels_ptr
+        for radius in radii:
+            self._run_rows_kernel(self.c_lib.apply_box_blur_v_rows_c, source, width, height, target,
+                                  height, channels, bits_per_sample, radius, stride=stride)
+            source, target = target, source
+        if source is scratch:
+            ctypes.memmove(raw_pixels_ptr, scratch, stride * height)
+
+    def _check_spatial_results(self, results):
+        # 가로 방향 C 함수는 한 행 크기의 임시 버퍼를 할당하지 못하면 -1을 반환합니다.
+        if any(results):
+            raise MemoryError("ImageHandler: 공간 필터의 임시 버퍼를 할당할 수 없습니다.")
+
+    def _lut_to_c(self, lut_r, lut_g, lut_b, mode):
+        # 사용자가 준 표를 이미지 비트 수에 맞는 C 배열로 바꿉니다. (8비트는 256칸, 16비트는 65536칸 표)
+        if pixel_layout(mode)[2] == 16:
+            return lut.to_c_luts16(lut_r, lut_g, lut_b)
+        return lut.to_c_luts(lut_r, lut_g, lut_b)
+
+    def apply_lut(self, image_obj, lut_r, lut_g=None, lut_b=None):
+        # 채널별 룩업 테이블로 대비, 감마, 레벨, 반전, 임계값 등 어떤 점 연산이든 적용합니다.
+        # 표의 크기는 이미지 비트 수에 맞아야 합니다. (8비트: 256칸, 16비트: 65536칸. src/lut.py의 max_value 인자 참고)
+        if not image_obj:
+            logger.warning("ImageHandler: 이미지가 유효하지 않아 룩업 테이블을 적용할 수 없습니다.")
+            return None
+        image_obj = to_supported_mode(image_obj)
+        try:
+            c_luts = self._lut_to_c(lut_r, lut_g, lut_b, image_obj.mode)
+        except ValueError as e:
+            logger.error("오류: ImageHandler: 룩업 테이블이 올바르지 않습니다 - %s", e)
+            return None
+        raw_pixels_ptr, width, height = self._prepare_pixels_for_c(image_obj)
+        self._run_luts_kernel(raw_pixels_ptr, width, height, c_luts, 1, image_obj.mode)
+        logger.debug("ImageHandler: C 룩업 테이블 필터 적용 완료.")
+        return self._create_image_from_c_pixels(raw_pixels_ptr, width, height, image_obj.mode)
+
+    def apply_pipeline(self, image_obj, pipeline, use_cache=True):
+        # Pipeline(src/pipeline.py)에 쌓인 필터들을 C에서 한 번의 순회로 모두 적용합니다.
+        # 필터가 몇 개든 픽셀 준비, 이미지 전체 순회, 이미지 재구성은 각각 한 번씩만 일어납니다.
+        # (블러 같은 공간 필터는 각각 가로/세로 순회가 따로 필요하지만, 픽셀 준비와 재구성은 여전히 한 번입니다)
+        # 결과 캐시가 켜져 있으면 (원본 픽셀 지문, 필터 목록)이 같은 이전 결과를 계산 없이 돌려줍니다.
+        # 캐시에서 나온 결과는 다른 호출과 공유될 수 있으므로, 직접 수정하려면 copy()해서 사용하세요.
+        if not image_obj:
+            logger.warning("ImageHandler: 이미지가 유효하지 않아 필터 파이프라인을 적용할 수 없습니다.")
             return None
+        instrumentation.count('calls.apply_pipeline')
+        image_obj = to_supported_mode(image_obj)
+        cache_key = None
+        if use_cache and self.result_cache is not None:
+            cache_key = (image_fingerprint(image_obj), pipeline.cache_key())
+            cached_image = self.result_cache.get(cache_key)
+            if cached_image is not None:
+                instrumentation.count('cache.hits')
+                return cached_image
         raw_pixels_ptr, width, height = self._prepare_pixels_for_c(image_obj)
-        print(f"ImageHandler: 밝기 필터 적용 전 - {width}x{height} 이미지 픽셀 데이터 준비 완료.")
-        self.c_lib.apply_brightness_c(raw_pixels_ptr, width, height, brightness_factor)
-        print(f"ImageHandler: C 밝기 필터 (+/- {brightness_factor}) 적용 완료.")
-        processed_image = self._create_image_from_c_pixels(raw_pixels_ptr, width, height)
+        self._run_pipeline_kernel(raw_pixels_ptr, width, height, pipeline, image_obj.mode)
+        logger.debug("ImageHandler: C 필터 파이프라인 %r 적용 완료.", pipeline)
+        processed_image = self._create_image_from_c_pixels(raw_pixels_ptr, width, height, image_obj.mode)
+        if cache_key is not None:
+            self.result_cache.put(cache_key, processed_image)
         return processed_image
 
+    # --- 공간(spatial) 필터 ---
+    # 블러, 언샤프 마스크, 소벨 에지를 하나만 적용하는 편의 메서드입니다. (apply_pipeline과 같은 경로와 결과 캐시 사용)
+    # 여러 필터를 이어서 적용할 때는 Pipeline에 쌓아서 apply_pipeline을 한 번 호출하는 편이 빠릅니다.
+    def apply_gaussian_blur(self, image_obj, radius):
+        return self.apply_pipeline(image_obj, Pipeline().gaussian_blur(radius))
+
+    def apply_box_blur(self, image_obj, radius):
+        return self.apply_pipeline(image_obj, Pipeline().box_blur(radius))
+
+    def apply_unsharp_mask(self, image_obj, radius=2.0, percent=150, threshold=3):
+        return self.apply_pipeline(image_obj, Pipeline().unsharp_mask(radius, percent, threshold))
+
+    def apply_sobel(self, image_obj):
+        return self.apply_pipeline(image_obj, Pipeline().sobel())
+
+    # --- 제로-카피(in-place) API ---
+    # 이미 메모리에 있는 픽셀 버퍼(높이 x 너비 x 채널)를 복사 없이 직접 수정합니다.
+    # mode는 버퍼의 픽셀 배치입니다. (기본값 'RGB'는 uint8 3채널. 'RGBA', 'L', 'I;16'(uint16) 등도 가능)
+    # 성공하면 True, 버퍼가 조건에 맞지 않으면 False를 반환합니다.
+    def apply_grayscale_inplace(self, buffer, width, height, mode='RGB'):
+        try:
+            raw_pixels_ptr = self._buffer_to_c_pointer(buffer, width, height, mode)
+        except (TypeError, ValueError) as e:
+            logger.error("오류: ImageHandler: 흑백 필터를 적용할 수 없는 버퍼입니다 - %s", e)
+            return False
+        self._run_grayscale_kernel(raw_pixels_ptr, width, height, mode)
+        return True
+
+    def apply_brightness_inplace(self, buffer, width, height, brightness_factor, mode='RGB'):
+        try:
+            raw_pixels_ptr = self._buffer_to_c_pointer(buffer, width, height, mode)
+        except (TypeError, ValueError) as e:
+            logger.error("오류: ImageHandler: 밝기 필터를 적용할 수 없는 버퍼입니다 - %s", e)
+            return False
+        self._run_brightness_kernel(raw_pixels_ptr, width, height, brightness_factor, mode)
+        return True
+
+    def apply_pipeline_inplace(self, buffer, width, height, pipeline, mode='RGB'):
+        try:
+            raw_pixels_ptr = self._buffer_to_c_pointer(buffer, width, height, mode)
+        except (TypeError, ValueError) as e:
+            logger.error("오류: ImageHandler: 필터 파이프라인을 적용할 수 없는 버퍼입니다 - %s", e)
+            return False
+        self._run_pipeline_kernel(raw_pixels_ptr, width, height, pipeline, mode)
+        return True
+
+    def apply_lut_inplace(self, buffer, width, height, lut_r, lut_g=None, lut_b=None, mode='RGB'):
+        # 채널별 룩업 테이블(src/lut.py에서 만든 표)을 버퍼에 직접 적용합니다.
+        # lut_g, lut_b를 생략하면 lut_r을 세 채널 모두에 사용합니다.
+        try:
+            raw_pixels_ptr = self._buffer_to_c_pointer(buffer, width, height, mode)
+            c_luts = self._lut_to_c(lut_r, lut_g, lut_b, mode)
+        except (TypeError, ValueError) as e:
+            logger.error("오류: ImageHandler: 룩업 테이블을 적용할 수 없습니다 - %s", e)
+            return False
+        self._run_luts_kernel(raw_pixels_ptr, width, height, c_luts, 1, mode)
+        return True
+
     def save_image(self, image_obj, output_path):
         if not image_obj:
-            print("ImageHandler: 저장할 이미지가 유효하지 않습니다.")
+            logger.warning("ImageHandler: 저장할 이미지가 유효하지 않습니다.")
             return False
         try:
-            image_obj.save(output_path)
-            print(f"ImageHandler: 이미지를 '{output_path}'에 성공적으로 저장했습니다.")
+            with instrumentation.span('encode'):
+                if os.path.splitext(output_path)[1].lower() in ('.jpg', '.jpeg') and image_obj.mode not in ('RGB', 'L'):
+                    # JPEG은 알파 채널과 16비트를 저장할 수 없으므로 RGB/L(8비트)로 바꿔서 저장합니다.
+                    image_obj = to_8bit(image_obj)
+                    image_obj = image_obj.convert('L' if image_obj.mode in ('L', 'LA') else 'RGB')
+                image_obj.save(output_path)
+            logger.info("ImageHandler: 이미지를 '%s'에 성공적으로 저장했습니다.", output_path)
             return True
         except Exception as e:
-            print(f"오류: ImageHandler: 이미지 저장 실패 - {e}")
+            logger.error("오류: ImageHandler: 이미지 저장 실패 - %s", e)
             return False
 
 if __name__ == '__main__':
+    import numpy as np            # <--- 숫자 배열을 효율적으로 다루기 위한 라이브러리 (옵션이지만 매우 유용!)
+                                  #      'pip install numpy'로 설치해야 할 수도 있습니다.
+    # 자체 테스트에서는 INFO 수준 메시지(이미지 불러오기/저장 등)를 화면에 보여 줍니다.
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
     print("\n--- src/image_handler.py 모듈 자체 테스트 시작 ---")
     input_image_path = os.path.join(project_root_dir, 'assets', 'test_image.jpg')
     output_grayscale_path = os.path.join(project_root_dir, 'assets', 'output_grayscale.jpg')
@@ -129,4 +553,390 @@ if __name__ == '__main__':
             print("테스트 실패: 밝기 필터 (어둡게) 적용에 실패했습니다.")
     else:
         print("테스트 실패: 이미지 불러오기에 실패했습니다. assets 폴더에 test_image.jpg가 있는지 확인하세요.")
+
+    print("\n--- 제로-카피 경로 테스트 ---")
+    # 1. NumPy 배열의 메모리 주소가 C 함수에 그대로 전달되는지(포인터가 같은지) 확인합니다.
+    pixel_array = np.full((4, 5, 3), 128, dtype=np.uint8)
+    c_pointer = handler._buffer_to_c_pointer(pixel_array, 5, 4)
+    assert ctypes.addressof(c_pointer) == pixel_array.ctypes.data, "포인터가 원래 배열과 다릅니다."
+    copies_before = handler.copy_count
+    assert handler.apply_brightness_inplace(pixel_array, 5, 4, 50)
+    assert handler.copy_count == copies_before, "in-place 경로에서 복사가 발생했습니다."
+    assert (pixel_array == 178).all(), "NumPy 배열이 직접 수정되지 않았습니다."
+    print("NumPy 배열 in-place 밝기 조절 확인 (포인터 동일, 복사 0회)")
+
+    # 2. bytearray / memoryview도 같은 방식으로 동작하는지 확인합니다.
+    pixel_bytes = bytearray([255, 0, 0] * 6)
+    assert handler.apply_grayscale_inplace(memoryview(pixel_bytes), 3, 2)
+    assert list(pixel_bytes) == [85] * 18, "bytearray가 직접 수정되지 않았습니다."
+    assert not handler.apply_grayscale_inplace(bytes(18), 3, 2), "읽기 전용 버퍼가 거부되지 않았습니다."
+    assert not handler.apply_grayscale_inplace(np.zeros((2, 6, 3), np.uint8)[:, ::2], 3, 2), "연속되지 않은 버퍼가 거부되지 않았습니다."
+    print("bytearray/memoryview in-place 흑백 변환 및 잘못된 버퍼 거부 확인")
+
+    # 3. Image 입력/출력 경로의 전체 프레임 복사 횟수를 copy_count와 별도로 실제로 세어 봅니다.
+    #    - 파이썬 쪽(C용 작업 버퍼 등): tracemalloc으로 잰 최대 메모리 사용량이 프레임 몇 장 크기인지
+    #    - Pillow 쪽(결과 이미지 저장 공간): Pillow 메모리 할당기의 새 블록 수
+    #    RGB는 작업 버퍼 + 결과 이미지로 풀어 넣기 2회, Pillow와 저장 배치가 같은 L/RGBA는 작업 버퍼 1회입니다.
+    import tracemalloc
+    sample_image = Image.frombytes('RGB', (3, 2), bytes(range(18)))
+    bright_sample = handler.apply_brightness(sample_image, 10)
+    assert bright_sample.tobytes() == bytes(min(v + 10, 255) for v in range(18)), "Image 경로 결과가 다릅니다."
+    for copy_mode, expected_copies in (('RGB', 2), ('L', 1), ('RGBA', 1)):
+        copy_source = Image.new(copy_mode, (1000, 1000), 'gray')
+        frame_bytes = 1000 * 1000 * pixel_layout(copy_mode)[0]
+        copies_before, pillow_before = handler.copy_count, Image.core.get_stats()
+        tracemalloc.start()
+        copy_result = handler.apply_brightness(copy_source, 10)
+        python_peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        pillow_after = Image.core.get_stats()
+        pillow_frames = sum(pillow_after[k] - pillow_before[k] for k in ('allocated_blocks', 'reused_blocks'))
+        measured_copies = python_peak // frame_bytes + pillow_frames
+        assert measured_copies == expected_copies == handler.copy_count - copies_before, \
+            f"{copy_mode}: 측정한 복사 {measured_copies}회, copy_count {handler.copy_count - copies_before}회 (예상 {expected_copies}회)"
+        assert copy_result.getpixel((0, 0)) == Image.new(copy_mode, (1, 1), 'gray').point(lambda v: min(v + 10, 255)).getpixel((0, 0))
+        print(f"{copy_mode}: Image 입력/출력 경로 전체 프레임 복사 {measured_copies}회 (측정값과 copy_count 일치)")
+
+    print("\n--- 합쳐진(fused) 필터 파이프라인 테스트 ---")
+    # 파이프라인을 한 번에 적용한 결과가 필터를 하나씩 차례로 적용한 결과와 같은지 확인합니다.
+    fused_source = np.random.default_rng(1).integers(0, 256, size=(64, 48, 3), dtype=np.uint8)
+    for fused_pipeline in (Pipeline().grayscale().brightness(40),
+                           Pipeline().brightness(-30).grayscale().brightness(100).brightness(-60),
+                           Pipeline().brightness(200).brightness(-150).grayscale().grayscale(),
+                           Pipeline().contrast(1.4).gamma(2.2).grayscale().levels(20, 230).invert().threshold(100)):
+        sequential_pixels = fused_source.copy()
+        for op in fused_pipeline.ops:
+            if op[0] in ('grayscale', 'brightness'):
+                getattr(handler, f'apply_{op[0]}_inplace')(sequential_pixels, 48, 64, *op[1:])
+            else:
+                handler.apply_lut_inplace(sequential_pixels, 48, 64, getattr(lut, f'{op[0]}_lut')(*op[1:]))
+        fused_pixels = fused_source.copy()
+        assert handler.apply_pipeline_inplace(fused_pixels, 48, 64, fused_pipeline)
+        assert np.array_equal(sequential_pixels, fused_pixels), f"{fused_pipeline} 결과가 다릅니다."
+        fused_image = handler.apply_pipeline(Image.fromarray(fused_source), fused_pipeline)
+        assert fused_image.tobytes() == sequential_pixels.tobytes(), f"{fused_pipeline} Image 경로 결과가 다릅니다."
+        print(f"{fused_pipeline}: 순차 적용 결과와 동일")
+
+    # 룩업 테이블로 다시 구현한 밝기 조절이 기존 C 함수(apply_brightness_c)와 같은 결과인지 확인합니다.
+    for brightness_factor in (-255, -40, 0, 77, 255):
+        branch_pixels = fused_source.copy()
+        handler.c_lib.apply_brightness_c(handler._buffer_to_c_pointer(branch_pixels, 48, 64), 48, 64, brightness_factor)
+        lut_pixels = fused_source.copy()
+        handler.apply_brightness_inplace(lut_pixels, 48, 64, brightness_factor)
+        assert np.array_equal(branch_pixels, lut_pixels), f"밝기 {brightness_factor} 룩업 테이블 결과가 다릅니다."
+    print("룩업 테이블 밝기 조절 결과가 apply_brightness_c와 동일")
+
+    print("\n--- 결과 캐시 테스트 ---")
+    # 메모리 캐시는 결과 2장 크기만큼만 허용해서, 세 번째 결과가 들어올 때 가장 오래된 결과가 버려지는지 확인합니다.
+    import tempfile
+    cache_source = Image.fromarray(fused_source)
+    cache_dir = tempfile.mkdtemp()
+    cached_handler = ImageHandler(cache_bytes=2 * fused_source.nbytes, cache_dir=cache_dir)
+    first = cached_handler.apply_pipeline(cache_source, Pipeline().brightness(10))
+    assert cached_handler.apply_pipeline(cache_source, Pipeline().brightness(10)) is first, "캐시 적중 결과가 다릅니다."
+    assert cached_handler.apply_pipeline(cache_source.copy(), Pipeline().brightness(10)) is first, "같은 내용의 이미지가 캐시에서 찾아지지 않았습니다."
+    cached_handler.apply_pipeline(cache_source, Pipeline().brightness(20))
+    cached_handler.apply_pipeline(cache_source, Pipeline().brightness(30))
+    stats = cached_handler.result_cache.stats()
+    assert (stats['hits'], stats['misses'], stats['evictions'], stats['entries']) == (2, 3, 1, 2), stats
+    assert stats['bytes'] <= stats['max_bytes']
+    # 메모리 캐시를 비워도 디스크 캐시에서 같은 결과를 다시 읽어 와야 합니다.
+    cached_handler.result_cache.clear()
+    from_disk = cached_handler.apply_pipeline(cache_source, Pipeline().brightness(10))
+    assert from_disk.tobytes() == first.tobytes() and cached_handler.result_cache.stats()['disk_hits'] == 1
+    print(f"캐시 통계: {cached_handler.result_cache.stats()}")
+
+    # 같은 Image 객체를 제자리에서 바꾸면(paste 등) 캐시가 바뀌기 전의 결과를 돌려주면 안 됩니다.
+    mutable_source = Image.new('RGB', (8, 8), (10, 10, 10))
+    assert cached_handler.apply_pipeline(mutable_source, Pipeline().invert()).getpixel((0, 0)) == (245, 245, 245)
+    mutable_source.paste((200, 200, 200), (0, 0, 8, 8))
+    assert cached_handler.apply_pipeline(mutable_source, Pipeline().invert()).getpixel((0, 0)) == (55, 55, 55), \
+        "제자리에서 바뀐 이미지에 예전 캐시 결과가 사용되었습니다."
+    print("제자리에서 바뀐 이미지는 새 지문으로 다시 계산")
+
+    # 디스크 캐시는 max_disk_bytes(여기서는 결과 2장 크기)를 넘으면 가장 오래 사용하지 않은 파일부터 지워야 합니다.
+    import time
+    from src.result_cache import ResultCache
+    disk_budget_dir = tempfile.mkdtemp()
+    result_nbytes = fused_source.nbytes + 16
+    disk_cache = ResultCache(0, disk_budget_dir, max_disk_bytes=2 * result_nbytes)
+    for brightness_factor in (1, 2, 3):
+        disk_cache.put(('budget', brightness_factor), cache_source)
+        time.sleep(0.05)   # 파일 수정 시각이 서로 다르도록 잠시 기다립니다.
+    disk_stats = disk_cache.stats()
+    assert disk_stats['disk_bytes'] <= disk_stats['max_disk_bytes'] and disk_stats['disk_evictions'] == 1, disk_stats
+    assert disk_cache.get(('budget', 1)) is None and disk_cache.get(('budget', 3)) is not None, "오래된 파일이 먼저 지워지지 않았습니다."
+    assert len(os.listdir(disk_budget_dir)) == 2
+    print(f"디스크 캐시 한도 확인: {disk_stats['disk_bytes']}/{disk_stats['max_disk_bytes']} 바이트, 지운 파일 {disk_stats['disk_evictions']}개")
+
+    print("\n--- 띠(strip) 스트리밍 테스트 ---")
+    # 띠 단위로 읽고-처리하고-이어 쓴 결과가, 전체를 메모리에 올려 처리한 결과와 바이트 단위로 같은지 확인합니다.
+    from src import streaming
+    stream_dir = tempfile.mkdtemp()
+    stream_pipeline = Pipeline().grayscale().brightness(30).gamma(1.3)
+    stream_source = Image.fromarray(np.random.default_rng(2).integers(0, 256, size=(301, 77, 3), dtype=np.uint8))
+    for input_name in ('input.ppm', 'input.bmp', 'input.tif'):
+        stream_input = os.path.join(stream_dir, input_name)
+        stream_source.save(stream_input)
+        in_memory = handler.apply_pipeline(handler.load_image(stream_input), stream_pipeline)
+        in_memory.save(os.path.join(stream_dir, 'expected.ppm'))
+        for output_name in ('output.ppm', 'output.tif'):
+            stream_output = os.path.join(stream_dir, output_name)
+            assert streaming.stream_pipeline(handler, stream_input, stream_output, stream_pipeline, strip_bytes=77 * 3 * 16)
+            with Image.open(stream_output) as streamed:
+                assert streamed.tobytes() == in_memory.tobytes(), f"{input_name} → {output_name} 결과가 다릅니다."
+        with open(os.path.join(stream_dir, 'output.ppm'), 'rb') as a, open(os.path.join(stream_dir, 'expected.ppm'), 'rb') as b:
+            assert a.read() == b.read(), f"{input_name} 스트리밍 PPM 파일이 메모리 경로와 다릅니다."
+        print(f"{input_name}: 16행 띠 스트리밍 결과가 메모리 경로와 동일")
+
+    # 흑백(L)과 알파가 있는 이미지(LA, RGBA)도 RGB로 바뀌지 않고 메모리 경로와 같은 모드, 같은 바이트로 저장되어야 합니다.
+    # (raw로 읽는 PGM/TIFF와 한 번에 푸는 PNG를 모두 확인합니다)
+    mode_pixels = np.random.default_rng(3).integers(0, 256, size=(301, 77, 4), dtype=np.uint8)
+    mode_sources = {'L': Image.fromarray(mode_pixels[:, :, 0]),
+                    'LA': Image.fromarray(mode_pixels[:, :, :2]),
+                    'RGBA': Image.fromarray(mode_pixels)}
+    for input_name in ('l.pgm', 'l.png', 'la.tif', 'la.png', 'rgba.tif', 'rgba.png'):
+        mode = input_name.split('.')[0].upper()
+        stream_input = os.path.join(stream_dir, input_name)
+        mode_sources[mode].save(stream_input)
+        in_memory = handler.apply_pipeline(handler.load_image(stream_input), stream_pipeline)
+        assert in_memory.mode == mode
+        for output_name in ('output.tif', 'output.ppm'):
+            stream_output = os.path.join(stream_dir, output_name)
+            ok = streaming.stream_pipeline(handler, stream_input, stream_output, stream_pipeline,
+                                           strip_bytes=77 * len(mode) * 16)
+            if output_name == 'output.ppm' and mode != 'L':
+                # PPM에는 알파를 저장할 수 없으므로, RGB로 바꿔서 저장하지 않고 실패해야 합니다.
+                assert not ok, f"{input_name}을(를) 알파 없이 PPM으로 저장했습니다."
+                continue
+            assert ok
+            with Image.open(stream_output) as streamed:
+                assert streamed.mode == mode, f"{input_name} → {output_name}: 모드가 {streamed.mode}(으)로 바뀌었습니다."
+                assert streamed.tobytes() == in_memory.tobytes(), f"{input_name} → {output_name} 결과가 다릅니다."
+        print(f"{input_name}: {mode} 모드 그대로 스트리밍, 결과가 메모리 경로와 동일")
+
+    # Pillow의 크기 제한(약 179 MP)을 넘는 머리말도 열 수 있어야 합니다. (40000x25000 = 1 GP, 픽셀은 앞의 2행만 씀)
+    giga_input = os.path.join(stream_dir, 'giga.ppm')
+    giga_rows = bytes(i % 251 for i in range(40000 * 3 * 2))
+    with open(giga_input, 'wb') as giga_file:
+        giga_file.write(b"P6\n40000 25000\n255\n" + giga_rows)
+    giga_reader = streaming.open_strip_reader(giga_input)
+    try:
+        assert isinstance(giga_reader, streaming.RawStripReader) and (giga_reader.width, giga_reader.height) == (40000, 25000)
+        giga_strip = bytearray(len(giga_rows))
+        giga_reader.read_rows(0, 2, memoryview(giga_strip))
+        assert giga_strip == giga_rows, "1 GP 이미지의 첫 띠를 잘못 읽었습니다."
+    finally:
+        giga_reader.close()
+    # 스트리밍은 Pillow 전역 크기 제한을 바꾸지 않으므로, 일반 Image.open에는 검사가 그대로 적용되어야 합니다.
+    max_image_pixels = Image.MAX_IMAGE_PIXELS
+    try:
+        Image.open(giga_input)
+        raise AssertionError("1 GP 이미지가 크기 제한 검사 없이 열렸습니다.")
+    except Image.DecompressionBombError:
+        pass
+    assert Image.MAX_IMAGE_PIXELS == max_image_pixels
+    # 파일이 머리말보다 짧으면 예외 없이 실패(False)를 반환해야 합니다.
+    assert not streaming.stream_pipeline(handler, giga_input, os.path.join(stream_dir, 'giga_out.ppm'),
+                                         Pipeline().invert(), strip_bytes=len(giga_rows))
+    assert not os.path.exists(os.path.join(stream_dir, 'giga_out.ppm')), "실패한 스트리밍의 출력 파일이 남아 있습니다."
+    # 잘린 BMP(아래에서 위로 저장, Pillow로 띠를 푸는 경로)와 잘린 TIFF도 예외 없이 실패하고 출력 파일을 남기지 않아야 합니다.
+    for input_name in ('input.bmp', 'input.tif'):
+        truncated_input = os.path.join(stream_dir, 'truncated_' + input_name)
+        with open(os.path.join(stream_dir, input_name), 'rb') as f:
+            truncated_bytes = f.read()
+        with open(truncated_input, 'wb') as f:
+            f.write(truncated_bytes[:len(truncated_bytes) // 2])
+        truncated_output = os.path.join(stream_dir, 'truncated_out.tif')
+        assert not streaming.stream_pipeline(handler, truncated_input, truncated_output, Pipeline().invert(),
+                                             strip_bytes=77 * 3 * 16)
+        assert not os.path.exists(truncated_output), f"잘린 {input_name}의 출력 파일이 남아 있습니다."
+    print("1 GP 머리말: 크기 제한 없이 열고 첫 띠를 읽음, 잘린 파일(PPM/BMP/TIFF)은 실패로 처리하고 출력 파일 삭제")
+
+    print("\n--- 일괄 처리(batch) 테스트 ---")
+    # 서로 다른 폴더의 같은 이름 파일(a/x.png, b/x.png)이 같은 출력 파일을 덮어쓰지 않고 폴더 구조대로 저장되어야 합니다.
+    from src import batch
+    batch_input = os.path.join(stream_dir, 'batch_in')
+    batch_output = os.path.join(stream_dir, 'batch_out')
+    for folder, value in (('a', 40), ('b', 200)):
+        os.makedirs(os.path.join(batch_input, folder))
+        Image.new('RGB', (8, 8), (value, value, value)).save(os.path.join(batch_input, folder, 'x.png'))
+    batch_pattern = os.path.join(batch_input, '**', '*.png')
+    assert batch.run_batch(batch_pattern, batch_output, Pipeline().invert(), workers=1) == (2, 0, 0)
+    for folder, value in (('a', 40), ('b', 200)):
+        with Image.open(os.path.join(batch_output, folder, 'x.png')) as batch_result:
+            assert batch_result.getpixel((0, 0)) == (255 - value,) * 3, f"{folder}/x.png 결과가 다릅니다."
+    # 다시 실행하면 두 파일 모두 이미 출력이 있으므로 건너뛰어야 합니다.
+    assert batch.run_batch(batch_pattern, batch_output, Pipeline().invert(), workers=1) == (0, 2, 0)
+    print("같은 이름의 파일 2개가 각자의 하위 폴더에 저장되고, 다시 실행하면 모두 건너뜀")
+    # 저장 도중 실패해도(작업자가 죽는 경우와 같음) 최종 출력 파일이 생기거나 잘린 임시 파일이 남으면 안 됩니다.
+    # 그래야 다시 실행했을 때 '출력이 있으니 건너뜀'으로 잘못 처리되지 않습니다.
+    def save_then_fail(image_obj, output_path):
+        with open(output_path, 'wb') as partial:
+            partial.write(b'partial')
+        raise OSError("저장 도중 중단")
+    batch._init_worker()
+    batch._worker_handler.save_image = save_then_fail
+    interrupted_output = os.path.join(batch_output, 'interrupted', 'x.png')
+    os.makedirs(os.path.dirname(interrupted_output))
+    assert not batch._process_one((os.path.join(batch_input, 'a', 'x.png'), interrupted_output, Pipeline().invert(), None))[1]
+    assert os.listdir(os.path.dirname(interrupted_output)) == [], "저장 도중 실패한 출력(또는 임시 파일)이 남아 있습니다."
+    batch._worker_handler = None
+    print("저장 도중 실패하면 출력 파일과 임시 파일이 남지 않음")
+    # 잘못된 필터 값은 명령줄을 해석할 때 ValueError가 되어야 하고, 작업자 안의 예외는 해당 파일의 실패로만 보고되어야 합니다.
+    for bad_spec in ('gamma=0', 'levels=300:400', 'levels=10:240:0', 'gaussian_blur=5000', 'box_blur=-1', 'unsharp_mask=-2'):
+        try:
+            Pipeline.from_spec(bad_spec)
+            raise AssertionError(f"'{bad_spec}'이(가) 허용되었습니다.")
+        except ValueError:
+            pass
+    assert batch.run_batch(batch_pattern, batch_output, Pipeline().gaussian_blur(5000), workers=1, overwrite=True) == (0, 0, 2)
+    print("잘못된 필터 값은 미리 거부되고, 작업자 안의 예외는 파일별 실패로 보고됨")
+
+    print("\n--- 멀티스레드 띠(band) 처리 테스트 ---")
+    # 여러 스레드로 나누어 처리한 결과가 한 스레드로 처리한 결과와 비트 단위로 같은지 확인합니다.
+    # (시간은 참고용입니다. 코어가 8개보다 적으면 8스레드가 더 느릴 수 있으며, 스레드 수별 속도는 src/benchmark.py로 측정합니다)
+    import time
+    serial_handler = ImageHandler(num_threads=1)
+    threaded_handler = ImageHandler(num_threads=8)
+    random_pixels = np.random.default_rng(0).integers(0, 256, size=(2000, 1500, 3), dtype=np.uint8)
+    for filter_name, args in (('grayscale', ()), ('brightness', (37,)), ('brightness', (-90,))):
+        serial_pixels = random_pixels.copy()
+        threaded_pixels = random_pixels.copy()
+        serial_start = time.perf_counter()
+        getattr(serial_handler, f'apply_{filter_name}_inplace')(serial_pixels, 1500, 2000, *args)
+        serial_time = time.perf_counter() - serial_start
+        threaded_start = time.perf_counter()
+        getattr(threaded_handler, f'apply_{filter_name}_inplace')(threaded_pixels, 1500, 2000, *args)
+        threaded_time = time.perf_counter() - threaded_start
+        assert np.array_equal(serial_pixels, threaded_pixels), f"{filter_name} 멀티스레드 결과가 다릅니다."
+        print(f"{filter_name}{args}: 1스레드 {serial_time * 1000:.1f} ms, "
+              f"{threaded_handler.num_threads}스레드 {threaded_time * 1000:.1f} ms (결과 동일)")
+
+    print("\n--- 줄여서 불러오기(reduced decode) 테스트 ---")
+    # 큰 JPEG을 목표 크기로 불러오면 비율을 유지하며 그 안에 들어가야 하고, 원본을 줄인 결과와 거의 같아야 합니다.
+    big_jpeg_path = os.path.join(stream_dir, 'big.jpg')
+    original_image.resize((original_image.width * 8, original_image.height * 8)).save(big_jpeg_path, quality=95)
+    full_image = handler.load_image(big_jpeg_path)
+    for target in ((640, 480), (100, 100), (10**5, 10**5)):
+        reduced = handler.load_image(big_jpeg_path, target_size=target)
+        expected_size = fit_size(full_image.size, target)
+        assert reduced.size == expected_size, f"{target}: 크기 {reduced.size} != {expected_size}"
+        reference = full_image.resize(expected_size, Image.Resampling.LANCZOS)
+        difference = np.abs(np.asarray(reduced, dtype=np.int16) - np.asarray(reference, dtype=np.int16)).mean()
+        assert difference < 2.0, f"{target}: 원본을 줄인 결과와 너무 다릅니다. (평균 차이 {difference:.2f})"
+        print(f"목표 {target}: {reduced.size} (원본을 줄인 결과와 평균 차이 {difference:.2f})")
+
+    print("\n--- 채널/비트 깊이별(L, LA, RGBA, I;16) 처리 테스트 ---")
+    # 1. L 이미지는 RGB로 바꾸지 않고 처리하며, 같은 값을 세 채널에 넣은 RGB 이미지를 처리한 결과와 같아야 합니다.
+    mode_pipeline = Pipeline().contrast(1.3).grayscale().brightness(25).gamma(1.8)
+    gray_source = np.random.default_rng(3).integers(0, 256, size=(37, 53), dtype=np.uint8)
+    gray_result = handler.apply_pipeline(Image.fromarray(gray_source), mode_pipeline)
+    rgb_result = handler.apply_pipeline(Image.fromarray(np.dstack([gray_source] * 3)), mode_pipeline)
+    assert gray_result.mode == 'L', gray_result.mode
+    assert np.array_equal(np.asarray(gray_result), np.asarray(rgb_result)[..., 0]), "L 결과가 RGB 경로와 다릅니다."
+    print("L: RGB 경로와 같은 결과 (변환 없이 1바이트/픽셀로 처리)")
+
+    # 2. RGBA/LA의 알파 채널은 그대로 유지되고, 색 채널은 RGB/L 경로와 같은 결과여야 합니다.
+    rgba_source = np.random.default_rng(4).integers(0, 256, size=(37, 53, 4), dtype=np.uint8)
+    for mode, source in (('RGBA', rgba_source), ('LA', rgba_source[..., 2:])):
+        color_mode = mode[:-1] if mode == 'LA' else 'RGB'
+        expected_color = np.asarray(handler.apply_pipeline(Image.fromarray(np.ascontiguousarray(source[..., :-1].squeeze())), mode_pipeline))
+        result = handler.apply_pipeline(Image.fromarray(source, mode), mode_pipeline)
+        assert result.mode == mode, result.mode
+        result_pixels = np.asarray(result)
+        assert np.array_equal(result_pixels[..., -1], source[..., -1]), f"{mode}: 알파 채널이 바뀌었습니다."
+        assert np.array_equal(result_pixels[..., :-1].reshape(expected_color.shape), expected_color), f"{mode}: 색 채널 결과가 다릅니다."
+        print(f"{mode}: 알파 유지, 색 채널은 {color_mode} 경로와 동일")
+
+    # 3. 16비트 흑백(I;16)은 8비트로 줄이지 않고 전체 정밀도로 처리합니다. (밝기 +40 → +40*257)
+    deep_source = np.random.default_rng(5).integers(0, 65536, size=(37, 53), dtype=np.uint16)
+    deep_image = Image.fromarray(deep_source)
+    assert deep_image.mode == 'I;16', deep_image.mode
+    deep_bright = handler.apply_brightness(deep_image, 40)
+    assert deep_bright.mode == 'I;16'
+    expected_deep = np.minimum(deep_source.astype(np.int32) + 40 * 257, 65535)
+    assert np.array_equal(np.asarray(deep_bright), expected_deep), "I;16 밝기 결과가 다릅니다."
+    deep_path = os.path.join(stream_dir, 'deep.png')
+    handler.save_image(handler.apply_pipeline(deep_image, Pipeline().invert()), deep_path)
+    deep_loaded = handler.load_image(deep_path)
+    assert deep_loaded.mode == 'I;16' and np.array_equal(np.asarray(deep_loaded), 65535 - deep_source), "16비트 PNG가 보존되지 않았습니다."
+    print(f"I;16: 밝기/반전이 16비트 정밀도로 적용되고 PNG 저장/불러오기 후에도 유지 ({len(np.unique(deep_source))}개 값)")
+
+    # 4. 16비트 컬러는 in-place API에 uint16 버퍼로 넘기며, 여러 단계 파이프라인도 8비트와 같은 규칙으로 적용됩니다.
+    deep_rgba = np.random.default_rng(6).integers(0, 65536, size=(29, 31, 4), dtype=np.uint16)
+    deep_rgba_result = deep_rgba.copy()
+    assert handler.apply_pipeline_inplace(deep_rgba_result, 31, 29, Pipeline().grayscale().invert(), mode='RGBA;16')
+    expected_gray = 65535 - deep_rgba[..., :3].sum(axis=2, dtype=np.uint32) // 3
+    assert np.array_equal(deep_rgba_result[..., :3], np.dstack([expected_gray] * 3)), "RGBA;16 결과가 다릅니다."
+    assert np.array_equal(deep_rgba_result[..., 3], deep_rgba[..., 3]), "RGBA;16 알파 채널이 바뀌었습니다."
+    assert not handler.apply_grayscale_inplace(np.zeros((29, 31, 4), np.uint8), 31, 29, mode='RGBA;16'), "크기가 맞지 않는 버퍼가 거부되지 않았습니다."
+    print("RGBA;16 in-place 파이프라인 결과 및 알파 유지 확인")
+
+    print("\n--- 공간 필터(블러, 언샤프 마스크, 소벨) 테스트 ---")
+    # 1. Pillow의 같은 필터와 비교합니다. 상자 블러는 같은 계산이라 똑같고, 가우시안은 근사 방식이 달라 조금 다릅니다.
+    from PIL import ImageFilter
+    spatial_image = handler.load_image(input_image_path)
+    for radius in (1, 5, 20):
+        ours = np.asarray(handler.apply_box_blur(spatial_image, radius))
+        assert np.array_equal(ours, np.asarray(spatial_image.filter(ImageFilter.BoxBlur(radius)))), f"상자 블러({radius}) 결과가 Pillow와 다릅니다."
+    for radius in (1.0, 3.0, 20.0):
+        ours = np.asarray(handler.apply_gaussian_blur(spatial_image, radius)).astype(np.int16)
+        pillow = np.asarray(spatial_image.filter(ImageFilter.GaussianBlur(radius))).astype(np.int16)
+        assert np.abs(ours - pillow).mean() < 1.0, f"가우시안 블러({radius}) 결과가 Pillow와 너무 다릅니다."
+    sharpened = np.asarray(handler.apply_unsharp_mask(spatial_image)).astype(np.int16)
+    assert np.abs(sharpened - np.asarray(spatial_image.filter(ImageFilter.UnsharpMask())).astype(np.int16)).mean() < 1.0
+    print("상자 블러는 Pillow BoxBlur와 동일, 가우시안 블러/언샤프 마스크는 평균 차이 1 미만")
+
+    # 2. 평평한 영역은 블러 후에도 값이 그대로이고, 소벨 에지는 0이어야 합니다. (가장자리 처리 포함)
+    flat = Image.new('RGB', (300, 200), (90, 160, 230))
+    for flat_pipeline in (Pipeline().gaussian_blur(1.5), Pipeline().gaussian_blur(30), Pipeline().box_blur(250)):
+        assert np.array_equal(np.asarray(handler.apply_pipeline(flat, flat_pipeline)), np.asarray(flat)), f"{flat_pipeline!r}: 평평한 이미지가 바뀌었습니다."
+    assert not np.asarray(handler.apply_sobel(flat)).any(), "평평한 이미지의 소벨 에지가 0이 아닙니다."
+
+    # 3. 여러 스레드로 나누어 처리한 결과는 한 스레드로 처리한 결과와 비트 단위로 같아야 합니다.
+    spatial_source = Image.fromarray(np.random.default_rng(7).integers(0, 256, size=(1100, 1000, 4), dtype=np.uint8))
+    single_handler, multi_handler = ImageHandler(num_threads=1), ImageHandler(num_threads=4)
+    for spatial_pipeline in (Pipeline().gaussian_blur(1.5), Pipeline().gaussian_blur(8), Pipeline().box_blur(5),
+                             Pipeline().unsharp_mask(), Pipeline().grayscale().sobel().invert()):
+        single = single_handler.apply_pipeline(spatial_source, spatial_pipeline)
+        multi = multi_handler.apply_pipeline(spatial_source, spatial_pipeline)
+        assert np.array_equal(np.asarray(single), np.asarray(multi)), f"{spatial_pipeline!r}: 스레드 수에 따라 결과가 다릅니다."
+    edges = np.asarray(multi_handler.apply_pipeline(spatial_source, Pipeline().unsharp_mask().sobel()))
+    assert np.array_equal(edges[..., 3], np.asarray(spatial_source)[..., 3]), "공간 필터가 알파 채널을 바꿨습니다."
+    print("1 스레드와 4 스레드 결과 동일, RGBA 알파 유지")
+
+    # 4. 16비트 이미지는 16비트 정밀도로 블러합니다. (8비트로 줄인 뒤 블러한 결과와 거의 같아야 함)
+    deep_blur = np.asarray(handler.apply_gaussian_blur(deep_image, 4)).astype(np.int32)
+    coarse_blur = np.asarray(handler.apply_gaussian_blur(to_8bit(deep_image), 4)).astype(np.int32) * 257
+    assert np.abs(deep_blur - coarse_blur).max() <= 2 * 257, "I;16 블러 결과가 다릅니다."
+
+    # 5. 10 MP 이미지의 반지름 20 가우시안 블러 시간 (상자 블러 3번이라 반지름과 관계없이 일정합니다)
+    large_image = spatial_image.resize((3872, 2592))
+    for radius in (2, 20, 100):
+        blur_start = time.perf_counter()
+        handler.apply_gaussian_blur(large_image, radius)
+        print(f"10 MP 가우시안 블러 (반지름 {radius:>3}): {(time.perf_counter() - blur_start) * 1000:.1f} ms "
+              f"({handler.num_threads} 스레드)")
+
+    print("\n--- 단계별 측정(instrumentation) 테스트 ---")
+    # 한 장을 불러와 필터를 적용하고 저장하면 decode/marshal/kernel/rebuild/encode 단계가 모두 기록되어야 합니다.
+    instrumentation.reset()
+    metrics_image = handler.load_image(input_image_path)
+    handler.save_image(handler.apply_pipeline(metrics_image, Pipeline().grayscale().brightness(10)),
+                       os.path.join(stream_dir, 'metrics.png'))
+    metrics = instrumentation.snapshot()
+    for stage in ('decode', 'marshal', 'kernel', 'rebuild', 'encode'):
+        assert metrics['spans'][stage]['count'] == 1, f"'{stage}' 단계가 기록되지 않았습니다."
+        print(f"{stage:<8} {metrics['spans'][stage]['total_s'] * 1000:8.2f} ms")
+    assert metrics['counters']['pixels'] == metrics_image.width * metrics_image.height
+    assert metrics['counters']['bytes.marshal'] == metrics_image.width * metrics_image.height * 3
+    print(f"카운터: {metrics['counters']}")
+    # 측정을 끄면 아무것도 기록되지 않아야 합니다.
+    instrumentation.set_enabled(False)
+    instrumentation.reset()
+    handler.apply_pipeline(metrics_image, Pipeline().invert())
+    assert instrumentation.snapshot()['spans'] == {} and instrumentation.snapshot()['counters'] == {}
+    instrumentation.set_enabled(True)
+    print("측정을 끄면 기록되지 않음")
     print("--- src/image_handler.py 모듈 자체 테스트 완료 ---\n")
\ No newline at end of file
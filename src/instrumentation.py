@@ -0,0 +1,153 @@
+import json
+import logging      # <--- print() 대신 로그 수준(DEBUG, INFO, ...)으로 켜고 끌 수 있는 메시지 출력에 사용합니다.
+import os
+import threading
+import time
+
+# 측정(instrumentation) 모듈입니다.
+# ImageHandler의 각 단계(decode, marshal, kernel, rebuild, encode)에 걸린 시간과
+# 처리한 픽셀/바이트 수, 호출 횟수를 모아 두었다가 snapshot()으로 한 번에 꺼내 볼 수 있습니다.
+#
+# 사용 예:
+#     with instrumentation.span('kernel'):
+#         ... C 필터 호출 ...
+#     instrumentation.count('pixels', width * height)
+#     print(instrumentation.snapshot())
+#
+# 환경 변수 IMAGE_APP_METRICS=0 으로 실행하거나 set_enabled(False)를 호출하면 측정을 끕니다.
+# 꺼져 있을 때 span()은 아무 일도 하지 않는 공용 객체를 돌려주고 count()는 바로 반환하므로 비용이 거의 없습니다.
+
+logger = logging.getLogger(__name__)
+
+# 지연 시간 히스토그램의 칸: 2의 거듭제곱 마이크로초 (1us, 2us, 4us, ... 약 8.6초 이상은 마지막 칸)
+_HISTOGRAM_BUCKETS = 24
+
+_enabled = os.environ.get('IMAGE_APP_METRICS', '1') != '0'
+_lock = threading.Lock()
+_spans = {}      # 단계 이름 → [호출 수, 총 시간, 최소, 최대, 히스토그램 칸 목록]
+_counters = {}   # 카운터 이름 → 누적 값
+_dump_thread = None
+_dump_stop = threading.Event()
+
+
+def set_enabled(enabled):
+    global _enabled
+    _enabled = bool(enabled)
+
+
+def is_enabled():
+    return _enabled
+
+
+def _record(name, elapsed):
+    micros = int(elapsed * 1e6)
+    bucket = min(micros.bit_length(), _HISTOGRAM_BUCKETS - 1)
+    with _lock:
+        stats = _spans.get(name)
+        if stats is None:
+            stats = _spans[name] = [0, 0.0, elapsed, elapsed, [0] * _HISTOGRAM_BUCKETS]
+        stats[0] += 1
+        stats[1] += elapsed
+        if elapsed < stats[2]:
+            stats[2] = elapsed
+        if elapsed > stats[3]:
+            stats[3] = elapsed
+        stats[4][bucket] += 1
+
+
+class _Span:
+    # 'with' 블록에 들어갈 때와 나올 때의 시간 차이를 기록합니다.
+    __slots__ = ('name', 'start')
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NoopSpan:
+    # 측정이 꺼져 있을 때 사용하는, 아무 일도 하지 않는 span입니다. (하나만 만들어 두고 재사용)
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name):
+    # 'with span("kernel"):' 형태로 사용해서 블록 실행 시간을 name 단계에 기록합니다.
+    if not _enabled:
+        return _NOOP_SPAN
+    return _Span(name)
+
+
+def count(name, value=1):
+    # name 카운터에 value를 더합니다. (예: count('pixels', width * height))
+    if not _enabled:
+        return
+    with _lock:
+        _counters[name] = _counters.get(name, 0) + value
+
+
+def record(name, elapsed):
+    # 이미 잰 시간(elapsed초)을 name 단계에 기록합니다. (다른 프로세스에서 잰 시간처럼 'with span()'으로 감쌀 수 없을 때)
+    if not _enabled:
+        return
+    _record(name, elapsed)
+
+
+def snapshot():
+    # 지금까지 모은 측정값을 딕셔너리로 돌려줍니다.
+    # spans의 histogram_us는 '이 시간(us) 미만' → 횟수 형태이며, 값이 0인 칸은 생략합니다.
+    with _lock:
+        spans = {}
+        for name, (calls, total, minimum, maximum, buckets) in _spans.items():
+            spans[name] = {
+                'count': calls,
+                'total_s': total,
+                'mean_s': total / calls,
+                'min_s': minimum,
+                'max_s': maximum,
+                'histogram_us': {f"<{1 << i}": n for i, n in enumerate(buckets) if n},
+            }
+        return {'enabled': _enabled, 'spans': spans, 'counters': dict(_counters)}
+
+
+def reset():
+    with _lock:
+        _spans.clear()
+        _counters.clear()
+
+
+def start_periodic_dump(interval_s=60.0, level=logging.INFO):
+    # interval_s초마다 snapshot()을 JSON으로 로그에 남기는 백그라운드 스레드를 시작합니다.
+    global _dump_thread
+    if _dump_thread is not None and _dump_thread.is_alive():
+        return
+    _dump_stop.clear()
+
+    def dump_loop():
+        while not _dump_stop.wait(interval_s):
+            logger.log(level, "metrics %s", json.dumps(snapshot(), ensure_ascii=False))
+
+    _dump_thread = threading.Thread(target=dump_loop, name='metrics-dump', daemon=True)
+    _dump_thread.start()
+
+
+def stop_periodic_dump():
+    global _dump_thread
+    _dump_stop.set()
+    if _dump_thread is not None:
+        _dump_thread.join()
+        _dump_thread = None
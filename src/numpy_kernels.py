@@ -0,0 +1,202 @@
+import numpy as np
+
+# C 라이브러리(c_filters.so)를 불러올 수도, 새로 빌드할 수도 없을 때(C 컴파일러가 없는 환경 등) 사용하는
+# NumPy 구현입니다. src/c_interface.py의 get_kernels()가 C 라이브러리 대신 이 모듈을 돌려줍니다.
+#
+# 함수 이름과 인자는 c_filters.c의 함수들과 똑같으므로, ImageHandler는 어느 쪽이든 같은 방식으로 호출합니다.
+# 계산 방식(정수 평균 흑백, 클리핑, 테이블 찾기)도 C 코드와 같아서 결과는 비트 단위로 동일합니다.
+# pixels와 luts에는 ctypes 배열처럼 버퍼 프로토콜을 지원하는 쓰기 가능한 객체를 넘깁니다.
+
+
+def _rows_view(pixels, width, start_row, end_row, stride):
+    # pixels 버퍼에서 [start_row, end_row) 행을 (행, 너비, 3) 모양의 NumPy 배열로 봅니다. (복사 없음)
+    flat = np.frombuffer(pixels, dtype=np.uint8)
+    rows = max(0, end_row - start_row)
+    return np.lib.stride_tricks.as_strided(flat[start_row * stride:], shape=(rows, width, 3),
+                                           strides=(stride, 3, 1))
+
+
+def _stage_luts(luts, num_stages):
+    return np.frombuffer(luts, dtype=np.uint8, count=768 * num_stages).reshape(num_stages, 3, 256)
+
+
+def apply_grayscale_rows_c(pixels, width, start_row, end_row, stride):
+    px = _rows_view(pixels, width, start_row, end_row, stride)
+    gray = (px.sum(axis=2, dtype=np.uint16) // 3).astype(np.uint8)
+    px[...] = gray[..., None]
+
+
+def apply_brightness_rows_c(pixels, width, start_row, end_row, stride, brightness_factor):
+    px = _rows_view(pixels, width, start_row, end_row, stride)
+    # int16으로 계산하므로 밝기 값을 먼저 ±255로 줄여 둡니다. (그 이상은 클리핑 결과가 같습니다)
+    brightness_factor = max(-255, min(255, int(brightness_factor)))
+    np.clip(px.astype(np.int16) + brightness_factor, 0, 255, out=px, casting='unsafe')
+
+
+def apply_point_pipeline_rows_c(pixels, width, start_row, end_row, stride, luts, num_stages):
+    px = _rows_view(pixels, width, start_row, end_row, stride)
+    stages = _stage_luts(luts, num_stages)
+    r = stages[0, 0][px[..., 0]]
+    g = stages[0, 1][px[..., 1]]
+    b = stages[0, 2][px[..., 2]]
+    for stage in stages[1:]:
+        # 단계 경계: C 코드와 같은 방식(정수 평균)으로 흑백 값을 만든 뒤 다음 단계의 테이블을 적용합니다.
+        gray = (r.astype(np.uint16) + g + b) // 3
+        r, g, b = stage[0][gray], stage[1][gray], stage[2][gray]
+    px[..., 0] = r
+    px[..., 1] = g
+    px[..., 2] = b
+
+
+def apply_lut_rows_c(pixels, width, start_row, end_row, stride, luts):
+    px = _rows_view(pixels, width, start_row, end_row, stride)
+    lut_r, lut_g, lut_b = _stage_luts(luts, 1)[0]
+    px[..., 0] = lut_r[px[..., 0]]
+    px[..., 1] = lut_g[px[..., 1]]
+    px[..., 2] = lut_b[px[..., 2]]
+
+
+def _format_view(pixels, width, start_row, end_row, stride, channels, bits_per_sample):
+    # 채널 수와 비트 깊이를 반영해서 [start_row, end_row) 행을 (행, 너비, 채널) 배열로 봅니다. (복사 없음)
+    dtype = np.uint16 if bits_per_sample == 16 else np.uint8
+    flat = np.frombuffer(pixels, dtype=np.uint8)
+    rows = max(0, end_row - start_row)
+    return np.lib.stride_tricks.as_strided(flat[start_row * stride:].view(dtype), shape=(rows, width, channels),
+                                           strides=(stride, channels * dtype().itemsize, dtype().itemsize))
+
+
+def apply_grayscale_format_rows_c(pixels, width, start_row, end_row, stride, channels, color_channels, bits_per_sample):
+    if color_channels != 3:
+        return
+    px = _format_view(pixels, width, start_row, end_row, stride, channels, bits_per_sample)
+    gray = (px[..., :3].sum(axis=2, dtype=np.uint32) // 3).astype(px.dtype)
+    px[..., :3] = gray[..., None]
+
+
+def apply_point_pipeline_format_rows_c(pixels, width, start_row, end_row, stride, channels, color_channels,
+                                       bits_per_sample, luts, num_stages):
+    px = _format_view(pixels, width, start_row, end_row, stride, channels, bits_per_sample)
+    lut_size = 65536 if bits_per_sample == 16 else 256
+    stages = np.frombuffer(luts, dtype=px.dtype, count=3 * lut_size * num_stages).reshape(num_stages, 3, lut_size)
+    if color_channels == 1:
+        value = stages[0, 0][px[..., 0]]
+        for stage in stages[1:]:
+            value = stage[0][value]
+        px[..., 0] = value
+        return
+    r = stages[0, 0][px[..., 0]]
+    g = stages[0, 1][px[..., 1]]
+    b = stages[0, 2][px[..., 2]]
+    for stage in stages[1:]:
+        gray = (r.astype(np.uint32) + g + b) // 3
+        r, g, b = stage[0][gray], stage[1][gray], stage[2][gray]
+    px[..., 0] = r
+    px[..., 1] = g
+    px[..., 2] = b
+
+
+
+# --- 공간(spatial) 필터 ---
+# C 코드와 같은 정수 계산(가중치 합 1 << 14, 반올림 후 시프트, 가장자리 값 반복)을 int64 배열로 합니다.
+CONV_SHIFT = 14
+
+
+def _convolve_axis(padded, weights, axis, length):
+    # padded를 axis 방향으로 weights와 합성곱합니다. (padded는 앞뒤로 반지름만큼 늘린 배열)
+    acc = np.full(padded.shape[:axis] + (length,) + padded.shape[axis + 1:], 1 << (CONV_SHIFT - 1), dtype=np.int64)
+    for k, weight in enumerate(weights):
+        acc += int(weight) * padded.take(np.arange(k, k + length), axis=axis).astype(np.int64)
+    return acc >> CONV_SHIFT
+
+
+def _box_axis(padded, radius, axis, length):
+    # 앞뒤로 radius만큼 늘린 배열에서 폭 2r+1 창의 합을 누적 합(cumsum)으로 구하고 반올림해서 나눕니다.
+    n = 2 * radius + 1
+    cumulative = np.cumsum(padded, axis=axis, dtype=np.int64)
+    zero = np.zeros_like(cumulative.take([0], axis=axis))
+    cumulative = np.concatenate([zero, cumulative], axis=axis)
+    sums = cumulative.take(np.arange(n, n + length), axis=axis) - cumulative.take(np.arange(0, length), axis=axis)
+    return (sums + n // 2) // n
+
+
+def _edge_rows(src, start_row, end_row, radius, height):
+    # [start_row - radius, end_row + radius) 행을 가장자리 행을 반복해서 가져옵니다.
+    return src[np.clip(np.arange(start_row - radius, end_row + radius), 0, height - 1)]
+
+
+def apply_convolve_h_rows_c(src, width, start_row, end_row, stride, dst, channels, bits_per_sample, weights, radius):
+    px = _format_view(src, width, start_row, end_row, stride, channels, bits_per_sample)
+    out = _format_view(dst, width, start_row, end_row, stride, channels, bits_per_sample)
+    weights = np.frombuffer(weights, dtype=np.intc, count=2 * radius + 1)
+    padded = np.pad(px, ((0, 0), (radius, radius), (0, 0)), mode='edge')
+    out[...] = _convolve_axis(padded, weights, 1, width)
+    return 0
+
+
+def apply_convolve_v_rows_c(src, width, start_row, end_row, stride, dst, height, channels, bits_per_sample,
+                            weights, radius):
+    px = _format_view(src, width, 0, height, stride, channels, bits_per_sample)
+    out = _format_view(dst, width, start_row, end_row, stride, channels, bits_per_sample)
+    weights = np.frombuffer(weights, dtype=np.intc, count=2 * radius + 1)
+    out[...] = _convolve_axis(_edge_rows(px, start_row, end_row, radius, height), weights, 0, out.shape[0])
+
+
+def apply_box_blur_h_rows_c(src, width, start_row, end_row, stride, dst, channels, bits_per_sample, radii, num_passes):
+    px = _format_view(src, width, start_row, end_row, stride, channels, bits_per_sample)
+    out = _format_view(dst, width, start_row, end_row, stride, channels, bits_per_sample)
+    line = px.astype(np.int64)
+    for radius in np.frombuffer(radii, dtype=np.intc, count=num_passes):
+        radius = int(radius)
+        line = _box_axis(np.pad(line, ((0, 0), (radius, radius), (0, 0)), mode='edge'), radius, 1, width)
+    out[...] = line
+    return 0
+
+
+def apply_box_blur_v_rows_c(src, width, start_row, end_row, stride, dst, height, channels, bits_per_sample, radius):
+    px = _format_view(src, width, 0, height, stride, channels, bits_per_sample)
+    out = _format_view(dst, width, start_row, end_row, stride, channels, bits_per_sample)
+    out[...] = _box_axis(_edge_rows(px, start_row, end_row, radius, height), radius, 0, out.shape[0])
+
+
+def apply_unsharp_rows_c(pixels, width, start_row, end_row, stride, blurred, channels, color_channels,
+                         bits_per_sample, percent, threshold):
+    px = _format_view(pixels, width, start_row, end_row, stride, channels, bits_per_sample)[..., :color_channels]
+    blur = _format_view(blurred, width, start_row, end_row, stride, channels, bits_per_sample)[..., :color_channels]
+    original = px.astype(np.int64)
+    diff = original - blur
+    scaled = diff * percent
+    # C의 정수 나눗셈처럼 0 쪽으로 버립니다. (음수일 때 NumPy의 //와 다릅니다)
+    sharpened = original + np.sign(scaled) * (np.abs(scaled) // 100)
+    max_value = 65535 if bits_per_sample == 16 else 255
+    px[...] = np.where(np.abs(diff) >= threshold, np.clip(sharpened, 0, max_value), original)
+
+
+def apply_sobel_rows_c(src, width, start_row, end_row, stride, dst, height, channels, color_channels,
+                       bits_per_sample):
+    px = _format_view(src, width, 0, height, stride, channels, bits_per_sample)
+    out = _format_view(dst, width, start_row, end_row, stride, channels, bits_per_sample)
+    rows = out.shape[0]
+    color = _edge_rows(px[..., :color_channels], start_row, end_row, 1, height).astype(np.int64)
+    padded = np.pad(color, ((0, 0), (1, 1), (0, 0)), mode='edge')
+
+    def at(dy, dx):
+        return padded[1 + dy:1 + dy + rows, 1 + dx:1 + dx + width]
+
+    gx = (at(-1, 1) + 2 * at(0, 1) + at(1, 1)) - (at(-1, -1) + 2 * at(0, -1) + at(1, -1))
+    gy = (at(1, -1) + 2 * at(1, 0) + at(1, 1)) - (at(-1, -1) + 2 * at(-1, 0) + at(-1, 1))
+    max_value = 65535 if bits_per_sample == 16 else 255
+    out[..., :color_channels] = np.minimum(np.abs(gx) + np.abs(gy), max_value)
+    out[..., color_channels:] = px[start_row:end_row, :, color_channels:]
+
+
+# 이미지 전체를 처리하는 함수들 (c_filters.c의 apply_grayscale_c, apply_brightness_c, apply_lut_c와 같은 형태)
+def apply_grayscale_c(pixels, width, height):
+    apply_grayscale_rows_c(pixels, width, 0, height, width * 3)
+
+
+def apply_brightness_c(pixels, width, height, brightness_factor):
+    apply_brightness_rows_c(pixels, width, 0, height, width * 3, brightness_factor)
+
+
+def apply_lut_c(pixels, width, height, luts):
+    apply_lut_rows_c(pixels, width, 0, height, width * 3, luts)
@@ -0,0 +1,241 @@
+import ctypes       # <--- 합쳐진 룩업 테이블(LUT)을 C 함수에 넘길 바이트 배열을 만들 때 사용합니다.
+import functools    # <--- 같은 필터 목록을 다시 컴파일하지 않도록 결과를 기억(lru_cache)해 두기 위해 사용합니다.
+
+from src import lut
+from src import spatial
+
+# 점 연산 이름 → 룩업 테이블을 만드는 함수 (src/lut.py)
+# 여기에 있는 연산들은 모두 테이블 합성으로 하나로 합쳐질 수 있습니다.
+POINT_OPS = {
+    'brightness': lut.brightness_lut,
+    'contrast': lut.contrast_lut,
+    'gamma': lut.gamma_lut,
+    'levels': lut.levels_lut,
+    'invert': lut.invert_lut,
+    'threshold': lut.threshold_lut,
+}
+
+# 공간(spatial) 연산: 주변 픽셀을 섞으므로 룩업 테이블로 합칠 수 없고, 앞뒤의 점 연산과 따로 실행됩니다.
+# (src/spatial.py에서 계획을 만들고, c_filters.c의 합성곱/상자 블러/소벨 함수가 계산합니다)
+SPATIAL_OPS = ('gaussian_blur', 'box_blur', 'unsharp_mask', 'sobel')
+
+# 결과에 영향이 없는 연산들입니다. (결과 캐시 키에서 뺍니다)
+_NO_OP_OPS = (('brightness', 0), ('gaussian_blur', 0), ('box_blur', 0))
+
+# 필터 문자열('gamma=2.2', 'levels=10:240' 등)의 값 부분을 해석하는 방법입니다. (값이 여러 개면 ':'로 구분)
+_SPEC_ARG_TYPES = {
+    'grayscale': (),
+    'brightness': (int,),
+    'contrast': (float,),
+    'gamma': (float,),
+    'levels': (int, int, float),
+    'invert': (),
+    'threshold': (int,),
+    'gaussian_blur': (float,),
+    'box_blur': (int,),
+    'unsharp_mask': (float, int, int),
+    'sobel': (),
+}
+# 뒤쪽 값을 생략할 수 있는 필터의 최소 값 개수입니다. (생략한 값은 기본값 사용)
+_SPEC_MIN_ARGS = {
+    'levels': 2,
+    'unsharp_mask': 0,
+}
+_SPEC_EXAMPLES = ("grayscale, brightness=N, contrast=F, gamma=F, levels=B:W[:G], invert, threshold=N, "
+                  "gaussian_blur=R, box_blur=N, unsharp_mask[=R[:P[:T]]], sobel")
+
+
+def _check_op(op):
+    # 필터 값이 올바른지 미리 확인합니다. 룩업 테이블이나 블러 계획을 실제로 만들어 보고, 잘못된 값이면 ValueError가 발생합니다.
+    # (gamma=0, levels=300:400, gaussian_blur=5000 등을 필터를 적용하기 전, 명령줄을 해석할 때 알려 주기 위해 사용합니다)
+    name, args = op[0], op[1:]
+    if name in POINT_OPS:
+        POINT_OPS[name](*args)
+    elif name in ('gaussian_blur', 'unsharp_mask'):
+        spatial.blur_plan(args[0])
+    elif name == 'box_blur':
+        spatial.box_plan(args[0])
+
+
+# Pipeline 클래스: 여러 필터를 순서대로 쌓아 두었다가, C에서 한 번의 순회로 모두 적용할 수 있도록 정리해 줍니다.
+# 사용 예:
+#     pipeline = Pipeline().grayscale().brightness(40)
+#     result = image_handler.apply_pipeline(image, pipeline)
+# 필터를 몇 개 쌓든 이미지 픽셀은 딱 한 번만 읽고 씁니다.
+class Pipeline:
+    def __init__(self, ops=None):
+        # ops: ('grayscale',) 또는 ('brightness', 40) 같은 튜플들의 목록입니다. 적힌 순서대로 적용됩니다.
+        self.ops = list(ops) if ops else []
+
+    # --- 필터를 추가하는 메서드들 ---
+    # 모두 self를 돌려주므로 Pipeline().grayscale().brightness(40) 처럼 이어서 쓸 수 있습니다.
+    def grayscale(self):
+        self.ops.append(('grayscale',))
+        return self
+
+    def brightness(self, brightness_factor):
+        self.ops.append(('brightness', int(brightness_factor)))
+        return self
+
+    def contrast(self, contrast_factor):
+        self.ops.append(('contrast', float(contrast_factor)))
+        return self
+
+    def gamma(self, gamma):
+        self.ops.append(('gamma', float(gamma)))
+        return self
+
+    def levels(self, black_point, white_point, gamma=1.0):
+        self.ops.append(('levels', int(black_point), int(white_point), float(gamma)))
+        return self
+
+    def invert(self):
+        self.ops.append(('invert',))
+        return self
+
+    def threshold(self, threshold):
+        self.ops.append(('threshold', int(threshold)))
+        return self
+
+    def gaussian_blur(self, radius):
+        # radius는 Pillow의 GaussianBlur와 같은 의미(표준편차, 픽셀 단위)입니다.
+        self.ops.append(('gaussian_blur', float(radius)))
+        return self
+
+    def box_blur(self, radius):
+        # 가로, 세로 각각 (2 * radius + 1)픽셀 평균입니다.
+        self.ops.append(('box_blur', int(radius)))
+        return self
+
+    def unsharp_mask(self, radius=2.0, percent=150, threshold=3):
+        # 가우시안 블러(radius)와의 차이를 percent%만큼 더합니다. 차이가 threshold보다 작은 값은 그대로 둡니다.
+        # 기본값은 Pillow의 ImageFilter.UnsharpMask와 같습니다.
+        self.ops.append(('unsharp_mask', float(radius), int(percent), int(threshold)))
+        return self
+
+    def sobel(self):
+        # 소벨 에지 검출: 밝기가 급하게 바뀌는 곳(윤곽)이 밝게, 평평한 곳은 검게 됩니다.
+        self.ops.append(('sobel',))
+        return self
+
+    @classmethod
+    def from_spec(cls, spec):
+        # 'grayscale,brightness=40' 같은 필터 문자열로 Pipeline을 만듭니다. (배치 처리 명령줄 등에서 사용)
+        pipeline = cls()
+        for item in spec.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            name, _, value = item.partition('=')
+            name = name.strip().lower()
+            if name not in _SPEC_ARG_TYPES:
+                raise ValueError(f"알 수 없는 필터입니다: '{name}' (사용 가능: {_SPEC_EXAMPLES})")
+            arg_types = _SPEC_ARG_TYPES[name]
+            values = value.split(':') if value else []
+            # levels의 감마처럼 마지막 값은 생략할 수 있는 경우가 있습니다. (기본값 사용)
+            min_args = _SPEC_MIN_ARGS.get(name, len(arg_types))
+            if not min_args <= len(values) <= len(arg_types):
+                raise ValueError(f"'{name}' 필터에 필요한 값의 개수가 맞지 않습니다. (사용 가능: {_SPEC_EXAMPLES})")
+            try:
+                args = [arg_type(v) for arg_type, v in zip(arg_types, values)]
+            except ValueError:
+                raise ValueError(f"'{name}' 필터의 값을 해석할 수 없습니다: '{value}' (사용 가능: {_SPEC_EXAMPLES})")
+            getattr(pipeline, name)(*args)
+            _check_op(pipeline.ops[-1])
+        if not pipeline.ops:
+            raise ValueError("적용할 필터가 하나 이상 필요합니다.")
+        return pipeline
+
+    def to_spec(self):
+        # from_spec()으로 다시 읽을 수 있는 필터 문자열입니다. (예: 'grayscale,brightness=40') 필터 서버 요청 등에 사용합니다.
+        return ','.join(op[0] + ('=' + ':'.join(repr(arg) for arg in op[1:]) if len(op) > 1 else '')
+                        for op in self.ops)
+
+    def __len__(self):
+        return len(self.ops)
+
+    def cache_key(self):
+        # 결과 캐시(src/result_cache.py)에서 사용할, 필터 목록을 정리한 변경 불가능한(hashable) 값입니다.
+        # 결과에 영향이 없는 밝기 0 같은 연산은 빼서, 같은 결과를 내는 파이프라인이 같은 키를 갖도록 합니다.
+        return tuple(op for op in self.ops if op not in _NO_OP_OPS)
+
+    def __repr__(self):
+        return f"Pipeline({self.ops!r})"
+
+    def scaled(self, scale):
+        # 블러/언샤프 마스크 반지름에 scale을 곱한 새 Pipeline입니다. 점 연산은 그대로입니다.
+        # 원본 해상도 기준으로 기록한 필터를 축소 이미지(미리보기 등)에 같은 정도로 적용할 때 사용합니다.
+        if scale == 1:
+            return Pipeline(self.ops)
+        ops = []
+        for op in self.ops:
+            if op[0] == 'gaussian_blur':
+                op = ('gaussian_blur', op[1] * scale)
+            elif op[0] == 'box_blur':
+                op = ('box_blur', int(round(op[1] * scale)))
+            elif op[0] == 'unsharp_mask':
+                op = ('unsharp_mask', op[1] * scale) + op[2:]
+            ops.append(op)
+        return Pipeline(ops)
+
+    def has_spatial_ops(self):
+        return any(op[0] in SPATIAL_OPS for op in self.ops)
+
+    def segments(self):
+        # 필터 목록을 실행 순서대로 '한 번의 순회로 합칠 수 있는 점 연산 Pipeline'과 '공간 연산 튜플'로 나눕니다.
+        # 예: grayscale, brightness=40, gaussian_blur=3, invert
+        #     → [Pipeline([grayscale, brightness 40]), ('gaussian_blur', 3.0), Pipeline([invert])]
+        segments, point_ops = [], []
+        for op in self.ops:
+            if op[0] in SPATIAL_OPS:
+                if point_ops:
+                    segments.append(Pipeline(point_ops))
+                    point_ops = []
+                segments.append(op)
+            else:
+                point_ops.append(op)
+        if point_ops:
+            segments.append(Pipeline(point_ops))
+        return segments
+
+    def compile(self, bits_per_sample=8):
+        # 필터 목록을 C 함수 apply_point_pipeline_rows_c가 사용할 단계(stage) 테이블로 정리합니다.
+        # 반환값: (ctypes 배열, 단계 개수)
+        # bits_per_sample=16이면 16비트 이미지용 65536칸 테이블(unsigned short 배열)을 만듭니다.
+        # 테이블 계산은 파이썬에서 이루어지므로 작은 이미지에서는 C 필터보다 오래 걸릴 수 있습니다.
+        # 그래서 같은 필터 목록의 결과는 기억해 두고 재사용합니다. (C 함수는 테이블을 읽기만 합니다)
+        # 공간 연산은 테이블로 만들 수 없으므로, 공간 연산이 있으면 segments()로 나눈 점 연산 부분만 컴파일하세요.
+        if self.has_spatial_ops():
+            raise ValueError(f"공간 필터가 있는 파이프라인은 하나의 테이블로 컴파일할 수 없습니다: {self!r}")
+        if bits_per_sample == 16:
+            return _compile_ops_16(tuple(self.ops))
+        return _compile_ops(tuple(self.ops))
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_ops(ops):
+    return _build_stage_luts(ops, lut.MAX_VALUE_8, ctypes.c_ubyte)
+
+
+# 16비트 테이블은 단계 하나가 384KB나 되므로 적은 수만 기억해 둡니다.
+@functools.lru_cache(maxsize=16)
+def _compile_ops_16(ops):
+    return _build_stage_luts(ops, lut.MAX_VALUE_16, ctypes.c_ushort)
+
+
+def _build_stage_luts(ops, max_value, c_type):
+    # - 이어지는 점 연산(밝기 등)은 테이블 합성으로 하나의 테이블이 됩니다. (new[i] = op[current[i]])
+    # - 흑백 변환은 새 단계를 시작합니다. 다음 단계의 테이블은 흑백 값에 적용됩니다.
+    # - 파이프라인의 점 연산은 세 채널에 똑같이 적용되므로, 단계마다 테이블 하나를 만들어 R, G, B 칸에 함께 씁니다.
+    identity = lut.identity_lut(max_value)
+    stages = [identity]
+    for op in ops:
+        if op[0] == 'grayscale':
+            stages.append(identity)
+        elif op[0] in POINT_OPS:
+            op_lut = POINT_OPS[op[0]](*op[1:], max_value=max_value)
+            stages[-1] = op_lut if stages[-1] is identity else lut.compose_luts(stages[-1], op_lut)
+        else:
+            raise ValueError(f"알 수 없는 필터입니다: {op!r}")
+
+    return lut.to_c_array(c_type, *(stage for stage in stages for _ in range(3))), len(stages)
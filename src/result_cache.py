@@ -0,0 +1,215 @@
+import hashlib      # <--- 원본 픽셀 내용으로 '지문(해시)'을 만들 때 사용합니다.
+import logging
+import os
+import struct       # <--- 디스크 캐시 파일 머리말(모드, 너비, 높이)을 바이트로 쓰고 읽을 때 사용합니다.
+import tempfile
+import threading    # <--- GUI의 미리보기 작업자 스레드와 메인 스레드가 캐시를 함께 쓰므로 잠금(lock)이 필요합니다.
+from collections import OrderedDict   # <--- 사용 순서를 기억하는 딕셔너리. LRU(가장 오래 안 쓴 것부터 버리기)에 사용합니다.
+
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# 디스크 캐시 파일 머리말: 모드 이름(8바이트), 너비, 높이 (리틀 엔디언 unsigned int)
+_DISK_HEADER = struct.Struct('<8sII')
+
+# 디스크 캐시의 기본 최대 크기(바이트)입니다. 넘으면 가장 오래 사용하지 않은 파일부터 지웁니다.
+DEFAULT_DISK_CACHE_BYTES = 1024 * 1024 * 1024
+
+
+def iter_raw_chunks(image_obj):
+    # image_obj의 픽셀을 모드 그대로의 배치로 Pillow의 raw 인코더가 만들어 주는 작은 조각(chunk)들로 차례로 돌려줍니다.
+    # tobytes()처럼 전체 프레임 크기의 bytes를 만들지 않고 픽셀을 읽을 수 있습니다.
+    if not image_obj.width or not image_obj.height:
+        return
+    image_obj.load()
+    encoder = Image._getencoder(image_obj.mode, 'raw', image_obj.mode)
+    encoder.setimage(image_obj.im, (0, 0) + image_obj.size)
+    while True:
+        _, errcode, chunk = encoder.encode(max(65536, image_obj.width * 4))
+        yield chunk
+        if errcode:
+            break
+    if errcode < 0:
+        raise RuntimeError(f"픽셀 데이터 준비 실패 (encoder error {errcode})")
+
+
+def image_fingerprint(image_obj):
+    # 이미지의 모드, 크기, 픽셀 내용으로 만든 해시 문자열입니다. 내용이 같으면 다른 객체여도 같은 값이 나옵니다.
+    # Pillow 이미지는 paste(), putpixel() 등으로 제자리에서 바뀔 수 있으므로, 객체별로 기억해 두지 않고 호출할 때마다 내용을 다시 해시합니다.
+    # (해시 속도는 C 필터 한 번의 순회와 비슷하며, 조각 단위로 읽으므로 전체 프레임 복사본을 만들지 않습니다)
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{image_obj.mode}:{image_obj.width}x{image_obj.height}:".encode())
+    for chunk in iter_raw_chunks(image_obj):
+        digest.update(chunk)
+    return digest.hexdigest()
+
+
+def image_nbytes(image_obj):
+    # 캐시 용량 계산에 쓰는 이미지 크기(바이트)입니다. (편집 기록의 체크포인트 예산 계산에도 사용합니다)
+    bytes_per_sample = 2 if image_obj.mode.startswith('I;16') else 1
+    return image_obj.width * image_obj.height * len(image_obj.getbands()) * bytes_per_sample
+
+
+# ResultCache 클래스: 필터 결과 이미지를 (원본 지문, 필터 목록) 키로 기억해 두는 캐시입니다.
+# - 메모리 캐시: 전체 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 결과부터 버립니다. (LRU)
+# - 디스크 캐시(선택): disk_dir을 주면 결과를 파일로도 저장해서, 배치 작업을 다시 실행할 때 재사용합니다.
+#   폴더 전체 크기가 max_disk_bytes를 넘으면 가장 오래 사용하지 않은(수정 시각이 오래된) 파일부터 지웁니다.
+# 캐시에서 꺼낸 이미지는 다른 호출과 공유될 수 있으므로 직접 수정하지 말고, 필요하면 copy()해서 사용하세요.
+class ResultCache:
+    def __init__(self, max_bytes, disk_dir=None, max_disk_bytes=DEFAULT_DISK_CACHE_BYTES):
+        self.max_bytes = max(0, int(max_bytes))
+        self.disk_dir = disk_dir
+        self.max_disk_bytes = max(0, int(max_disk_bytes))
+        self.current_bytes = 0
+        self._entries = OrderedDict()   # 키 → 결과 이미지 (앞쪽일수록 오래전에 사용됨)
+        self._lock = threading.Lock()
+        # 디스크 캐시 폴더의 크기(바이트)입니다. 여러 프로세스가 같은 폴더를 쓰므로, 한도를 넘었을 때 폴더를 다시 세어 정리합니다.
+        self._disk_lock = threading.Lock()
+        self.disk_bytes = 0
+        if disk_dir:
+            os.makedirs(disk_dir, exist_ok=True)
+            self.disk_bytes = sum(size for _, size, _ in self._disk_files())
+        # 통계 값들
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.disk_hits = 0
+        self.disk_writes = 0
+        self.disk_evictions = 0
+
+    def get(self, key):
+        # 캐시에 결과가 있으면 돌려주고, 없으면 None을 돌려줍니다. (메모리 → 디스크 순서로 찾습니다)
+        with self._lock:
+            image_obj = self._entries.get(key)
+            if image_obj is not None:
+                self._entries.move_to_end(key)   # 방금 사용했으므로 '가장 최근' 위치로 옮깁니다.
+                self.hits += 1
+                return image_obj
+        image_obj = self._read_disk(key)
+        with self._lock:
+            if image_obj is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._store_in_memory(key, image_obj)
+        return image_obj
+
+    def put(self, key, image_obj):
+        with self._lock:
+            self._store_in_memory(key, image_obj)
+        self._write_disk(key, image_obj)
+
+    def clear(self):
+        # 메모리 캐시만 비웁니다. (디스크 캐시 파일은 그대로 둡니다)
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        # 캐시 상태와 적중(hit)/실패(miss)/버림(eviction) 횟수를 딕셔너리로 돌려줍니다.
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self.current_bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'disk_hits': self.disk_hits,
+                'disk_writes': self.disk_writes,
+                'disk_bytes': self.disk_bytes,
+                'max_disk_bytes': self.max_disk_bytes,
+                'disk_evictions': self.disk_evictions,
+            }
+
+    def _store_in_memory(self, key, image_obj):
+        # self._lock을 잡은 상태에서 호출해야 합니다.
+        nbytes = image_nbytes(image_obj)
+        if nbytes > self.max_bytes:
+            return   # 캐시 전체보다 큰 결과는 메모리에 두지 않습니다.
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= image_nbytes(old)
+        self._entries[key] = image_obj
+        self.current_bytes += nbytes
+        while self.current_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)   # 가장 오래 사용하지 않은 결과부터 버립니다.
+            self.current_bytes -= image_nbytes(evicted)
+            self.evictions += 1
+
+    # --- 디스크 캐시 ---
+    # 파일 하나에 결과 하나를 저장합니다. 파일 이름은 키로 만든 해시이고, 내용은 머리말 + 원시 픽셀 바이트입니다.
+    def _disk_path(self, key):
+        name = hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()
+        return os.path.join(self.disk_dir, name + '.raw')
+
+    def _read_disk(self, key):
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(key)
+        try:
+            with open(path, 'rb') as f:
+                mode, width, height = _DISK_HEADER.unpack(f.read(_DISK_HEADER.size))
+                image_obj = Image.frombytes(mode.rstrip(b'\0').decode(), (width, height), f.read())
+            os.utime(path)   # 방금 사용했으므로 수정 시각을 갱신합니다. (디스크 캐시를 정리할 때 가장 나중에 지워짐)
+            return image_obj
+        except (OSError, ValueError, struct.error):
+            return None   # 파일이 없거나 손상되었다면 캐시에 없는 것으로 처리합니다.
+
+    def _write_disk(self, key, image_obj):
+        if not self.disk_dir:
+            return
+        path = self._disk_path(key)
+        nbytes = _DISK_HEADER.size + image_nbytes(image_obj)
+        if nbytes > self.max_disk_bytes or os.path.exists(path):
+            return   # 디스크 캐시 전체보다 큰 결과는 저장하지 않습니다.
+        # 여러 프로세스가 동시에 같은 파일을 쓰더라도 반쯤 쓰인 파일이 보이지 않도록,
+        # 임시 파일에 다 쓴 뒤 이름을 바꿉니다.
+        fd, temp_path = tempfile.mkstemp(dir=self.disk_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(_DISK_HEADER.pack(image_obj.mode.encode(), image_obj.width, image_obj.height))
+                for chunk in iter_raw_chunks(image_obj):
+                    f.write(chunk)
+            os.replace(temp_path, path)
+            with self._lock:
+                self.disk_writes += 1
+        except OSError as e:
+            logger.error("오류: ResultCache: 디스크 캐시 저장 실패 - %s", e)
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        with self._disk_lock:
+            self.disk_bytes += nbytes
+            if self.disk_bytes > self.max_disk_bytes:
+                self._trim_disk()
+
+    def _disk_files(self):
+        # 디스크 캐시 파일들의 (수정 시각, 크기, 경로) 목록입니다. (다른 프로세스가 쓰는 중인 .tmp 파일은 제외)
+        files = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith('.raw'):
+                try:
+                    stat = entry.stat()
+                except FileNotFoundError:
+                    continue   # 다른 프로세스가 방금 지운 파일입니다.
+                files.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return files
+
+    def _trim_disk(self):
+        # self._disk_lock을 잡은 상태에서 호출해야 합니다.
+        # 폴더를 다시 세고(다른 프로세스가 쓴 파일 포함), 한도 안에 들어올 때까지 오래된 파일부터 지웁니다.
+        files = sorted(self._disk_files())
+        total = sum(size for _, size, _ in files)
+        for _, size, path in files:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass   # 다른 프로세스가 먼저 지웠습니다.
+            total -= size
+            with self._lock:
+                self.disk_evictions += 1
+        self.disk_bytes = total
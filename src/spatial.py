@@ -0,0 +1,122 @@
+import ctypes       # <--- 가중치와 반지름 목록을 C 함수에 넘길 int 배열로 만들 때 사용합니다.
+import functools    # <--- 같은 반지름의 가중치를 다시 계산하지 않도록 결과를 기억(lru_cache)해 두기 위해 사용합니다.
+import math
+import os
+import sys
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 아래 자체 테스트에서 c_interface 모듈을 불러오기 위해 다른 모듈과 같은 방식으로 프로젝트 루트를 추가합니다.
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+# 공간(spatial) 필터의 '계획'을 만드는 모듈입니다.
+# 블러처럼 주변 픽셀을 섞는 필터는 C 함수(c_filters.c의 apply_convolve_*_rows_c, apply_box_blur_*_rows_c)가
+# 실제 계산을 하고, 이 모듈은 어떤 방식으로 몇 번 계산할지(가중치, 상자 반지름)만 정합니다.
+#
+# - 반지름이 작은 가우시안 블러는 가중치 2r+1개로 직접 합성곱합니다. (정확하고, 탭 수가 적어 충분히 빠름)
+# - 반지름이 큰 가우시안 블러는 상자 블러 3번으로 근사합니다. 상자 블러는 누적 합으로 계산하므로
+#   반지름이 20이든 200이든 픽셀마다 드는 시간이 같습니다. (직접 합성곱은 반지름에 비례해서 느려집니다)
+#
+# 반지름(radius)은 Pillow의 ImageFilter.GaussianBlur(radius)와 같은 의미(가우시안의 표준편차)입니다.
+# 그래서 같은 반지름 값이면 Pillow와 거의 같은 정도로 흐려집니다.
+
+# 가중치는 합이 1 << CONV_SHIFT인 정수입니다. (c_filters.c의 CONV_SHIFT와 같아야 합니다)
+CONV_SHIFT = 14
+# 표준편차가 이 값보다 작으면 직접 합성곱, 이상이면 상자 블러 3번을 사용합니다.
+DIRECT_CONVOLVE_MAX_RADIUS = 2.0
+# 가우시안을 근사할 때 반복하는 상자 블러 횟수입니다. (3번이면 가우시안과의 차이가 눈에 띄지 않습니다)
+BOX_PASSES = 3
+# 블러 반지름의 상한입니다. C의 상자 블러 나눗셈은 창 크기(2r+1)가 65536보다 작을 때만 정확합니다.
+MAX_RADIUS = 2000
+
+
+def _check_radius(radius):
+    if not 0 <= radius <= MAX_RADIUS:
+        raise ValueError(f"블러 반지름은 0 이상 {MAX_RADIUS} 이하여야 합니다. (입력값: {radius})")
+
+
+@functools.lru_cache(maxsize=64)
+def gaussian_weights(radius):
+    # 표준편차 radius인 가우시안의 정수 가중치 (2r+1개, r = ceil(3 * radius))를 튜플로 돌려줍니다.
+    # 반올림으로 생긴 합의 오차는 가운데 가중치에 더해서, 합이 정확히 1 << CONV_SHIFT가 되게 합니다.
+    # (그래야 평평한 영역의 값이 블러 후에도 그대로 유지됩니다)
+    _check_radius(radius)
+    half = max(1, math.ceil(3 * radius))
+    exponents = [math.exp(-(i * i) / (2 * radius * radius)) for i in range(-half, half + 1)]
+    total = sum(exponents)
+    weights = [round(e / total * (1 << CONV_SHIFT)) for e in exponents]
+    weights[half] += (1 << CONV_SHIFT) - sum(weights)
+    return tuple(weights)
+
+
+@functools.lru_cache(maxsize=64)
+def box_radii(radius, passes=BOX_PASSES):
+    # 표준편차 radius인 가우시안을 근사하는 상자 블러 passes번의 반지름 목록입니다.
+    # 상자 너비를 wl(홀수) 또는 wl + 2로 섞어서, 분산의 합이 radius^2에 가장 가깝도록 고릅니다.
+    # (W. M. Wells, "Efficient synthesis of Gaussian filters by cascaded uniform filters", 1986)
+    _check_radius(radius)
+    variance = radius * radius
+    ideal_width = math.sqrt(12 * variance / passes + 1)
+    lower = int(ideal_width)
+    if lower % 2 == 0:
+        lower -= 1
+    upper = lower + 2
+    num_lower = round((12 * variance - passes * lower * lower - 4 * passes * lower - 3 * passes) / (-4 * lower - 4))
+    num_lower = min(max(num_lower, 0), passes)
+    return tuple((lower if i < num_lower else upper) // 2 for i in range(passes))
+
+
+def to_c_ints(values):
+    # 정수 목록을 C 함수가 기대하는 int 배열로 만듭니다.
+    return (ctypes.c_int * len(values))(*values)
+
+
+@functools.lru_cache(maxsize=64)
+def blur_plan(radius):
+    # 표준편차 radius인 가우시안 블러를 C 함수로 어떻게 계산할지 정합니다.
+    # 반환값:
+    #   None                                  - 반지름이 0이라 아무것도 하지 않아도 됨
+    #   ('convolve', C 가중치 배열, 탭 반지름)  - apply_convolve_h/v_rows_c로 직접 합성곱
+    #   ('box', C 반지름 배열, 반지름 튜플)      - apply_box_blur_h/v_rows_c로 상자 블러를 여러 번
+    # C 배열은 읽기만 하므로 여러 스레드와 호출이 함께 사용해도 됩니다.
+    _check_radius(radius)
+    if radius == 0:
+        return None
+    if radius < DIRECT_CONVOLVE_MAX_RADIUS:
+        weights = gaussian_weights(radius)
+        return 'convolve', to_c_ints(weights), len(weights) // 2
+    radii = box_radii(radius)
+    return 'box', to_c_ints(radii), radii
+
+
+@functools.lru_cache(maxsize=64)
+def box_plan(radius):
+    # 반지름 radius(정수)인 상자 블러 한 번의 계획입니다. (blur_plan과 같은 형식)
+    _check_radius(radius)
+    if radius == 0:
+        return None
+    return 'box', to_c_ints((radius,)), (radius,)
+
+
+# --- 모듈이 직접 실행될 때만 실행되는 코드 블록 (자체 테스트) ---
+if __name__ == '__main__':
+    print("\n--- src/spatial.py 모듈 자체 테스트 시작 ---")
+    for radius in (0.5, 1.0, 1.7, 3.0):
+        weights = gaussian_weights(radius)
+        assert sum(weights) == 1 << CONV_SHIFT and weights == weights[::-1], f"가중치가 올바르지 않습니다: {radius}"
+        assert max(weights) == weights[len(weights) // 2]
+    for radius in (2.0, 5.0, 20.0, 100.0):
+        radii = box_radii(radius)
+        # 반지름 r 상자의 분산은 ((2r+1)^2 - 1) / 12이고, 여러 번 적용하면 분산이 더해집니다.
+        variance = sum(((2 * r + 1) ** 2 - 1) / 12 for r in radii)
+        assert abs(math.sqrt(variance) - radius) < 0.5, f"상자 반지름 {radii}의 표준편차가 {radius}와 너무 다릅니다."
+        print(f"가우시안 반지름 {radius:g} → 상자 블러 반지름 {radii} (표준편차 {math.sqrt(variance):.2f})")
+    assert blur_plan(0) is None and blur_plan(1.0)[0] == 'convolve' and blur_plan(20.0)[0] == 'box'
+    assert blur_plan(20.0) is blur_plan(20.0), "같은 반지름의 계획을 다시 만들었습니다. (캐시가 사용되지 않음)"
+    try:
+        blur_plan(-1)
+        raise AssertionError("음수 반지름이 허용되었습니다.")
+    except ValueError:
+        pass
+    print("--- src/spatial.py 모듈 자체 테스트 완료 ---\n")
@@ -0,0 +1,342 @@
+import argparse
+import json
+import logging
+import os
+import struct       # <--- TIFF 파일 머리말과 태그를 바이트로 직접 쓰기 위해 사용합니다.
+import sys
+import time
+
+from PIL import Image
+
+# --- 중요: 파이썬 모듈 검색 경로 설정 ---
+# 다른 모듈과 같은 방식으로 프로젝트 루트를 검색 경로에 추가합니다. ('python -m src.streaming'으로 실행)
+current_script_dir = os.path.dirname(os.path.abspath(__file__))
+project_root_dir = os.path.abspath(os.path.join(current_script_dir, '..'))
+sys.path.insert(0, project_root_dir)
+
+from src import instrumentation
+from src.image_handler import pixel_layout, to_supported_mode
+from src.pipeline import SPATIAL_OPS, Pipeline
+
+logger = logging.getLogger(__name__)
+
+# 띠(strip) 스트리밍 모듈입니다.
+# load_image()는 이미지 전체를 메모리에 풀어 놓기 때문에, 메모리보다 큰 이미지(기가픽셀 스캔 등)는 처리할 수 없습니다.
+# 이 모듈은 이미지를 가로 띠 단위로 읽고 → C 필터를 적용하고 → 결과 파일에 바로 이어 쓰므로,
+# 한 번에 메모리에 올라가는 픽셀은 strip_bytes 정도로 제한됩니다.
+# 점 연산(흑백, 밝기, 룩업 테이블 등)은 픽셀마다 독립적이므로, 띠 단위 결과는 전체를 한 번에 처리한 결과와 같습니다.
+# 흑백(L), 알파가 있는 이미지(LA, RGBA)도 load_image()와 마찬가지로 RGB로 바꾸지 않고 원래 모드 그대로 처리하고 저장합니다.
+
+# 기본 띠 크기: 한 번에 처리할 픽셀 데이터의 최대 바이트 수
+DEFAULT_STRIP_BYTES = 64 * 1024 * 1024
+
+# 띠 단위로 직접 읽을 수 있는 '압축 없는(raw)' 픽셀 배열 형식과 한 픽셀의 비트 수입니다.
+_RAW_MODE_BITS = {'RGB': 24, 'BGR': 24, 'RGBA': 32, 'RGBX': 32, 'BGRA': 32, 'BGRX': 32, 'L': 8, 'LA': 16}
+_STREAMABLE_MODES = ('RGB', 'RGBA', 'RGBX', 'L', 'LA')
+# raw 픽셀 배열을 담을 수 있어서 띠 단위로 직접 읽어 볼 형식들입니다. (Pillow 플러그인 이름, _open_raw_header 참고)
+_RAW_FORMATS = ('PPM', 'BMP', 'TIFF')
+
+
+class RawStripReader:
+    # 압축되지 않은 이미지(PPM, BMP, 압축 없는 TIFF 등)를 파일에서 필요한 행만 읽어 오는 클래스입니다.
+    # Pillow로는 파일 머리말만 해석하고(Image.open은 픽셀을 바로 읽지 않습니다), 픽셀 데이터는 직접 읽습니다.
+    def __init__(self, path, image):
+        self.path = path
+        self.width, self.height = image.size
+        self.mode = image.mode
+        self.strips = []   # (시작 행, 끝 행, 파일 위치, 원시 형식, 행 바이트 수, 방향)
+        for tile in image.tile:
+            rawmode, stride, orientation = tile.args, 0, 1
+            if isinstance(tile.args, tuple):
+                rawmode, stride, orientation = (tuple(tile.args) + (0, 1))[:3]
+            x0, y0, x1, y1 = tile.extents
+            stride = stride or (x1 - x0) * _RAW_MODE_BITS[rawmode] // 8
+            self.strips.append((y0, y1, tile.offset, rawmode, stride, orientation))
+        self.strips.sort()
+        self.file = open(path, 'rb')
+
+    @staticmethod
+    def can_read(image):
+        # 모든 타일이 '가로 전체 폭'의 raw 데이터일 때만 띠 단위로 직접 읽을 수 있습니다.
+        if image.mode not in _STREAMABLE_MODES or not image.tile:
+            return False
+        for tile in image.tile:
+            rawmode = tile.args[0] if isinstance(tile.args, tuple) else tile.args
+            if tile.codec_name != 'raw' or rawmode not in _RAW_MODE_BITS:
+                return False
+            if tile.extents[0] != 0 or tile.extents[2] != image.width:
+                return False
+        return True
+
+    def read_rows(self, start_row, end_row, target):
+        # [start_row, end_row) 범위의 행을 이미지 모드(self.mode) 그대로의 배치로 target 버퍼에 채웁니다.
+        row_bytes = self.width * pixel_layout(self.mode)[0]
+        for y0, y1, offset, rawmode, stride, orientation in self.strips:
+            first, last = max(start_row, y0), min(end_row, y1)
+            if first >= last:
+                continue
+            rows = last - first
+            # 아래에서 위로 저장된 이미지(BMP 등, orientation == -1)는 파일 안의 행 순서가 반대입니다.
+            file_row = (first - y0) if orientation >= 0 else (y1 - last)
+            self.file.seek(offset + file_row * stride)
+            out = target[(first - start_row) * row_bytes:(last - start_row) * row_bytes]
+            if rawmode == self.mode and stride == row_bytes and orientation >= 0:
+                # 가장 흔한 경우: 파일의 바이트가 이미 C 함수가 원하는 형식이므로 버퍼에 바로 읽어 들입니다.
+                if self.file.readinto(out) != len(out):
+                    raise OSError(f"파일이 예상보다 짧습니다: {self.path}")
+            else:
+                data = self.file.read(rows * stride)
+                if len(data) != rows * stride:
+                    raise OSError(f"파일이 예상보다 짧습니다: {self.path}")
+                band = Image.frombytes(self.mode, (self.width, rows), data, 'raw', rawmode, stride, orientation)
+                out[:] = band.tobytes()
+
+    def close(self):
+        self.file.close()
+
+
+class DecodedStripReader:
+    # 압축된 형식(JPEG, PNG, 압축 TIFF 등)은 띠 단위로 풀 수 없으므로, 한 번에 전체를 풀어 놓고 띠로 나눠 줍니다.
+    # 이 경우 메모리 사용량은 띠 크기로 제한되지 않습니다. 모드는 load_image()와 같은 규칙(to_supported_mode)으로 정합니다.
+    def __init__(self, path, image):
+        logger.warning("ImageStreaming: '%s'은(는) 띠 단위로 읽을 수 없는 형식이라 전체를 한 번에 불러옵니다. "
+                       "(메모리 제한을 지키려면 PPM 또는 압축 없는 TIFF를 입력으로 사용하세요)", path)
+        self.image = to_supported_mode(image)
+        self.mode = self.image.mode
+        self.width, self.height = self.image.size
+
+    def read_rows(self, start_row, end_row, target):
+        band = self.image.crop((0, start_row, self.width, end_row))
+        target[:] = band.tobytes()
+
+    def close(self):
+        self.image = None
+
+
+def _open_raw_header(header_file, path):
+    # Image.open은 머리말만 읽지만, 그 자리에서 Pillow의 '압축 폭탄' 검사(MAX_IMAGE_PIXELS, 약 179 MP의 2배를 넘으면 오류)도 합니다.
+    # 띠 단위로 직접 읽을 이미지는 픽셀 전체를 풀지 않으므로, Image.open 대신 해당 형식의 Pillow 클래스로 머리말만 읽어 이 검사를 거치지 않습니다.
+    # (Pillow 전역 값인 MAX_IMAGE_PIXELS는 바꾸지 않으므로, 다른 스레드가 여는 이미지에는 검사가 그대로 적용됩니다)
+    # _RAW_FORMATS 형식이 아니면 None을 돌려줍니다.
+    Image.preinit()
+    prefix = header_file.read(16)
+    for format_name in _RAW_FORMATS:
+        factory, accept = Image.OPEN[format_name]
+        accepted = accept(prefix) if accept else True
+        if not accepted or isinstance(accepted, str):
+            continue
+        header_file.seek(0)
+        try:
+            return factory(header_file, path)
+        except (SyntaxError, IndexError, TypeError, struct.error):
+            continue   # 머리말이 이 형식이 아니거나 손상되었습니다. (Image.open과 같은 처리)
+    return None
+
+
+def open_strip_reader(path):
+    with open(path, 'rb') as header_file:
+        image = _open_raw_header(header_file, path)
+        if image is not None and RawStripReader.can_read(image):
+            return RawStripReader(path, image)
+    # 전체를 한 번에 풀어야 하는 형식은 Image.open으로 열어 Pillow의 크기 제한을 그대로 적용합니다.
+    return DecodedStripReader(path, Image.open(path))
+
+
+class PPMStripWriter:
+    # 결과를 PPM 파일(RGB는 P6, 흑백은 P5)로 띠 단위로 이어 씁니다. 머리말은 Pillow가 저장하는 PPM과 똑같이 씁니다.
+    # PPM에는 알파 채널을 저장할 수 없으므로 LA/RGBA 이미지는 TIFF로 저장하세요.
+    MODES = {'RGB': b'P6', 'L': b'P5'}
+
+    def __init__(self, path, width, height, strip_rows, mode='RGB'):
+        self.file = open(path, 'wb')
+        self.file.write(self.MODES[mode] + b"\n%d %d\n255\n" % (width, height))
+
+    def write_rows(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+
+class TiffStripWriter:
+    # 결과를 압축 없는 TIFF(RGB, RGBA, 흑백 L, LA)로 띠 단위로 이어 씁니다.
+    # 압축이 없으니 각 띠(strip)의 크기와 파일 위치를 미리 계산할 수 있어서, 머리말과 태그를 먼저 다 쓴 뒤
+    # 픽셀 데이터는 띠가 준비되는 대로 뒤에 붙이기만 하면 됩니다.
+    # 픽셀 데이터가 4GB를 넘으면 64비트 파일 위치를 쓰는 BigTIFF 형식으로 저장합니다.
+    # 모드 → PhotometricInterpretation (1: 흑백, 0이 검정 / 2: RGB)
+    MODES = {'RGB': 2, 'RGBA': 2, 'L': 1, 'LA': 1}
+
+    def __init__(self, path, width, height, strip_rows, mode='RGB'):
+        samples, color_samples, _ = pixel_layout(mode)
+        row_bytes = width * samples
+        strip_counts = [min(strip_rows, height - y) * row_bytes for y in range(0, height, strip_rows)]
+        big = width * height * samples + 4096 + 16 * len(strip_counts) > 0xFFFFFFFF
+        if big:
+            # BigTIFF: 머리말 16바이트, 태그 20바이트, 파일 위치 8바이트
+            header = struct.pack('<2sHHHQ', b'II', 43, 8, 0, 16)
+            count_fmt, entry_fmt, offset_fmt, offset_type, ifd_start = '<Q', '<HHQ8s', '<Q', 16, 16
+        else:
+            header = struct.pack('<2sHI', b'II', 42, 8)
+            count_fmt, entry_fmt, offset_fmt, offset_type, ifd_start = '<H', '<HHI4s', '<I', 4, 8
+        value_size = struct.calcsize(offset_fmt)
+        bits = struct.pack('<' + 'H' * samples, *([8] * samples))
+        bits_inline = len(bits) <= value_size
+        num_tags = 10 + (samples > color_samples)
+        ifd_size = struct.calcsize(count_fmt) + num_tags * struct.calcsize(entry_fmt) + value_size
+        extra_start = ifd_start + ifd_size
+        # 태그 안에 다 들어가지 않는 값들(BitsPerSample, 띠 위치/크기 목록)은 IFD 뒤에 따로 둡니다.
+        bits_offset = extra_start
+        offsets_offset = bits_offset + (0 if bits_inline else len(bits))
+        counts_offset = offsets_offset + value_size * len(strip_counts)
+        data_start = counts_offset + value_size * len(strip_counts)
+        strip_offsets = []
+        position = data_start
+        for count in strip_counts:
+            strip_offsets.append(position)
+            position += count
+
+        def entry(tag, field_type, count, values):
+            # values는 태그 칸에 바로 들어가는 값(작은 값) 또는 IFD 뒤에 둔 값들의 파일 위치입니다.
+            return struct.pack(entry_fmt, tag, field_type, count, values.ljust(value_size, b'\0'))
+
+        def inline(fmt, *values):
+            return struct.pack('<' + fmt, *values)
+
+        many = len(strip_counts) > 1
+        ifd = [
+            entry(256, 4, 1, inline('I', width)),                     # ImageWidth
+            entry(257, 4, 1, inline('I', height)),                    # ImageLength
+            entry(258, 3, samples, bits if bits_inline                # BitsPerSample (채널마다 8)
+                  else inline(offset_fmt[1], bits_offset)),
+            entry(259, 3, 1, inline('H', 1)),                         # Compression: 없음
+            entry(262, 3, 1, inline('H', self.MODES[mode])),          # PhotometricInterpretation
+            entry(273, offset_type, len(strip_offsets),               # StripOffsets
+                  inline(offset_fmt[1], offsets_offset if many else strip_offsets[0])),
+            entry(277, 3, 1, inline('H', samples)),                   # SamplesPerPixel
+            entry(278, 4, 1, inline('I', strip_rows)),                # RowsPerStrip
+            entry(279, offset_type, len(strip_counts),                # StripByteCounts
+                  inline(offset_fmt[1], counts_offset if many else strip_counts[0])),
+            entry(284, 3, 1, inline('H', 1)),                         # PlanarConfiguration: RGBRGB...
+        ]
+        if samples > color_samples:
+            ifd.append(entry(338, 3, 1, inline('H', 2)))              # ExtraSamples: 알파 (premultiply 안 함)
+        self.file = open(path, 'wb')
+        self.file.write(header)
+        self.file.write(struct.pack(count_fmt, num_tags) + b''.join(ifd) + struct.pack(offset_fmt, 0))
+        if not bits_inline:
+            self.file.write(bits)
+        self.file.write(b''.join(struct.pack(offset_fmt, o) for o in strip_offsets))
+        self.file.write(b''.join(struct.pack(offset_fmt, c) for c in strip_counts))
+
+    def write_rows(self, data):
+        self.file.write(data)
+
+    def close(self):
+        self.file.close()
+
+
+_WRITERS = {'.ppm': PPMStripWriter, '.pgm': PPMStripWriter, '.tif': TiffStripWriter, '.tiff': TiffStripWriter}
+
+
+def stream_pipeline(handler, input_path, output_path, pipeline, strip_bytes=DEFAULT_STRIP_BYTES):
+    # input_path 이미지를 띠 단위로 읽어 pipeline을 적용하고 output_path(.ppm, .pgm, .tif, .tiff)에 이어 씁니다.
+    # 결과는 입력 이미지의 모드(RGB, RGBA, L, LA) 그대로 저장되며, 출력 형식이 그 모드를 저장할 수 없으면 실패합니다.
+    # 실패하면 쓰다 만 출력 파일은 지웁니다.
+    # 한 번에 다루는 픽셀 버퍼는 strip_bytes 하나뿐이며, 모든 띠가 이 버퍼를 재사용합니다.
+    # 성공하면 True, 실패하면 False를 반환합니다.
+    writer_class = _WRITERS.get(os.path.splitext(output_path)[1].lower())
+    if writer_class is None:
+        logger.error("오류: ImageStreaming: 지원하지 않는 출력 형식입니다: '%s' (사용 가능: .ppm, .pgm, .tif, .tiff)", output_path)
+        return False
+    if pipeline.has_spatial_ops():
+        # 블러 같은 공간 필터는 띠 경계 너머의 행까지 읽어야 하므로, 띠 단위로 나누어 처리할 수 없습니다.
+        logger.error("오류: ImageStreaming: 공간 필터(%s)는 띠 단위 처리를 지원하지 않습니다.", ', '.join(SPATIAL_OPS))
+        return False
+    try:
+        reader = open_strip_reader(input_path)
+    except (OSError, KeyError, Image.DecompressionBombError) as e:
+        logger.error("오류: ImageStreaming: 이미지 열기 실패 - %s", e)
+        return False
+
+    if reader.mode not in writer_class.MODES:
+        # RGB로 바꿔서 저장하면 메모리 경로(ImageHandler.apply_pipeline)와 결과가 달라지므로, 바꾸지 않고 실패로 처리합니다.
+        logger.error("오류: ImageStreaming: '%s' 모드 이미지는 '%s' 형식으로 저장할 수 없습니다. (이 형식이 지원하는 모드: %s)",
+                     reader.mode, output_path, ', '.join(writer_class.MODES))
+        reader.close()
+        return False
+
+    width, height, mode = reader.width, reader.height, reader.mode
+    row_bytes = width * pixel_layout(mode)[0]
+    strip_rows = max(1, min(height, strip_bytes // row_bytes))
+    strip_buffer = bytearray(strip_rows * row_bytes)
+    writer = None
+    ok = False
+    try:
+        writer = writer_class(output_path, width, height, strip_rows, mode)
+        start_time = time.perf_counter()
+        for start_row in range(0, height, strip_rows):
+            end_row = min(start_row + strip_rows, height)
+            strip = memoryview(strip_buffer)[:(end_row - start_row) * row_bytes]
+            with instrumentation.span('decode'):
+                reader.read_rows(start_row, end_row, strip)
+            if not handler.apply_pipeline_inplace(strip, width, end_row - start_row, pipeline, mode=mode):
+                return False
+            with instrumentation.span('encode'):
+                writer.write_rows(strip)
+        elapsed = time.perf_counter() - start_time
+        logger.info("ImageStreaming: %dx%d %s 이미지를 %d행 단위 띠로 처리했습니다. (%.2f초, %.1f MPix/s)",
+                    width, height, mode, strip_rows, elapsed, width * height / 1e6 / max(elapsed, 1e-9))
+        ok = True
+        return True
+    except (OSError, ValueError) as e:
+        # 입력 파일이 잘렸거나 손상된 경우 등입니다. (Pillow는 픽셀 데이터가 모자라면 ValueError를 발생시킵니다)
+        logger.error("오류: ImageStreaming: 처리 실패 - %s", e)
+        return False
+    finally:
+        reader.close()
+        if writer is not None:
+            writer.close()
+            if not ok:
+                try:
+                    os.remove(output_path)
+                except OSError:
+                    pass
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        prog='python -m src.streaming',
+        description="메모리보다 큰 이미지를 가로 띠 단위로 읽고, C 필터를 적용하고, 결과를 이어 씁니다.")
+    parser.add_argument('input', help="입력 이미지 (PPM 또는 압축 없는 TIFF/BMP면 띠 단위로 읽습니다)")
+    parser.add_argument('output', help="출력 파일 (.ppm, .pgm, .tif, .tiff / 알파가 있는 이미지는 .tif, .tiff만)")
+    parser.add_argument('-f', '--filter', required=True, dest='filter_spec',
+                        help="적용할 필터 목록 (예: 'grayscale,brightness=40')")
+    parser.add_argument('--strip-mb', type=float, default=DEFAULT_STRIP_BYTES / (1024 * 1024),
+                        help="한 번에 처리할 띠의 최대 크기(MB) (기본값: %(default)s)")
+    parser.add_argument('--metrics-interval', type=float, default=0,
+                        help="이 간격(초)마다 단계별 측정값을 로그로 남깁니다. (기본값: 0, 남기지 않음)")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(message)s')
+
+    try:
+        pipeline = Pipeline.from_spec(args.filter_spec)
+    except ValueError as e:
+        parser.error(str(e))
+    if args.strip_mb <= 0:
+        parser.error("띠 크기는 0보다 커야 합니다.")
+
+    from src.image_handler import ImageHandler
+    handler = ImageHandler()
+    if args.metrics_interval > 0:
+        instrumentation.start_periodic_dump(args.metrics_interval)
+    try:
+        ok = stream_pipeline(handler, args.input, args.output, pipeline, int(args.strip_mb * 1024 * 1024))
+    finally:
+        if args.metrics_interval > 0:
+            instrumentation.stop_periodic_dump()
+            logger.info("metrics %s", json.dumps(instrumentation.snapshot(), ensure_ascii=False))
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())